@@ -8,13 +8,26 @@ Asynchronous I/O Client/Reviewer for Baidu Tieba
 
 import os
 
-from . import const, core, enums, exception, logging, typing
+from . import const, core, enums, exception, logging
 from .__version__ import __version__
+from .api._classdef import disable_user_interning, enable_user_interning
 from .client import Client
 from .config import TimeoutConfig
 from .core import Account
 from .enums import *  # noqa: F403
 from .logging import enable_filelog, get_logger
+from .pool import ClientPool
+
+
+def __getattr__(name: str):
+    # typing会导入get_threads / get_posts / get_comments 因此推迟到首次访问时
+    if name == "typing":
+        import importlib
+
+        return importlib.import_module(f"{__name__}.typing")
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if os.name == "posix":
     import signal
@@ -0,0 +1,37 @@
+"""
+各接口的实现
+
+接口子包在首次访问其属性时才会执行导入 以免导入aiotieba时加载全部的protobuf描述符与bs4等依赖
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+
+def __getattr__(name: str) -> ModuleType:
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    fullname = f"{__name__}.{name}"
+    if (module := sys.modules.get(fullname)) is not None:
+        return module
+
+    spec = importlib.util.find_spec(fullname)
+    if spec is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[fullname] = module
+    loader.exec_module(module)
+
+    # 缓存为包属性 此后的访问不再经过__getattr__
+    globals()[name] = module
+    return module
@@ -18,5 +18,21 @@ from .contents import (
     TypeFragText,
     TypeFragTiebaPlus,
 )
+from .decode import (
+    FRAG_CATEGORIES,
+    GENDERS,
+    PRIV_LIKES,
+    PRIV_REPLYS,
+    DefaultUsers,
+    EnumTable,
+    FieldMask,
+    FragDecoder,
+    check_error,
+    field_mask,
+    peek_reply_to_id,
+)
+from .intern import UserRegistry, convert_user, disable_user_interning, enable_user_interning
+from .lazy import LazyUsers
+from .slots import cached_slot_property, slotted
 from .user import UserInfo
 from .vote import VoteInfo
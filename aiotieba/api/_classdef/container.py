@@ -3,12 +3,15 @@ from __future__ import annotations
 import dataclasses as dcs
 from typing import TYPE_CHECKING, Generic, SupportsIndex, TypeVar, overload
 
+from .slots import slotted
+
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
 TypeContainer = TypeVar("TypeContainer")
 
 
+@slotted
 @dcs.dataclass
 class Containers(Generic[TypeContainer]):
     """
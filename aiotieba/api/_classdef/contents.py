@@ -2,17 +2,19 @@ from __future__ import annotations
 
 import dataclasses as dcs
 import re
-from functools import cached_property
 from typing import TYPE_CHECKING, Protocol, TypeVar
 
 import yarl
 
+from .slots import cached_slot_property, slotted
+
 if TYPE_CHECKING:
     from .common import TypeMessage
 
 TypeFragment = TypeVar("TypeFragment")
 
 
+@slotted
 @dcs.dataclass
 class FragText:
     """
@@ -34,6 +36,7 @@ class TypeFragText(Protocol):
     text: str
 
 
+@slotted
 @dcs.dataclass
 class FragEmoji:
     """
@@ -62,6 +65,7 @@ class TypeFragEmoji(Protocol):
 _IMAGEHASH_EXP = re.compile(r"/([a-z0-9]{32,})\.")
 
 
+@slotted
 @dcs.dataclass
 class FragImage:
     """
@@ -108,6 +112,7 @@ class TypeFragImage(Protocol):
     hash: str
 
 
+@slotted
 @dcs.dataclass
 class FragAt:
     """
@@ -133,6 +138,7 @@ class TypeFragAt(Protocol):
     user_id: int
 
 
+@slotted
 @dcs.dataclass
 class FragVoice:
     """
@@ -161,6 +167,7 @@ class TypeFragVoice(Protocol):
     duration: int
 
 
+@slotted
 @dcs.dataclass
 class FragVideo:
     """
@@ -205,6 +212,7 @@ class TypeFragVideo(Protocol):
     view_num: int
 
 
+@slotted
 @dcs.dataclass
 class FragLink:
     """
@@ -229,7 +237,7 @@ class FragLink:
         raw_url = yarl.URL(text)
         return FragLink(text, title, raw_url)
 
-    @cached_property
+    @cached_slot_property
     def url(self) -> yarl.URL:
         if self.is_external:
             url = yarl.URL(self.raw_url.query["url"])
@@ -237,7 +245,7 @@ class FragLink:
             url = self.raw_url
         return url
 
-    @cached_property
+    @cached_slot_property
     def is_external(self) -> bool:
         return self.raw_url.path == "/mo/q/checkurl"
 
@@ -254,6 +262,7 @@ class TypeFragLink(Protocol):
     def is_external(self) -> bool: ...
 
 
+@slotted
 @dcs.dataclass
 class FragTiebaPlus:
     """
@@ -279,6 +288,7 @@ class TypeFragTiebaPlus(Protocol):
     url: yarl.URL
 
 
+@slotted
 @dcs.dataclass
 class FragItem:
     """
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import enum
+import functools
+from typing import TYPE_CHECKING, Callable, Generic, NamedTuple, TypeVar
+
+from ...enums import Gender, PrivLike, PrivReply, ReqFields
+from ...exception import TiebaServerError
+from .._protobuf import ErrorRes_pb2
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .common import TypeMessage
+    from .contents import TypeFragment
+
+TypeEnum = TypeVar("TypeEnum", bound=enum.IntEnum)
+TypeUser = TypeVar("TypeUser")
+
+
+class EnumTable(dict, Generic[TypeEnum]):
+    """
+    整数到枚举成员的预计算查找表
+    以一次字典查找代替枚举类的构造调用
+
+    Args:
+        enum_cls (type[TypeEnum]): 枚举类
+        defaults (dict[int, TypeEnum], optional): 额外的映射 用于将0等缺省值映射到指定成员. Defaults to None.
+
+    Note:
+        查找表中不存在的值会交由枚举类构造 因此非法值仍会抛出ValueError
+    """
+
+    __slots__ = ["_enum_cls"]
+
+    def __init__(self, enum_cls: type[TypeEnum], defaults: dict[int, TypeEnum] | None = None) -> None:
+        super().__init__((member.value, member) for member in enum_cls)
+        if defaults:
+            self.update(defaults)
+        self._enum_cls = enum_cls
+
+    def __missing__(self, value: int) -> TypeEnum:
+        return self._enum_cls(value)
+
+
+GENDERS: EnumTable[Gender] = EnumTable(Gender)
+PRIV_LIKES: EnumTable[PrivLike] = EnumTable(PrivLike, {0: PrivLike.PUBLIC})
+PRIV_REPLYS: EnumTable[PrivReply] = EnumTable(PrivReply, {0: PrivReply.ALL})
+
+# FragDecoder.decode返回的分类列表的顺序
+FRAG_CATEGORIES = ("texts", "emojis", "imgs", "ats", "links", "tiebapluses", "videos", "voices")
+
+
+class FragDecoder:
+    """
+    表驱动的内容碎片解码器
+    以碎片类型为键一次查表得到转换函数与需要归入的分类 代替逐个比较碎片类型的条件分支
+
+    Args:
+        rules (Iterable[tuple[Iterable[int], Callable[[TypeMessage], TypeFragment], tuple[str, ...]]]): \
+            (碎片类型列表, 转换函数, 碎片需要归入的分类) 分类取自FRAG_CATEGORIES
+        ignored (Iterable[int], optional): 直接跳过的碎片类型. Defaults to (34,).
+
+    Note:
+        遇到未知的碎片类型时记录一条警告并跳过该碎片
+    """
+
+    __slots__ = ["_table", "_ignored"]
+
+    def __init__(
+        self,
+        rules: Iterable[tuple[Iterable[int], Callable[[TypeMessage], TypeFragment], tuple[str, ...]]],
+        ignored: Iterable[int] = (34,),
+    ) -> None:
+        table = {}
+        for types, convert, categories in rules:
+            entry = (convert, tuple(FRAG_CATEGORIES.index(c) for c in categories))
+            for type_ in types:
+                table[type_] = entry
+        self._table = table
+        self._ignored = frozenset(ignored)
+
+    def without(self, *categories: str) -> FragDecoder:
+        """
+        派生一个直接跳过指定分类碎片的解码器
+
+        Args:
+            categories (str): 需要跳过的分类 取自FRAG_CATEGORIES
+
+        Returns:
+            FragDecoder: 新的解码器
+        """
+
+        indices = {FRAG_CATEGORIES.index(c) for c in categories}
+
+        decoder = FragDecoder(())
+        decoder._table = {t: e for t, e in self._table.items() if indices.isdisjoint(e[1])}
+        decoder._ignored = self._ignored.union(t for t in self._table if t not in decoder._table)
+        return decoder
+
+    def decode(self, content_protos: Iterable[TypeMessage]) -> tuple[list[TypeFragment], list[list[TypeFragment]]]:
+        """
+        解码内容碎片
+
+        Args:
+            content_protos (Iterable[TypeMessage]): 内容碎片的protobuf列表
+
+        Returns:
+            tuple[list[TypeFragment], list[list[TypeFragment]]]: 所有碎片的混合列表, 按FRAG_CATEGORIES排列的分类列表
+        """
+
+        table = self._table
+        objs = []
+        sinks = [[], [], [], [], [], [], [], []]
+        append = objs.append
+
+        for proto in content_protos:
+            entry = table.get(proto.type)
+            if entry is None:
+                if proto.type not in self._ignored:
+                    from ...logging import get_logger as LOG
+
+                    LOG().warning("Unknown fragment type. type=%s proto=%s", proto.type, proto)
+                continue
+
+            convert, indices = entry
+            frag = convert(proto)
+            append(frag)
+            for i in indices:
+                sinks[i].append(frag)
+
+        return objs, sinks
+
+
+class FieldMask(NamedTuple):
+    """
+    由ReqFields展开的布尔掩码
+    解析时以属性访问代替开销较大的Flag成员判断
+    """
+
+    contents: bool
+    media: bool
+    user: bool
+    vote: bool
+    share: bool
+    tab_map: bool
+    comments: bool
+    sign: bool
+
+
+@functools.cache
+def field_mask(fields: ReqFields) -> FieldMask:
+    """
+    将ReqFields展开为布尔掩码
+
+    Args:
+        fields (ReqFields): 需要解析的子对象
+
+    Returns:
+        FieldMask: 布尔掩码
+    """
+
+    return FieldMask(
+        ReqFields.CONTENTS in fields,
+        ReqFields.CONTENTS in fields and ReqFields.MEDIA in fields,
+        ReqFields.USER in fields,
+        ReqFields.VOTE in fields,
+        ReqFields.SHARE in fields,
+        ReqFields.TAB_MAP in fields,
+        ReqFields.COMMENTS in fields,
+        ReqFields.SIGN in fields,
+    )
+
+
+def peek_reply_to_id(data_proto: TypeMessage) -> int:
+    """
+    不解析内容碎片 直接读取楼中楼开头"回复 @xxx :"前缀中被回复者的user_id
+
+    Args:
+        data_proto (TypeMessage): 楼中楼的protobuf
+
+    Returns:
+        int: 被回复者的user_id 没有前缀时返回0
+    """
+
+    content_protos = data_proto.content
+    if len(content_protos) > 1 and content_protos[0].type == 0 and content_protos[0].text == "回复 ":
+        return content_protos[1].uid
+    return 0
+
+
+class DefaultUsers(dict, Generic[TypeUser]):
+    """
+    未请求用户信息时代替用户信息映射表
+    对任意user_id返回一个新的默认用户信息
+
+    Args:
+        cls (type[TypeUser]): 用户信息类型
+    """
+
+    __slots__ = ["_cls"]
+
+    def __init__(self, cls: type[TypeUser]) -> None:
+        super().__init__()
+        self._cls = cls
+
+    def __missing__(self, user_id: int) -> TypeUser:
+        return self._cls()
+
+
+def check_error(body: bytes) -> None:
+    """
+    仅解析响应中的error字段以检查错误码
+    开销远小于解析完整的响应 适用于原样保存响应体的场景
+
+    Args:
+        body (bytes): protobuf响应体
+
+    Raises:
+        TiebaServerError: 错误码非0
+    """
+
+    res_proto = ErrorRes_pb2.ErrorRes()
+    res_proto.ParseFromString(body)
+
+    if code := res_proto.error.errorno:
+        raise TiebaServerError(code, res_proto.error.errmsg)
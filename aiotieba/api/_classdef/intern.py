@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import sys
+import weakref
+from typing import TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    from .common import TypeMessage
+
+TypeUser = TypeVar("TypeUser")
+
+
+class UserRegistry:
+    """
+    弱引用的用户信息驻留表
+    同一用户的protobuf内容未变化时 在多次解析间复用同一个用户信息实例
+
+    Args:
+        maxsize (int, optional): 最多登记的实例数 超出后新实例不再登记. Defaults to 65536.
+
+    Attributes:
+        saved (int): 因复用而免于创建的实例数
+        created (int): 新创建的实例数
+
+    Note:
+        以(类型, user_id, protobuf内容的哈希)为键 因此同一用户在不同吧中的等级等信息不会相互覆盖\n
+        被复用的实例由多个结果共享 请勿修改其内容
+    """
+
+    __slots__ = ["maxsize", "_users", "saved", "created"]
+
+    def __init__(self, maxsize: int = 65536) -> None:
+        self.maxsize = maxsize
+        self._users: weakref.WeakValueDictionary[tuple, object] = weakref.WeakValueDictionary()
+        self.saved = 0
+        self.created = 0
+
+    def get(self, cls: type[TypeUser], data_proto: TypeMessage) -> TypeUser:
+        """
+        获取用户信息实例 未登记时从protobuf转换并登记
+
+        Args:
+            cls (type[TypeUser]): 用户信息类型 需要支持弱引用
+            data_proto (TypeMessage): 用户信息的protobuf
+
+        Returns:
+            TypeUser: 用户信息
+        """
+
+        key = (cls, data_proto.id, hash(data_proto.SerializeToString(deterministic=True)))
+        if (user := self._users.get(key)) is not None:
+            self.saved += 1
+            return user
+
+        user = cls.from_tbdata(data_proto)
+        user.portrait = sys.intern(user.portrait)
+        user.user_name = sys.intern(user.user_name)
+        self.created += 1
+
+        if len(self._users) < self.maxsize:
+            self._users[key] = user
+        return user
+
+    def __len__(self) -> int:
+        return self._users.__len__()
+
+
+_REGISTRY: UserRegistry | None = None
+
+
+def enable_user_interning(maxsize: int = 65536) -> UserRegistry:
+    """
+    启用进程内的用户信息驻留
+    启用后get_threads / get_posts / get_comments解析出的用户信息将在多次请求间复用
+
+    Args:
+        maxsize (int, optional): 最多登记的实例数. Defaults to 65536.
+
+    Returns:
+        UserRegistry: 驻留表 可用于查看复用统计
+    """
+
+    global _REGISTRY
+
+    if _REGISTRY is None:
+        _REGISTRY = UserRegistry(maxsize)
+    return _REGISTRY
+
+
+def disable_user_interning() -> None:
+    """
+    停用进程内的用户信息驻留
+    """
+
+    global _REGISTRY
+
+    _REGISTRY = None
+
+
+def convert_user(cls: type[TypeUser], data_proto: TypeMessage) -> TypeUser:
+    """
+    将protobuf转换为用户信息 启用驻留时复用已有实例
+
+    Args:
+        cls (type[TypeUser]): 用户信息类型
+        data_proto (TypeMessage): 用户信息的protobuf
+
+    Returns:
+        TypeUser: 用户信息
+    """
+
+    if _REGISTRY is None:
+        return cls.from_tbdata(data_proto)
+    return _REGISTRY.get(cls, data_proto)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+from .intern import convert_user
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .common import TypeMessage
+
+TypeUser = TypeVar("TypeUser")
+
+
+class LazyUsers(dict, Generic[TypeUser]):
+    """
+    按需解析的用户信息映射表
+    以user_id为键 首次访问某个用户时才从protobuf中转换
+
+    Args:
+        user_protos (Iterable[TypeMessage]): 用户信息的protobuf列表
+        cls (type[TypeUser]): 用户信息类型
+    """
+
+    __slots__ = ["_protos", "_cls"]
+
+    def __init__(self, user_protos: Iterable[TypeMessage], cls: type[TypeUser]) -> None:
+        super().__init__()
+        self._protos = {p.id: p for p in user_protos}
+        self._cls = cls
+
+    def __missing__(self, user_id: int) -> TypeUser:
+        user = convert_user(self._cls, self._protos[user_id])
+        self[user_id] = user
+        return user
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import dataclasses as dcs
+from typing import Any, Callable, Generic, TypeVar
+
+TypeValue = TypeVar("TypeValue")
+TypeClass = TypeVar("TypeClass", bound=type)
+
+
+class cached_slot_property(Generic[TypeValue]):
+    """
+    以slot存储计算结果的cached_property
+    用于没有__dict__的slotted类
+
+    Note:
+        与functools.cached_property一样支持赋值与del以覆盖或清除缓存
+    """
+
+    __slots__ = ["func", "name", "slot"]
+
+    def __init__(self, func: Callable[[Any], TypeValue]) -> None:
+        self.func = func
+        self.name = func.__name__
+        self.slot = None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type | None = None) -> TypeValue:
+        if instance is None:
+            return self
+
+        try:
+            return self.slot.__get__(instance, owner)
+        except AttributeError:
+            pass
+
+        value = self.func(instance)
+        self.slot.__set__(instance, value)
+        return value
+
+    def __set__(self, instance: Any, value: TypeValue) -> None:
+        self.slot.__set__(instance, value)
+
+    def __delete__(self, instance: Any) -> None:
+        try:
+            self.slot.__delete__(instance)
+        except AttributeError:
+            pass
+
+
+def _cache_slot_name(name: str) -> str:
+    return f"_cached_{name}"
+
+
+def slotted(cls: TypeClass | None = None, /, *, weakref: bool = False) -> TypeClass:
+    """
+    将dataclass重建为带有__slots__的类
+    字段与cached_slot_property的缓存均存储在slot中 实例不再持有__dict__
+
+    Args:
+        cls (type): 已被dcs.dataclass装饰的类
+        weakref (bool, optional): 是否支持弱引用. Defaults to False.
+
+    Returns:
+        type: 重建后的类
+
+    Note:
+        等价于Python 3.10引入的dcs.dataclass(slots=True) 并兼容Python 3.9\n
+        若基类没有__slots__ 实例仍可能持有__dict__ 但仅在写入非字段属性时才会分配
+    """
+
+    def wrap(cls: TypeClass) -> TypeClass:
+        inherited = set()
+        for base in cls.__mro__[1:]:
+            base_slots = base.__dict__.get("__slots__", ())
+            inherited.update((base_slots,) if isinstance(base_slots, str) else base_slots)
+
+        # init=False且有默认值的字段依赖类属性提供默认值 不能替换为slot
+        field_names = [f.name for f in dcs.fields(cls) if f.init or f.default is dcs.MISSING]
+        cached_names = [name for name, attr in cls.__dict__.items() if isinstance(attr, cached_slot_property)]
+
+        slots = [name for name in field_names if name not in inherited]
+        slots += [_cache_slot_name(name) for name in cached_names]
+        if weakref and "__weakref__" not in inherited:
+            slots.append("__weakref__")
+
+        cls_dict = dict(cls.__dict__)
+        for name in field_names:
+            cls_dict.pop(name, None)
+        cls_dict.pop("__dict__", None)
+        cls_dict.pop("__weakref__", None)
+        cls_dict["__slots__"] = tuple(slots)
+
+        new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+        new_cls.__qualname__ = cls.__qualname__
+
+        for name in cached_names:
+            new_cls.__dict__[name].slot = new_cls.__dict__[_cache_slot_name(name)]
+
+        return new_cls
+
+    if cls is None:
+        return wrap
+    return wrap(cls)
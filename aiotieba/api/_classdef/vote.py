@@ -3,10 +3,13 @@ from __future__ import annotations
 import dataclasses as dcs
 from typing import TYPE_CHECKING
 
+from .slots import slotted
+
 if TYPE_CHECKING:
     from .common import TypeMessage
 
 
+@slotted
 @dcs.dataclass
 class VoteOption:
     """
@@ -27,6 +30,7 @@ class VoteOption:
         return VoteOption(vote_num, text)
 
 
+@slotted
 @dcs.dataclass
 class VoteInfo:
     """
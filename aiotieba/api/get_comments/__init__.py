@@ -1,2 +1,2 @@
-from ._api import CMD, pack_proto, parse_body, request_http, request_ws
-from ._classdef import Comment, Comments, Post_c, Thread_c, UserInfo_c, UserInfo_cp, UserInfo_ct
+from ._api import CMD, pack_proto, parse_body, parse_proto, request_body_http, request_body_ws, request_http, request_ws
+from ._classdef import Comment, Comments, LazyComment, Post_c, Thread_c, UserInfo_c, UserInfo_cp, UserInfo_ct
@@ -2,6 +2,7 @@ import yarl
 
 from ...const import APP_BASE_HOST, MAIN_VERSION
 from ...core import HttpCore, WsCore
+from ...enums import ReqFields
 from ...exception import TiebaServerError
 from ._classdef import Comments
 from .protobuf import PbFloorReqIdl_pb2, PbFloorResIdl_pb2
@@ -23,20 +24,26 @@ def pack_proto(tid: int, pid: int, pn: int, is_comment: bool) -> bytes:
     return req_proto.SerializeToString()
 
 
-def parse_body(body: bytes) -> Comments:
+def parse_proto(body: bytes) -> PbFloorResIdl_pb2.PbFloorResIdl:
     res_proto = PbFloorResIdl_pb2.PbFloorResIdl()
     res_proto.ParseFromString(body)
 
     if code := res_proto.error.errorno:
         raise TiebaServerError(code, res_proto.error.errmsg)
 
+    return res_proto
+
+
+def parse_body(body: bytes, lazy: bool = False, fields: ReqFields = ReqFields.ALL) -> Comments:
+    res_proto = parse_proto(body)
+
     data_proto = res_proto.data
-    comments = Comments.from_tbdata(data_proto)
+    comments = Comments.from_tbdata(data_proto, lazy, fields)
 
     return comments
 
 
-async def request_http(http_core: HttpCore, tid: int, pid: int, pn: int, is_comment: bool) -> Comments:
+async def request_body_http(http_core: HttpCore, tid: int, pid: int, pn: int, is_comment: bool) -> bytes:
     data = pack_proto(tid, pid, pn, is_comment)
 
     request = http_core.pack_proto_request(
@@ -44,12 +51,37 @@ async def request_http(http_core: HttpCore, tid: int, pid: int, pn: int, is_comm
         data,
     )
 
-    body = await http_core.net_core.send_request(request, read_bufsize=8 * 1024)
-    return parse_body(body)
+    return await http_core.net_core.send_request(request, read_bufsize=8 * 1024)
+
+
+async def request_http(
+    http_core: HttpCore,
+    tid: int,
+    pid: int,
+    pn: int,
+    is_comment: bool,
+    lazy: bool = False,
+    fields: ReqFields = ReqFields.ALL,
+) -> Comments:
+    body = await request_body_http(http_core, tid, pid, pn, is_comment)
+    return await http_core.net_core.parse(parse_body, body, lazy, fields, inline=lazy)
 
 
-async def request_ws(ws_core: WsCore, tid: int, pid: int, pn: int, is_comment: bool) -> Comments:
+async def request_body_ws(ws_core: WsCore, tid: int, pid: int, pn: int, is_comment: bool) -> bytes:
     data = pack_proto(tid, pid, pn, is_comment)
 
     response = await ws_core.send(data, CMD)
-    return parse_body(await response.read())
+    return await response.read()
+
+
+async def request_ws(
+    ws_core: WsCore,
+    tid: int,
+    pid: int,
+    pn: int,
+    is_comment: bool,
+    lazy: bool = False,
+    fields: ReqFields = ReqFields.ALL,
+) -> Comments:
+    body = await request_body_ws(ws_core, tid, pid, pn, is_comment)
+    return await ws_core.net_core.parse(parse_body, body, lazy, fields, inline=lazy)
@@ -3,9 +3,21 @@ from __future__ import annotations
 import dataclasses as dcs
 from functools import cached_property
 
-from ...enums import Gender, PrivLike, PrivReply
+from ...enums import Gender, PrivLike, PrivReply, ReqFields
 from ...exception import TbErrorExt
-from .._classdef import Containers, TypeMessage
+from .._classdef import (
+    GENDERS,
+    PRIV_LIKES,
+    PRIV_REPLYS,
+    Containers,
+    FragDecoder,
+    TypeMessage,
+    cached_slot_property,
+    convert_user,
+    field_mask,
+    peek_reply_to_id,
+    slotted,
+)
 from .._classdef.contents import (
     _IMAGEHASH_EXP,
     FragAt,
@@ -26,6 +38,25 @@ FragTiebaPlus_c = FragTiebaPlus_cp = FragTiebaPlus
 FragVoice_c = FragVoice_cp = FragVoice
 
 
+_FRAG_DECODER_C = FragDecoder(
+    [
+        # 0纯文本 9电话号 18话题 27百科词条
+        ((0, 9, 18, 27), FragText_c.from_tbdata, ("texts",)),
+        # 11:tid=5047676428
+        ((2, 11), FragEmoji_c.from_tbdata, ("emojis",)),
+        ((4,), FragAt_c.from_tbdata, ("ats", "texts")),
+        ((1,), FragLink_c.from_tbdata, ("links", "texts")),
+        ((10,), FragVoice_c.from_tbdata, ("voices",)),
+        # 35|36:tid=7769728331 / 37:tid=7760184147
+        ((35, 36, 37), FragTiebaPlus_c.from_tbdata, ("tiebapluses", "texts")),
+    ],
+    # 34过时的贴吧plus
+    ignored=(34,),
+)
+_FRAG_DECODER_C_NOMEDIA = _FRAG_DECODER_C.without("voices")
+
+
+@slotted
 @dcs.dataclass
 class Contents_c(Containers[TypeFragment]):
     """
@@ -52,68 +83,20 @@ class Contents_c(Containers[TypeFragment]):
     voice: FragVoice_c = dcs.field(default_factory=FragVoice_c, repr=False)
 
     @staticmethod
-    def from_tbdata(data_proto: TypeMessage) -> Contents_c:
-        content_protos = data_proto.content
-
-        texts = []
-        emojis = []
-        ats = []
-        links = []
-        tiebapluses = []
-        voice = FragVoice_c()
-
-        def _frags():
-            for proto in content_protos:
-                _type = proto.type
-                # 0纯文本 9电话号 18话题 27百科词条
-                if _type in [0, 9, 18, 27]:
-                    frag = FragText_c.from_tbdata(proto)
-                    texts.append(frag)
-                    yield frag
-                # 11:tid=5047676428
-                elif _type in [2, 11]:
-                    frag = FragEmoji_c.from_tbdata(proto)
-                    emojis.append(frag)
-                    yield frag
-                elif _type == 4:
-                    frag = FragAt_c.from_tbdata(proto)
-                    ats.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_c.from_tbdata(proto)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 10:  # voice
-                    frag = FragVoice_c.from_tbdata(proto)
-                    nonlocal voice
-                    voice = frag
-                    yield frag
-                # 35|36:tid=7769728331 / 37:tid=7760184147
-                elif _type in [35, 36, 37]:
-                    frag = FragTiebaPlus_c.from_tbdata(proto)
-                    tiebapluses.append(frag)
-                    texts.append(frag)
-                    yield frag
-                # outdated tiebaplus
-                elif _type == 34:
-                    continue
-                else:
-                    from ...logging import get_logger as LOG
-
-                    LOG().warning("Unknown fragment type. type=%s proto=%s", _type, proto)
-
-        objs = list(_frags())
+    def from_tbdata(data_proto: TypeMessage, media: bool = True) -> Contents_c:
+        decoder = _FRAG_DECODER_C if media else _FRAG_DECODER_C_NOMEDIA
+        objs, (texts, emojis, _, ats, links, tiebapluses, _, voices) = decoder.decode(data_proto.content)
+        voice = voices[-1] if voices else FragVoice_c()
 
         return Contents_c(objs, texts, emojis, ats, links, tiebapluses, voice)
 
-    @cached_property
+    @cached_slot_property
     def text(self) -> str:
         text = "".join(frag.text for frag in self.texts)
         return text
 
 
+@slotted(weakref=True)
 @dcs.dataclass
 class UserInfo_c:
     """
@@ -164,13 +147,13 @@ class UserInfo_c:
         user_name = data_proto.name
         nick_name_new = data_proto.name_show
         level = data_proto.level_id
-        gender = Gender(data_proto.gender)
+        gender = GENDERS[data_proto.gender]
         icons = [name for i in data_proto.iconinfo if (name := i.name)]
         is_bawu = bool(data_proto.is_bawu)
         is_vip = bool(data_proto.new_tshow_icon)
         is_god = bool(data_proto.new_god_data.status)
-        priv_like = PrivLike(priv_like) if (priv_like := data_proto.priv_sets.like) else PrivLike.PUBLIC
-        priv_reply = PrivReply(priv_reply) if (priv_reply := data_proto.priv_sets.reply) else PrivReply.ALL
+        priv_like = PRIV_LIKES[data_proto.priv_sets.like]
+        priv_reply = PRIV_REPLYS[data_proto.priv_sets.reply]
         return UserInfo_c(
             user_id,
             portrait,
@@ -206,7 +189,7 @@ class UserInfo_c:
     def show_name(self) -> str:
         return self.nick_name_new or self.user_name
 
-    @cached_property
+    @cached_slot_property
     def log_name(self) -> str:
         if self.user_name:
             return self.user_name
@@ -216,6 +199,33 @@ class UserInfo_c:
             return str(self.user_id)
 
 
+def _pop_reply_prefix(contents: Contents_c, data_proto: TypeMessage) -> int:
+    """
+    移除楼中楼开头的"回复 @xxx :"前缀
+
+    Returns:
+        int: 被回复者的user_id 没有前缀时返回0
+    """
+
+    reply_to_id = 0
+    if contents:
+        first_frag = contents[0]
+        if (
+            isinstance(first_frag, FragText_c)
+            and first_frag.text == "回复 "
+            and (reply_to_id := data_proto.content[1].uid)
+        ):
+            if isinstance(contents[1], FragAt_c):
+                del contents.ats[0]
+            contents.objs = contents.objs[2:]
+            contents.texts = contents.texts[2:]
+            if contents.texts:
+                first_text_frag = contents.texts[0]
+                first_text_frag.text = first_text_frag.text.removeprefix(" :")
+    return reply_to_id
+
+
+@slotted
 @dcs.dataclass
 class Comment:
     """
@@ -258,28 +268,17 @@ class Comment:
     is_thread_author: bool = False
 
     @staticmethod
-    def from_tbdata(data_proto: TypeMessage) -> None:
-        contents = Contents_c.from_tbdata(data_proto)
-
-        reply_to_id = 0
-        if contents:
-            first_frag = contents[0]
-            if (
-                isinstance(first_frag, FragText_c)
-                and first_frag.text == "回复 "
-                and (reply_to_id := data_proto.content[1].uid)
-            ):
-                reply_to_id = reply_to_id
-                if isinstance(contents[1], FragAt_c):
-                    del contents.ats[0]
-                contents.objs = contents.objs[2:]
-                contents.texts = contents.texts[2:]
-                if contents.texts:
-                    first_text_frag = contents.texts[0]
-                    first_text_frag.text = first_text_frag.text.removeprefix(" :")
-
+    def from_tbdata(data_proto: TypeMessage, fields: ReqFields = ReqFields.ALL) -> Comment:
+        mask = field_mask(fields)
+        if mask.contents:
+            contents = Contents_c.from_tbdata(data_proto, mask.media)
+            reply_to_id = _pop_reply_prefix(contents, data_proto)
+        else:
+            contents = Contents_c()
+            reply_to_id = peek_reply_to_id(data_proto)
         pid = data_proto.id
-        user = UserInfo_c.from_tbdata(data_proto.author)
+        # 未请求用户信息时仅保留user_id 以便author_id与is_thread_author仍然可用
+        user = convert_user(UserInfo_c, data_proto.author) if mask.user else UserInfo_c(data_proto.author.id)
         agree = data_proto.agree.agree_num
         disagree = data_proto.agree.disagree_num
         create_time = data_proto.time
@@ -301,6 +300,48 @@ class Comment:
         return self.user.user_id
 
 
+class LazyComment(Comment):
+    """
+    按需解析的楼中楼信息
+    公开属性与Comment相同 contents / reply_to_id / user在首次访问时才从protobuf中转换
+    """
+
+    def __init__(self, data_proto: TypeMessage, post: Post_c, thread_author_id: int) -> None:
+        self._proto = data_proto
+        self.fid = post.fid
+        self.fname = post.fname
+        self.tid = post.tid
+        self.ppid = post.pid
+        self.pid = data_proto.id
+        self.floor = post.floor
+        self.agree = data_proto.agree.agree_num
+        self.disagree = data_proto.agree.disagree_num
+        self.create_time = data_proto.time
+        self.is_thread_author = thread_author_id == data_proto.author.id
+
+    @cached_property
+    def contents(self) -> Contents_c:
+        contents = Contents_c.from_tbdata(self._proto)
+        self.reply_to_id = _pop_reply_prefix(contents, self._proto)
+        return contents
+
+    @cached_property
+    def reply_to_id(self) -> int:
+        _ = self.contents
+        return self.__dict__["reply_to_id"]
+
+    @cached_property
+    def user(self) -> UserInfo_c:
+        return convert_user(UserInfo_c, self._proto.author)
+
+    @property
+    def author_id(self) -> int:
+        if "user" in self.__dict__:
+            return self.user.user_id
+        return self._proto.author.id
+
+
+@slotted
 @dcs.dataclass
 class Page_c:
     """
@@ -335,6 +376,7 @@ class Page_c:
         return Page_c(page_size, current_page, total_page, total_count, has_more, has_prev)
 
 
+@slotted
 @dcs.dataclass
 class Forum_c:
     """
@@ -363,6 +405,7 @@ class Forum_c:
         return Forum_c(fid, fname, category, subcategory)
 
 
+@slotted(weakref=True)
 @dcs.dataclass
 class UserInfo_ct:
     """
@@ -423,7 +466,7 @@ class UserInfo_ct:
     def show_name(self) -> str:
         return self.nick_name_new or self.user_name
 
-    @cached_property
+    @cached_slot_property
     def log_name(self) -> str:
         if self.user_name:
             return self.user_name
@@ -433,6 +476,7 @@ class UserInfo_ct:
             return str(self.user_id)
 
 
+@slotted
 @dcs.dataclass
 class Thread_c:
     """
@@ -465,10 +509,13 @@ class Thread_c:
     reply_num: int = 0
 
     @staticmethod
-    def from_tbdata(data_proto: TypeMessage) -> Thread_c:
+    def from_tbdata(data_proto: TypeMessage, fields: ReqFields = ReqFields.ALL) -> Thread_c:
         title = data_proto.title
         tid = data_proto.id
-        user = UserInfo_ct.from_tbdata(data_proto.author)
+        if field_mask(fields).user:
+            user = UserInfo_ct.from_tbdata(data_proto.author)
+        else:
+            user = UserInfo_ct(data_proto.author.id)
         type_ = data_proto.thread_type
         reply_num = data_proto.reply_num
         return Thread_c(title, 0, "", tid, user, type_, reply_num)
@@ -488,6 +535,7 @@ class Thread_c:
         return self.type == 71
 
 
+@slotted
 @dcs.dataclass
 class FragImage_cp:
     """
@@ -530,6 +578,26 @@ class FragImage_cp:
         return FragImage_cp(src, big_src, origin_src, origin_size, show_width, show_height, hash_)
 
 
+_FRAG_DECODER_CP = FragDecoder(
+    [
+        # 0纯文本 9电话号 18话题 27百科词条
+        ((0, 9, 18, 27), FragText_cp.from_tbdata, ("texts",)),
+        # 11:tid=5047676428
+        ((2, 11), FragEmoji_cp.from_tbdata, ("emojis",)),
+        # 20:tid=5470214675
+        ((3, 20), FragImage_cp.from_tbdata, ("imgs",)),
+        ((4,), FragAt_cp.from_tbdata, ("ats", "texts")),
+        ((1,), FragLink_cp.from_tbdata, ("links", "texts")),
+        ((10,), FragVoice_cp.from_tbdata, ("voices",)),
+        # 35|36:tid=7769728331 / 37:tid=7760184147
+        ((35, 36, 37), FragTiebaPlus_cp.from_tbdata, ("tiebapluses", "texts")),
+    ],
+    # 34过时的贴吧plus
+    ignored=(34,),
+)
+
+
+@slotted
 @dcs.dataclass
 class Contents_cp(Containers[TypeFragment]):
     """
@@ -559,73 +627,18 @@ class Contents_cp(Containers[TypeFragment]):
 
     @staticmethod
     def from_tbdata(data_proto: TypeMessage) -> Contents_cp:
-        content_protos = data_proto.content
-
-        texts = []
-        emojis = []
-        imgs = []
-        ats = []
-        links = []
-        tiebapluses = []
-        voice = FragVoice_cp()
-
-        def _frags():
-            for proto in content_protos:
-                _type = proto.type
-                # 0纯文本 9电话号 18话题 27百科词条
-                if _type in [0, 9, 18, 27]:
-                    frag = FragText_cp.from_tbdata(proto)
-                    texts.append(frag)
-                    yield frag
-                # 11:tid=5047676428
-                elif _type in [2, 11]:
-                    frag = FragEmoji_cp.from_tbdata(proto)
-                    emojis.append(frag)
-                    yield frag
-                # 20:tid=5470214675
-                elif _type in [3, 20]:
-                    frag = FragImage_cp.from_tbdata(proto)
-                    imgs.append(frag)
-                    yield frag
-                elif _type == 4:
-                    frag = FragAt_cp.from_tbdata(proto)
-                    ats.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_cp.from_tbdata(proto)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 10:  # voice
-                    frag = FragVoice_cp.from_tbdata(proto)
-                    nonlocal voice
-                    voice = frag
-                    yield frag
-                # 35|36:tid=7769728331 / 37:tid=7760184147
-                elif _type in [35, 36, 37]:
-                    frag = FragTiebaPlus_cp.from_tbdata(proto)
-                    tiebapluses.append(frag)
-                    texts.append(frag)
-                    yield frag
-                # outdated tiebaplus
-                elif _type == 34:
-                    continue
-                else:
-                    from ...logging import get_logger as LOG
-
-                    LOG().warning("Unknown fragment type. type=%s proto=%s", _type, proto)
-
-        objs = list(_frags())
+        objs, (texts, emojis, imgs, ats, links, tiebapluses, _, voices) = _FRAG_DECODER_CP.decode(data_proto.content)
+        voice = voices[-1] if voices else FragVoice_cp()
 
         return Contents_cp(objs, texts, emojis, imgs, ats, links, tiebapluses, voice)
 
-    @cached_property
+    @cached_slot_property
     def text(self) -> str:
         text = "".join(frag.text for frag in self.texts)
         return text
 
 
+@slotted(weakref=True)
 @dcs.dataclass
 class UserInfo_cp:
     """
@@ -674,12 +687,12 @@ class UserInfo_cp:
         user_name = data_proto.name
         nick_name_new = data_proto.name_show
         level = data_proto.level_id
-        gender = Gender(data_proto.gender)
+        gender = GENDERS[data_proto.gender]
         is_bawu = bool(data_proto.is_bawu)
         is_vip = bool(data_proto.new_tshow_icon)
         is_god = bool(data_proto.new_god_data.status)
-        priv_like = PrivLike(priv_like) if (priv_like := data_proto.priv_sets.like) else PrivLike.PUBLIC
-        priv_reply = PrivReply(priv_reply) if (priv_reply := data_proto.priv_sets.reply) else PrivReply.ALL
+        priv_like = PRIV_LIKES[data_proto.priv_sets.like]
+        priv_reply = PRIV_REPLYS[data_proto.priv_sets.reply]
         return UserInfo_cp(
             user_id, portrait, user_name, nick_name_new, level, gender, is_bawu, is_vip, is_god, priv_like, priv_reply
         )
@@ -704,7 +717,7 @@ class UserInfo_cp:
     def show_name(self) -> str:
         return self.nick_name_new or self.user_name
 
-    @cached_property
+    @cached_slot_property
     def log_name(self) -> str:
         if self.user_name:
             return self.user_name
@@ -714,6 +727,7 @@ class UserInfo_cp:
             return str(self.user_id)
 
 
+@slotted
 @dcs.dataclass
 class Post_c:
     """
@@ -748,11 +762,14 @@ class Post_c:
     create_time: int = 0
 
     @staticmethod
-    def from_tbdata(data_proto: TypeMessage) -> Post_c:
+    def from_tbdata(data_proto: TypeMessage, fields: ReqFields = ReqFields.ALL) -> Post_c:
         contents = Contents_cp.from_tbdata(data_proto)
         sign = "".join(p.text for p in data_proto.signature.content if p.type == 0)
         pid = data_proto.id
-        user = UserInfo_cp.from_tbdata(data_proto.author)
+        if field_mask(fields).user:
+            user = UserInfo_cp.from_tbdata(data_proto.author)
+        else:
+            user = UserInfo_cp(data_proto.author.id)
         floor = data_proto.floor
         create_time = data_proto.time
         return Post_c(contents, sign, 0, "", 0, pid, user, floor, create_time)
@@ -763,7 +780,7 @@ class Post_c:
     def __hash__(self) -> int:
         return self.pid
 
-    @cached_property
+    @cached_slot_property
     def text(self) -> str:
         if self.sign:
             text = f"{self.contents.text}\n{self.sign}"
@@ -776,6 +793,7 @@ class Post_c:
         return self.user.user_id
 
 
+@slotted
 @dcs.dataclass
 class Comments(TbErrorExt, Containers[Comment]):
     """
@@ -799,18 +817,22 @@ class Comments(TbErrorExt, Containers[Comment]):
     post: Post_c = dcs.field(default_factory=Post_c)
 
     @staticmethod
-    def from_tbdata(data_proto: TypeMessage) -> Comments:
+    def from_tbdata(data_proto: TypeMessage, lazy: bool = False, fields: ReqFields = ReqFields.ALL) -> Comments:
         page = Page_c.from_tbdata(data_proto.page)
         forum = Forum_c.from_tbdata(data_proto.forum)
-        thread = Thread_c.from_tbdata(data_proto.thread)
+        thread = Thread_c.from_tbdata(data_proto.thread, fields)
         thread.fid = forum.fid
         thread.fname = forum.fname
-        post = Post_c.from_tbdata(data_proto.post)
+        post = Post_c.from_tbdata(data_proto.post, fields)
         post.fid = thread.fid
         post.fname = thread.fname
         post.tid = thread.tid
 
-        objs = [Comment.from_tbdata(p) for p in data_proto.subpost_list]
+        if lazy:
+            objs = [LazyComment(p, post, thread.author_id) for p in data_proto.subpost_list]
+            return Comments(objs, page, forum, thread, post)
+
+        objs = [Comment.from_tbdata(p, fields) for p in data_proto.subpost_list]
         for comment in objs:
             comment.fid = forum.fid
             comment.fname = forum.fname
@@ -1,2 +1,2 @@
-from ._api import CMD, pack_proto, parse_body, request_http, request_ws
-from ._classdef import Comment_p, Post, Posts, Thread_p, UserInfo_p, UserInfo_pt
+from ._api import CMD, pack_proto, parse_body, parse_proto, request_body_http, request_body_ws, request_http, request_ws
+from ._classdef import Comment_p, LazyPost, Post, Posts, Thread_p, UserInfo_p, UserInfo_pt
@@ -2,6 +2,7 @@ import yarl
 
 from ...const import APP_BASE_HOST, MAIN_VERSION
 from ...core import Account, HttpCore, WsCore
+from ...enums import ReqFields
 from ...exception import TiebaServerError
 from ._classdef import Posts
 from .protobuf import PbPageReqIdl_pb2, PbPageResIdl_pb2
@@ -37,20 +38,26 @@ def pack_proto(
     return req_proto.SerializeToString()
 
 
-def parse_body(body: bytes) -> Posts:
+def parse_proto(body: bytes) -> PbPageResIdl_pb2.PbPageResIdl:
     res_proto = PbPageResIdl_pb2.PbPageResIdl()
     res_proto.ParseFromString(body)
 
     if code := res_proto.error.errorno:
         raise TiebaServerError(code, res_proto.error.errmsg)
 
+    return res_proto
+
+
+def parse_body(body: bytes, lazy: bool = False, fields: ReqFields = ReqFields.ALL) -> Posts:
+    res_proto = parse_proto(body)
+
     data_proto = res_proto.data
-    posts = Posts.from_tbdata(data_proto)
+    posts = Posts.from_tbdata(data_proto, lazy, fields)
 
     return posts
 
 
-async def request_http(
+async def request_body_http(
     http_core: HttpCore,
     tid: int,
     pn: int,
@@ -60,7 +67,7 @@ async def request_http(
     with_comments: bool,
     comment_sort_by_agree: bool,
     comment_rn: int,
-) -> Posts:
+) -> bytes:
     data = pack_proto(
         http_core.account,
         tid,
@@ -78,12 +85,11 @@ async def request_http(
         data,
     )
 
-    body = await http_core.net_core.send_request(request, read_bufsize=128 * 1024)
-    return parse_body(body)
+    return await http_core.net_core.send_request(request, read_bufsize=128 * 1024)
 
 
-async def request_ws(
-    ws_core: WsCore,
+async def request_http(
+    http_core: HttpCore,
     tid: int,
     pn: int,
     rn: int,
@@ -92,7 +98,26 @@ async def request_ws(
     with_comments: bool,
     comment_sort_by_agree: bool,
     comment_rn: int,
+    lazy: bool = False,
+    fields: ReqFields = ReqFields.ALL,
 ) -> Posts:
+    body = await request_body_http(
+        http_core, tid, pn, rn, sort, only_thread_author, with_comments, comment_sort_by_agree, comment_rn
+    )
+    return await http_core.net_core.parse(parse_body, body, lazy, fields, inline=lazy)
+
+
+async def request_body_ws(
+    ws_core: WsCore,
+    tid: int,
+    pn: int,
+    rn: int,
+    sort: int,
+    only_thread_author: bool,
+    with_comments: bool,
+    comment_sort_by_agree: bool,
+    comment_rn: int,
+) -> bytes:
     data = pack_proto(
         ws_core.account,
         tid,
@@ -106,4 +131,23 @@ async def request_ws(
     )
 
     response = await ws_core.send(data, CMD)
-    return parse_body(await response.read())
+    return await response.read()
+
+
+async def request_ws(
+    ws_core: WsCore,
+    tid: int,
+    pn: int,
+    rn: int,
+    sort: int,
+    only_thread_author: bool,
+    with_comments: bool,
+    comment_sort_by_agree: bool,
+    comment_rn: int,
+    lazy: bool = False,
+    fields: ReqFields = ReqFields.ALL,
+) -> Posts:
+    body = await request_body_ws(
+        ws_core, tid, pn, rn, sort, only_thread_author, with_comments, comment_sort_by_agree, comment_rn
+    )
+    return await ws_core.net_core.parse(parse_body, body, lazy, fields, inline=lazy)
@@ -3,9 +3,24 @@ from __future__ import annotations
 import dataclasses as dcs
 from functools import cached_property
 
-from ...enums import Gender, PrivLike, PrivReply
+from ...enums import Gender, PrivLike, PrivReply, ReqFields
 from ...exception import TbErrorExt
-from .._classdef import Containers, TypeMessage, VoteInfo
+from .._classdef import (
+    GENDERS,
+    PRIV_LIKES,
+    PRIV_REPLYS,
+    Containers,
+    DefaultUsers,
+    FragDecoder,
+    LazyUsers,
+    TypeMessage,
+    VoteInfo,
+    cached_slot_property,
+    convert_user,
+    field_mask,
+    peek_reply_to_id,
+    slotted,
+)
 from .._classdef.contents import (
     _IMAGEHASH_EXP,
     FragAt,
@@ -28,6 +43,7 @@ FragVideo_pt = FragVideo
 FragVoice_p = FragVoice_pt = FragVoice_pc = FragVoice
 
 
+@slotted
 @dcs.dataclass
 class FragImage_p:
     """
@@ -70,6 +86,7 @@ class FragImage_p:
         return FragImage_p(src, big_src, origin_src, origin_size, show_width, show_height, hash_)
 
 
+@slotted
 @dcs.dataclass
 class FragVideo_p:
     """
@@ -105,6 +122,28 @@ class FragVideo_p:
         return bool(self.width)
 
 
+_FRAG_DECODER_P = FragDecoder(
+    [
+        # 0纯文本 9电话号 18话题 27百科词条 40梗百科
+        ((0, 9, 18, 27, 40), FragText_p.from_tbdata, ("texts",)),
+        # 11:tid=5047676428
+        ((2, 11), FragEmoji_p.from_tbdata, ("emojis",)),
+        # 20:tid=5470214675
+        ((3, 20), FragImage_p.from_tbdata, ("imgs",)),
+        ((4,), FragAt_p.from_tbdata, ("ats", "texts")),
+        ((1,), FragLink_p.from_tbdata, ("links", "texts")),
+        ((10,), FragVoice_p.from_tbdata, ("voices",)),
+        ((5,), FragVideo_p.from_tbdata, ("videos",)),
+        # 35|36:tid=7769728331 / 37:tid=7760184147
+        ((35, 36, 37), FragTiebaPlus_p.from_tbdata, ("tiebapluses", "texts")),
+    ],
+    # 34过时的贴吧plus
+    ignored=(34,),
+)
+_FRAG_DECODER_P_NOMEDIA = _FRAG_DECODER_P.without("imgs", "videos", "voices")
+
+
+@slotted
 @dcs.dataclass
 class Contents_p(Containers[TypeFragment]):
     """
@@ -135,80 +174,39 @@ class Contents_p(Containers[TypeFragment]):
     voice: FragVoice_p = dcs.field(default_factory=FragVoice_p, repr=False)
 
     @staticmethod
-    def from_tbdata(data_proto: TypeMessage) -> Contents_p:
-        content_protos = data_proto.content
-
-        texts = []
-        emojis = []
-        imgs = []
-        ats = []
-        links = []
-        tiebapluses = []
-        video = FragVideo_p()
-        voice = FragVoice_p()
-
-        def _frags():
-            for proto in content_protos:
-                _type = proto.type
-                # 0纯文本 9电话号 18话题 27百科词条 40梗百科
-                if _type in [0, 9, 18, 27, 40]:
-                    frag = FragText_p.from_tbdata(proto)
-                    texts.append(frag)
-                    yield frag
-                # 11:tid=5047676428
-                elif _type in [2, 11]:
-                    frag = FragEmoji_p.from_tbdata(proto)
-                    emojis.append(frag)
-                    yield frag
-                # 20:tid=5470214675
-                elif _type in [3, 20]:
-                    frag = FragImage_p.from_tbdata(proto)
-                    imgs.append(frag)
-                    yield frag
-                elif _type == 4:
-                    frag = FragAt_p.from_tbdata(proto)
-                    ats.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_p.from_tbdata(proto)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 10:  # voice
-                    frag = FragVoice_p.from_tbdata(proto)
-                    nonlocal voice
-                    voice = frag
-                    yield frag
-                elif _type == 5:  # video
-                    frag = FragVideo_p.from_tbdata(proto)
-                    nonlocal video
-                    video = frag
-                    yield frag
-                # 35|36:tid=7769728331 / 37:tid=7760184147
-                elif _type in [35, 36, 37]:
-                    frag = FragTiebaPlus_p.from_tbdata(proto)
-                    tiebapluses.append(frag)
-                    texts.append(frag)
-                    yield frag
-                # outdated tiebaplus
-                elif _type == 34:
-                    continue
-                else:
-                    from ...logging import get_logger as LOG
-
-                    LOG().warning("Unknown fragment type. type=%s proto=%s", _type, proto)
-
-        objs = list(_frags())
+    def from_tbdata(data_proto: TypeMessage, media: bool = True) -> Contents_p:
+        decoder = _FRAG_DECODER_P if media else _FRAG_DECODER_P_NOMEDIA
+        objs, (texts, emojis, imgs, ats, links, tiebapluses, videos, voices) = decoder.decode(data_proto.content)
+        video = videos[-1] if videos else FragVideo_p()
+        voice = voices[-1] if voices else FragVoice_p()
 
         return Contents_p(objs, texts, emojis, imgs, ats, links, tiebapluses, video, voice)
 
-    @cached_property
+    @cached_slot_property
     def text(self) -> str:
         text = "".join(frag.text for frag in self.texts)
         return text
 
 
+_FRAG_DECODER_PC = FragDecoder(
+    [
+        # 0纯文本 9电话号 18话题 27百科词条
+        ((0, 9, 18, 27), FragText_pc.from_tbdata, ("texts",)),
+        # 11:tid=5047676428
+        ((2, 11), FragEmoji_pc.from_tbdata, ("emojis",)),
+        ((4,), FragAt_pc.from_tbdata, ("ats", "texts")),
+        ((1,), FragLink_pc.from_tbdata, ("links", "texts")),
+        ((10,), FragVoice_pc.from_tbdata, ("voices",)),
+        # 35|36:tid=7769728331 / 37:tid=7760184147
+        ((35, 36, 37), FragTiebaPlus_pc.from_tbdata, ("tiebapluses", "texts")),
+    ],
+    # 34过时的贴吧plus
+    ignored=(34,),
+)
+_FRAG_DECODER_PC_NOMEDIA = _FRAG_DECODER_PC.without("voices")
+
+
+@slotted
 @dcs.dataclass
 class Contents_pc(Containers[TypeFragment]):
     """
@@ -235,68 +233,20 @@ class Contents_pc(Containers[TypeFragment]):
     voice: FragVoice_pc = dcs.field(default_factory=FragVoice_pc, repr=False)
 
     @staticmethod
-    def from_tbdata(data_proto: TypeMessage) -> Contents_pc:
-        content_protos = data_proto.content
-
-        texts = []
-        emojis = []
-        ats = []
-        links = []
-        tiebapluses = []
-        voice = FragVoice_pc()
-
-        def _frags():
-            for proto in content_protos:
-                _type = proto.type
-                # 0纯文本 9电话号 18话题 27百科词条
-                if _type in [0, 9, 18, 27]:
-                    frag = FragText_pc.from_tbdata(proto)
-                    texts.append(frag)
-                    yield frag
-                # 11:tid=5047676428
-                elif _type in [2, 11]:
-                    frag = FragEmoji_pc.from_tbdata(proto)
-                    emojis.append(frag)
-                    yield frag
-                elif _type == 4:
-                    frag = FragAt_pc.from_tbdata(proto)
-                    ats.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_pc.from_tbdata(proto)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 10:  # voice
-                    frag = FragVoice_pc.from_tbdata(proto)
-                    nonlocal voice
-                    voice = frag
-                    yield frag
-                # 35|36:tid=7769728331 / 37:tid=7760184147
-                elif _type in [35, 36, 37]:
-                    frag = FragTiebaPlus_pc.from_tbdata(proto)
-                    tiebapluses.append(frag)
-                    texts.append(frag)
-                    yield frag
-                # outdated tiebaplus
-                elif _type == 34:
-                    continue
-                else:
-                    from ...logging import get_logger as LOG
-
-                    LOG().warning("Unknown fragment type. type=%s proto=%s", _type, proto)
-
-        objs = list(_frags())
+    def from_tbdata(data_proto: TypeMessage, media: bool = True) -> Contents_pc:
+        decoder = _FRAG_DECODER_PC if media else _FRAG_DECODER_PC_NOMEDIA
+        objs, (texts, emojis, _, ats, links, tiebapluses, _, voices) = decoder.decode(data_proto.content)
+        voice = voices[-1] if voices else FragVoice_pc()
 
         return Contents_pc(objs, texts, emojis, ats, links, tiebapluses, voice)
 
-    @cached_property
+    @cached_slot_property
     def text(self) -> str:
         text = "".join(frag.text for frag in self.texts)
         return text
 
 
+@slotted(weakref=True)
 @dcs.dataclass
 class UserInfo_p:
     """
@@ -352,14 +302,14 @@ class UserInfo_p:
         nick_name_new = data_proto.name_show
         level = data_proto.level_id
         glevel = data_proto.user_growth.level_id
-        gender = Gender(data_proto.gender)
+        gender = GENDERS[data_proto.gender]
         ip = data_proto.ip_address
         icons = [name for i in data_proto.iconinfo if (name := i.name)]
         is_bawu = bool(data_proto.is_bawu)
         is_vip = bool(data_proto.new_tshow_icon)
         is_god = bool(data_proto.new_god_data.status)
-        priv_like = PrivLike(priv_like) if (priv_like := data_proto.priv_sets.like) else PrivLike.PUBLIC
-        priv_reply = PrivReply(priv_reply) if (priv_reply := data_proto.priv_sets.reply) else PrivReply.ALL
+        priv_like = PRIV_LIKES[data_proto.priv_sets.like]
+        priv_reply = PRIV_REPLYS[data_proto.priv_sets.reply]
         return UserInfo_p(
             user_id,
             portrait,
@@ -397,7 +347,7 @@ class UserInfo_p:
     def show_name(self) -> str:
         return self.nick_name_new or self.user_name
 
-    @cached_property
+    @cached_slot_property
     def log_name(self) -> str:
         if self.user_name:
             return self.user_name
@@ -407,6 +357,7 @@ class UserInfo_p:
             return str(self.user_id)
 
 
+@slotted
 @dcs.dataclass
 class Comment_p:
     """
@@ -450,8 +401,9 @@ class Comment_p:
     is_thread_author: bool = False
 
     @staticmethod
-    def from_tbdata(data_proto: TypeMessage) -> Comment_p:
-        contents = Contents_pc.from_tbdata(data_proto)
+    def from_tbdata(data_proto: TypeMessage, fields: ReqFields = ReqFields.ALL) -> Comment_p:
+        mask = field_mask(fields)
+        contents = Contents_pc.from_tbdata(data_proto, mask.media) if mask.contents else Contents_pc()
 
         reply_to_id = 0
         if contents:
@@ -469,6 +421,8 @@ class Comment_p:
                 if contents.texts:
                     first_text_frag = contents.texts[0]
                     first_text_frag.text = first_text_frag.text.removeprefix(" :")
+        elif not mask.contents:
+            reply_to_id = peek_reply_to_id(data_proto)
 
         contents = contents
 
@@ -493,6 +447,7 @@ class Comment_p:
         return self.contents.text
 
 
+@slotted
 @dcs.dataclass
 class Post:
     """
@@ -540,10 +495,14 @@ class Post:
     is_thread_author: bool = False
 
     @staticmethod
-    def from_tbdata(data_proto: TypeMessage) -> Post:
-        contents = Contents_p.from_tbdata(data_proto)
-        sign = "".join(p.text for p in data_proto.signature.content if p.type == 0)
-        comments = [Comment_p.from_tbdata(p) for p in data_proto.sub_post_list.sub_post_list]
+    def from_tbdata(data_proto: TypeMessage, fields: ReqFields = ReqFields.ALL) -> Post:
+        mask = field_mask(fields)
+        contents = Contents_p.from_tbdata(data_proto, mask.media) if mask.contents else Contents_p()
+        sign = "".join(p.text for p in data_proto.signature.content if p.type == 0) if mask.sign else ""
+        if mask.comments:
+            comments = [Comment_p.from_tbdata(p, fields) for p in data_proto.sub_post_list.sub_post_list]
+        else:
+            comments = []
         is_aimeme = bool(data_proto.sprite_meme_info.meme_id)
         pid = data_proto.id
         author_id = data_proto.author_id
@@ -577,7 +536,7 @@ class Post:
     def __hash__(self) -> int:
         return self.pid
 
-    @cached_property
+    @cached_slot_property
     def text(self) -> str:
         if self.sign:
             text = f"{self.contents.text}\n{self.sign}"
@@ -586,6 +545,56 @@ class Post:
         return text
 
 
+class LazyPost(Post):
+    """
+    按需解析的楼层信息
+    公开属性与Post相同 contents / sign / comments / user在首次访问时才从protobuf中转换
+    """
+
+    def __init__(self, data_proto: TypeMessage, thread: Thread_p, users: LazyUsers[UserInfo_p]) -> None:
+        self._proto = data_proto
+        self._users = users
+        self._thread_author_id = thread.author_id
+        self.is_aimeme = bool(data_proto.sprite_meme_info.meme_id)
+        self.fid = thread.fid
+        self.fname = thread.fname
+        self.tid = thread.tid
+        self.pid = data_proto.id
+        self.author_id = data_proto.author_id
+        self.floor = data_proto.floor
+        self.reply_num = data_proto.sub_post_number
+        self.agree = data_proto.agree.agree_num
+        self.disagree = data_proto.agree.disagree_num
+        self.create_time = data_proto.time
+        self.is_thread_author = thread.author_id == self.author_id
+
+    @cached_property
+    def contents(self) -> Contents_p:
+        return Contents_p.from_tbdata(self._proto)
+
+    @cached_property
+    def sign(self) -> str:
+        return "".join(p.text for p in self._proto.signature.content if p.type == 0)
+
+    @cached_property
+    def comments(self) -> list[Comment_p]:
+        comments = [Comment_p.from_tbdata(p) for p in self._proto.sub_post_list.sub_post_list]
+        for comment in comments:
+            comment.fid = self.fid
+            comment.fname = self.fname
+            comment.tid = self.tid
+            comment.ppid = self.pid
+            comment.floor = self.floor
+            comment.user = self._users[comment.author_id]
+            comment.is_thread_author = self._thread_author_id == comment.author_id
+        return comments
+
+    @cached_property
+    def user(self) -> UserInfo_p:
+        return self._users[self.author_id]
+
+
+@slotted
 @dcs.dataclass
 class Page_p:
     """
@@ -620,6 +629,7 @@ class Page_p:
         return Page_p(page_size, current_page, total_page, total_count, has_more, has_prev)
 
 
+@slotted
 @dcs.dataclass
 class Forum_p:
     """
@@ -656,6 +666,7 @@ class Forum_p:
         return Forum_p(fid, fname, category, subcategory, member_num, post_num)
 
 
+@slotted
 @dcs.dataclass
 class FragImage_pt:
     """
@@ -694,6 +705,23 @@ class FragImage_pt:
         return FragImage_pt(src, big_src, origin_src, show_width, show_height, hash_)
 
 
+_FRAG_DECODER_PT = FragDecoder(
+    [
+        # 0纯文本 9电话号 18话题 27百科词条
+        ((0, 9, 18, 27), FragText_pt.from_tbdata, ("texts",)),
+        # 11:tid=5047676428
+        ((2, 11), FragEmoji_pt.from_tbdata, ("emojis",)),
+        ((4,), FragAt_pt.from_tbdata, ("ats", "texts")),
+        ((1,), FragLink_pt.from_tbdata, ("links", "texts")),
+        # 35|36:tid=7769728331 / 37:tid=7760184147
+        ((35, 36, 37), FragTiebaPlus_pt.from_tbdata, ("tiebapluses", "texts")),
+    ],
+    # 34过时的贴吧plus
+    ignored=(34,),
+)
+
+
+@slotted
 @dcs.dataclass
 class Contents_pt(Containers[TypeFragment]):
     """
@@ -724,66 +752,21 @@ class Contents_pt(Containers[TypeFragment]):
     voice: FragVoice_pt = dcs.field(default_factory=FragVoice_pt, repr=False)
 
     @staticmethod
-    def from_tbdata(data_proto: TypeMessage) -> Contents_pt:
-        content_protos = data_proto.content
-
-        texts = []
-        emojis = []
-        imgs = [FragImage_pt.from_tbdata(p) for p in data_proto.media]
-        ats = []
-        links = []
-        tiebapluses = []
-
-        def _frags():
-            for proto in content_protos:
-                _type = proto.type
-                # 0纯文本 9电话号 18话题 27百科词条
-                if _type in [0, 9, 18, 27]:
-                    frag = FragText_pt.from_tbdata(proto)
-                    texts.append(frag)
-                    yield frag
-                # 11:tid=5047676428
-                elif _type in [2, 11]:
-                    frag = FragEmoji_pt.from_tbdata(proto)
-                    emojis.append(frag)
-                    yield frag
-                elif _type == 4:
-                    frag = FragAt_pt.from_tbdata(proto)
-                    ats.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_pt.from_tbdata(proto)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                # 35|36:tid=7769728331 / 37:tid=7760184147
-                elif _type in [35, 36, 37]:
-                    frag = FragTiebaPlus_pt.from_tbdata(proto)
-                    tiebapluses.append(frag)
-                    texts.append(frag)
-                    yield frag
-                # outdated tiebaplus
-                elif _type == 34:
-                    continue
-                else:
-                    from ...logging import get_logger as LOG
-
-                    LOG().warning("Unknown fragment type. type=%s proto=%s", _type, proto)
-
-        objs = list(_frags())
+    def from_tbdata(data_proto: TypeMessage, media: bool = True) -> Contents_pt:
+        objs, (texts, emojis, _, ats, links, tiebapluses, _, _) = _FRAG_DECODER_PT.decode(data_proto.content)
+        imgs = [FragImage_pt.from_tbdata(p) for p in data_proto.media] if media else []
 
         del ats[0]
         del objs[0]
         objs += imgs
 
-        if data_proto.video_info.video_width:
+        if media and data_proto.video_info.video_width:
             video = FragVideo_pt.from_tbdata(data_proto.video_info)
             objs.append(video)
         else:
             video = FragVideo_pt()
 
-        if data_proto.voice_info:
+        if media and data_proto.voice_info:
             voice = FragVoice_pt.from_tbdata(data_proto.voice_info[0])
             objs.append(voice)
         else:
@@ -791,12 +774,13 @@ class Contents_pt(Containers[TypeFragment]):
 
         return Contents_pt(objs, texts, emojis, imgs, ats, links, tiebapluses, video, voice)
 
-    @cached_property
+    @cached_slot_property
     def text(self) -> str:
         text = "".join(frag.text for frag in self.texts)
         return text
 
 
+@slotted(weakref=True)
 @dcs.dataclass
 class UserInfo_pt:
     """
@@ -855,8 +839,8 @@ class UserInfo_pt:
         is_bawu = bool(data_proto.is_bawu)
         is_vip = bool(data_proto.new_tshow_icon)
         is_god = bool(data_proto.new_god_data.status)
-        priv_like = PrivLike(priv_like) if (priv_like := data_proto.priv_sets.like) else PrivLike.PUBLIC
-        priv_reply = PrivReply(priv_reply) if (priv_reply := data_proto.priv_sets.reply) else PrivReply.ALL
+        priv_like = PRIV_LIKES[data_proto.priv_sets.like]
+        priv_reply = PRIV_REPLYS[data_proto.priv_sets.reply]
         return UserInfo_pt(
             user_id,
             portrait,
@@ -893,7 +877,7 @@ class UserInfo_pt:
     def show_name(self) -> str:
         return self.nick_name_new or self.user_name
 
-    @cached_property
+    @cached_slot_property
     def log_name(self) -> str:
         if self.user_name:
             return self.user_name
@@ -903,6 +887,7 @@ class UserInfo_pt:
             return str(self.user_id)
 
 
+@slotted
 @dcs.dataclass
 class ShareThread_pt:
     """
@@ -948,7 +933,7 @@ class ShareThread_pt:
     def __hash__(self) -> int:
         return self.pid
 
-    @cached_property
+    @cached_slot_property
     def text(self) -> str:
         if self.title:
             text = f"{self.title}\n{self.contents.text}"
@@ -957,6 +942,7 @@ class ShareThread_pt:
         return text
 
 
+@slotted
 @dcs.dataclass
 class Thread_p:
     """
@@ -1010,7 +996,8 @@ class Thread_p:
     create_time: int = 0
 
     @staticmethod
-    def from_tbdata(data_proto: TypeMessage) -> Thread_p:
+    def from_tbdata(data_proto: TypeMessage, fields: ReqFields = ReqFields.ALL) -> Thread_p:
+        mask = field_mask(fields)
         thread_proto = data_proto.thread
         title = thread_proto.title
         tid = thread_proto.id
@@ -1027,13 +1014,15 @@ class Thread_p:
 
         if not is_share:
             real_thread_proto = thread_proto.origin_thread_info
-            contents = Contents_pt.from_tbdata(real_thread_proto)
-            vote_info = VoteInfo.from_tbdata(real_thread_proto.poll_info)
+            contents = Contents_pt.from_tbdata(real_thread_proto, mask.media) if mask.contents else Contents_pt()
+            vote_info = VoteInfo.from_tbdata(real_thread_proto.poll_info) if mask.vote else VoteInfo()
             share_origin = ShareThread_pt()
         else:
             contents = Contents_pt()
             vote_info = VoteInfo()
-            share_origin = ShareThread_pt.from_tbdata(thread_proto.origin_thread_info)
+            share_origin = (
+                ShareThread_pt.from_tbdata(thread_proto.origin_thread_info) if mask.share else ShareThread_pt()
+            )
 
         return Thread_p(
             contents,
@@ -1078,6 +1067,7 @@ class Thread_p:
         return self.type == 71
 
 
+@slotted
 @dcs.dataclass
 class Posts(TbErrorExt, Containers[Post]):
     """
@@ -1099,16 +1089,24 @@ class Posts(TbErrorExt, Containers[Post]):
     thread: Thread_p = dcs.field(default_factory=Thread_p)
 
     @staticmethod
-    def from_tbdata(data_proto: TypeMessage) -> Posts:
+    def from_tbdata(data_proto: TypeMessage, lazy: bool = False, fields: ReqFields = ReqFields.ALL) -> Posts:
         page = Page_p.from_tbdata(data_proto.page)
         forum = Forum_p.from_tbdata(data_proto.forum)
-        thread = Thread_p.from_tbdata(data_proto)
+        thread = Thread_p.from_tbdata(data_proto, fields)
 
         thread.fid = forum.fid
         thread.fname = forum.fname
 
-        objs = [Post.from_tbdata(p) for p in data_proto.post_list if not p.chat_content.bot_uk]
-        users = {p.id: UserInfo_p.from_tbdata(p) for p in data_proto.user_list}
+        if lazy:
+            users = LazyUsers(data_proto.user_list, UserInfo_p)
+            objs = [LazyPost(p, thread, users) for p in data_proto.post_list if not p.chat_content.bot_uk]
+            return Posts(objs, page, forum, thread)
+
+        objs = [Post.from_tbdata(p, fields) for p in data_proto.post_list if not p.chat_content.bot_uk]
+        if field_mask(fields).user:
+            users = {p.id: convert_user(UserInfo_p, p) for p in data_proto.user_list}
+        else:
+            users = DefaultUsers(UserInfo_p)
         for post in objs:
             post.fid = forum.fid
             post.fname = forum.fname
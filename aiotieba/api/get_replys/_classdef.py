@@ -3,7 +3,7 @@ from functools import cached_property
 
 from ...enums import PrivLike, PrivReply
 from ...exception import TbErrorExt
-from .._classdef import Containers, TypeMessage
+from .._classdef import PRIV_LIKES, PRIV_REPLYS, Containers, TypeMessage
 
 
 @dcs.dataclass
@@ -41,8 +41,8 @@ class UserInfo_reply:
             portrait = portrait[:-13]
         user_name = data_proto.name
         nick_name_new = data_proto.name_show
-        priv_like = PrivLike(priv_like) if (priv_like := data_proto.priv_sets.like) else PrivLike.PUBLIC
-        priv_reply = PrivReply(priv_reply) if (priv_reply := data_proto.priv_sets.reply) else PrivReply.ALL
+        priv_like = PRIV_LIKES[data_proto.priv_sets.like]
+        priv_reply = PRIV_REPLYS[data_proto.priv_sets.reply]
         return UserInfo_reply(user_id, portrait, user_name, nick_name_new, priv_like, priv_reply)
 
     def __str__(self) -> str:
@@ -2,6 +2,7 @@ import yarl
 
 from ...const import APP_BASE_HOST, MAIN_VERSION
 from ...core import HttpCore, WsCore
+from ...enums import ReqFields
 from ...exception import TiebaServerError
 from ._classdef import Threads
 from .protobuf import FrsPageReqIdl_pb2, FrsPageResIdl_pb2
@@ -23,20 +24,26 @@ def pack_proto(fname: str, pn: int, rn: int, sort: int, is_good: bool) -> bytes:
     return req_proto.SerializeToString()
 
 
-def parse_body(body: bytes) -> Threads:
+def parse_proto(body: bytes) -> FrsPageResIdl_pb2.FrsPageResIdl:
     res_proto = FrsPageResIdl_pb2.FrsPageResIdl()
     res_proto.ParseFromString(body)
 
     if code := res_proto.error.errorno:
         raise TiebaServerError(code, res_proto.error.errmsg)
 
+    return res_proto
+
+
+def parse_body(body: bytes, lazy: bool = False, fields: ReqFields = ReqFields.ALL) -> Threads:
+    res_proto = parse_proto(body)
+
     data_proto = res_proto.data
-    threads = Threads.from_tbdata(data_proto)
+    threads = Threads.from_tbdata(data_proto, lazy, fields)
 
     return threads
 
 
-async def request_http(http_core: HttpCore, fname: str, pn: int, rn: int, sort: int, is_good: bool) -> Threads:
+async def request_body_http(http_core: HttpCore, fname: str, pn: int, rn: int, sort: int, is_good: bool) -> bytes:
     data = pack_proto(fname, pn, rn, sort, is_good)
 
     request = http_core.pack_proto_request(
@@ -44,12 +51,39 @@ async def request_http(http_core: HttpCore, fname: str, pn: int, rn: int, sort:
         data,
     )
 
-    body = await http_core.net_core.send_request(request, read_bufsize=256 * 1024)
-    return parse_body(body)
+    return await http_core.net_core.send_request(request, read_bufsize=256 * 1024)
+
+
+async def request_http(
+    http_core: HttpCore,
+    fname: str,
+    pn: int,
+    rn: int,
+    sort: int,
+    is_good: bool,
+    lazy: bool = False,
+    fields: ReqFields = ReqFields.ALL,
+) -> Threads:
+    body = await request_body_http(http_core, fname, pn, rn, sort, is_good)
+    return await http_core.net_core.parse(parse_body, body, lazy, fields, inline=lazy)
 
 
-async def request_ws(ws_core: WsCore, fname: str, pn: int, rn: int, sort: int, is_good: bool) -> Threads:
+async def request_body_ws(ws_core: WsCore, fname: str, pn: int, rn: int, sort: int, is_good: bool) -> bytes:
     data = pack_proto(fname, pn, rn, sort, is_good)
 
     response = await ws_core.send(data, CMD)
-    return parse_body(await response.read())
+    return await response.read()
+
+
+async def request_ws(
+    ws_core: WsCore,
+    fname: str,
+    pn: int,
+    rn: int,
+    sort: int,
+    is_good: bool,
+    lazy: bool = False,
+    fields: ReqFields = ReqFields.ALL,
+) -> Threads:
+    body = await request_body_ws(ws_core, fname, pn, rn, sort, is_good)
+    return await ws_core.net_core.parse(parse_body, body, lazy, fields, inline=lazy)
@@ -3,9 +3,23 @@ from __future__ import annotations
 import dataclasses as dcs
 from functools import cached_property
 
-from ...enums import Gender, PrivLike, PrivReply
+from ...enums import Gender, PrivLike, PrivReply, ReqFields
 from ...exception import TbErrorExt
-from .._classdef import Containers, TypeMessage, VoteInfo
+from .._classdef import (
+    GENDERS,
+    PRIV_LIKES,
+    PRIV_REPLYS,
+    Containers,
+    DefaultUsers,
+    FragDecoder,
+    LazyUsers,
+    TypeMessage,
+    VoteInfo,
+    cached_slot_property,
+    convert_user,
+    field_mask,
+    slotted,
+)
 from .._classdef.contents import (
     _IMAGEHASH_EXP,
     FragAt,
@@ -28,6 +42,7 @@ FragVideo_t = FragVideo_st = FragVideo
 FragVoice_t = FragVoice_st = FragVoice
 
 
+@slotted
 @dcs.dataclass
 class FragImage_t:
     """
@@ -70,6 +85,26 @@ class FragImage_t:
         return FragImage_t(src, big_src, origin_src, origin_size, show_width, show_height, hash_)
 
 
+_FRAG_DECODER_T = FragDecoder(
+    [
+        # 0纯文本 9电话号 18话题 27百科词条
+        ((0, 9, 18, 27), FragText_t.from_tbdata, ("texts",)),
+        # 11:tid=5047676428
+        ((2, 11), FragEmoji_t.from_tbdata, ("emojis",)),
+        # 20:tid=5470214675
+        ((3, 20), FragImage_t.from_tbdata, ("imgs",)),
+        ((4,), FragAt_t.from_tbdata, ("ats", "texts")),
+        ((1,), FragLink_t.from_tbdata, ("links", "texts")),
+        # 35|36:tid=7769728331 / 37:tid=7760184147
+        ((35, 36, 37), FragTiebaPlus_t.from_tbdata, ("tiebapluses", "texts")),
+    ],
+    # 5视频 10音频 由video_info和voice_info解析 / 34过时的贴吧plus
+    ignored=(5, 10, 34),
+)
+_FRAG_DECODER_T_NOMEDIA = _FRAG_DECODER_T.without("imgs")
+
+
+@slotted
 @dcs.dataclass
 class Contents_t(Containers[TypeFragment]):
     """
@@ -100,71 +135,17 @@ class Contents_t(Containers[TypeFragment]):
     voice: FragVoice_t = dcs.field(default_factory=FragVoice_t, repr=False)
 
     @staticmethod
-    def from_tbdata(data_proto: TypeMessage) -> Contents_t:
-        content_protos = data_proto.first_post_content
-
-        texts = []
-        emojis = []
-        imgs = []
-        ats = []
-        links = []
-        tiebapluses = []
-
-        def _frags():
-            for proto in content_protos:
-                _type = proto.type
-                # 0纯文本 9电话号 18话题 27百科词条
-                if _type in [0, 9, 18, 27]:
-                    frag = FragText_t.from_tbdata(proto)
-                    texts.append(frag)
-                    yield frag
-                # 11:tid=5047676428
-                elif _type in [2, 11]:
-                    frag = FragEmoji_t.from_tbdata(proto)
-                    emojis.append(frag)
-                    yield frag
-                # 20:tid=5470214675
-                elif _type in [3, 20]:
-                    frag = FragImage_t.from_tbdata(proto)
-                    imgs.append(frag)
-                    yield frag
-                elif _type == 4:
-                    frag = FragAt_t.from_tbdata(proto)
-                    ats.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_t.from_tbdata(proto)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 10:  # voice
-                    continue
-                elif _type == 5:  # video
-                    continue
-                # 35|36:tid=7769728331 / 37:tid=7760184147
-                elif _type in [35, 36, 37]:
-                    frag = FragTiebaPlus_t.from_tbdata(proto)
-                    tiebapluses.append(frag)
-                    texts.append(frag)
-                    yield frag
-                # outdated tiebaplus
-                elif _type == 34:
-                    continue
-                else:
-                    from ...logging import get_logger as LOG
-
-                    LOG().warning("Unknown fragment type. type=%s proto=%s", _type, proto)
-
-        objs = list(_frags())
+    def from_tbdata(data_proto: TypeMessage, media: bool = True) -> Contents_t:
+        decoder = _FRAG_DECODER_T if media else _FRAG_DECODER_T_NOMEDIA
+        objs, (texts, emojis, imgs, ats, links, tiebapluses, _, _) = decoder.decode(data_proto.first_post_content)
 
-        if data_proto.video_info.video_width:
+        if media and data_proto.video_info.video_width:
             video = FragVideo_t.from_tbdata(data_proto.video_info)
             objs.append(video)
         else:
             video = FragVideo_t()
 
-        if data_proto.voice_info:
+        if media and data_proto.voice_info:
             voice = FragVoice_t.from_tbdata(data_proto.voice_info[0])
             objs.append(voice)
         else:
@@ -172,12 +153,13 @@ class Contents_t(Containers[TypeFragment]):
 
         return Contents_t(objs, texts, emojis, imgs, ats, links, tiebapluses, video, voice)
 
-    @cached_property
+    @cached_slot_property
     def text(self) -> str:
         text = "".join(frag.text for frag in self.texts)
         return text
 
 
+@slotted
 @dcs.dataclass
 class Page_t:
     """
@@ -212,6 +194,7 @@ class Page_t:
         return Page_t(page_size, current_page, total_page, total_count, has_more, has_prev)
 
 
+@slotted(weakref=True)
 @dcs.dataclass
 class UserInfo_t:
     """
@@ -265,13 +248,13 @@ class UserInfo_t:
         nick_name_new = data_proto.name_show
         level = data_proto.level_id
         glevel = data_proto.user_growth.level_id
-        gender = Gender(data_proto.gender)
+        gender = GENDERS[data_proto.gender]
         icons = [name for i in data_proto.iconinfo if (name := i.name)]
         is_bawu = bool(data_proto.is_bawu)
         is_vip = bool(data_proto.new_tshow_icon)
         is_god = bool(data_proto.new_god_data.status)
-        priv_like = PrivLike(priv_like) if (priv_like := data_proto.priv_sets.like) else PrivLike.PUBLIC
-        priv_reply = PrivReply(priv_reply) if (priv_reply := data_proto.priv_sets.reply) else PrivReply.ALL
+        priv_like = PRIV_LIKES[data_proto.priv_sets.like]
+        priv_reply = PRIV_REPLYS[data_proto.priv_sets.reply]
         return UserInfo_t(
             user_id,
             portrait,
@@ -308,7 +291,7 @@ class UserInfo_t:
     def show_name(self) -> str:
         return self.nick_name_new or self.user_name
 
-    @cached_property
+    @cached_slot_property
     def log_name(self) -> str:
         if self.user_name:
             return self.user_name
@@ -318,6 +301,7 @@ class UserInfo_t:
             return str(self.user_id)
 
 
+@slotted
 @dcs.dataclass
 class FragImage_st:
     """
@@ -356,6 +340,23 @@ class FragImage_st:
         return FragImage_st(src, big_src, origin_src, show_width, show_height, hash_)
 
 
+_FRAG_DECODER_ST = FragDecoder(
+    [
+        # 0纯文本 9电话号 18话题 27百科词条
+        ((0, 9, 18, 27), FragText_st.from_tbdata, ("texts",)),
+        # 11:tid=5047676428
+        ((2, 11), FragEmoji_st.from_tbdata, ("emojis",)),
+        ((4,), FragAt_st.from_tbdata, ("ats", "texts")),
+        ((1,), FragLink_st.from_tbdata, ("links", "texts")),
+        # 35|36:tid=7769728331 / 37:tid=7760184147
+        ((35, 36, 37), FragTiebaPlus_st.from_tbdata, ("tiebapluses", "texts")),
+    ],
+    # 5视频由video_info解析 / 34过时的贴吧plus
+    ignored=(5, 34),
+)
+
+
+@slotted
 @dcs.dataclass
 class Contents_st(Containers[TypeFragment]):
     """
@@ -387,55 +388,8 @@ class Contents_st(Containers[TypeFragment]):
 
     @staticmethod
     def from_tbdata(data_proto: TypeMessage) -> Contents_st:
-        content_protos = data_proto.content
-
-        texts = []
-        emojis = []
+        objs, (texts, emojis, _, ats, links, tiebapluses, _, _) = _FRAG_DECODER_ST.decode(data_proto.content)
         imgs = [FragImage_st.from_tbdata(p) for p in data_proto.media]
-        ats = []
-        links = []
-        tiebapluses = []
-
-        def _frags():
-            for proto in content_protos:
-                _type = proto.type
-                # 0纯文本 9电话号 18话题 27百科词条
-                if _type in [0, 9, 18, 27]:
-                    frag = FragText_st.from_tbdata(proto)
-                    texts.append(frag)
-                    yield frag
-                # 11:tid=5047676428
-                elif _type in [2, 11]:
-                    frag = FragEmoji_st.from_tbdata(proto)
-                    emojis.append(frag)
-                    yield frag
-                elif _type == 4:
-                    frag = FragAt_st.from_tbdata(proto)
-                    ats.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_st.from_tbdata(proto)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 5:  # video
-                    continue
-                # 35|36:tid=7769728331 / 37:tid=7760184147
-                elif _type in [35, 36, 37]:
-                    frag = FragTiebaPlus_st.from_tbdata(proto)
-                    tiebapluses.append(frag)
-                    texts.append(frag)
-                    yield frag
-                # outdated tiebaplus
-                elif _type == 34:
-                    continue
-                else:
-                    from ...logging import get_logger as LOG
-
-                    LOG().warning("Unknown fragment type. type=%s proto=%s", _type, proto)
-
-        objs = list(_frags())
 
         del ats[0]
         del objs[0]
@@ -455,12 +409,13 @@ class Contents_st(Containers[TypeFragment]):
 
         return Contents_st(objs, texts, emojis, imgs, ats, links, tiebapluses, video, voice)
 
-    @cached_property
+    @cached_slot_property
     def text(self) -> str:
         text = "".join(frag.text for frag in self.texts)
         return text
 
 
+@slotted
 @dcs.dataclass
 class ShareThread:
     """
@@ -511,7 +466,7 @@ class ShareThread:
     def __hash__(self) -> int:
         return self.pid
 
-    @cached_property
+    @cached_slot_property
     def text(self) -> str:
         if self.title:
             text = f"{self.title}\n{self.contents.text}"
@@ -520,6 +475,7 @@ class ShareThread:
         return text
 
 
+@slotted
 @dcs.dataclass
 class Thread:
     """
@@ -586,8 +542,9 @@ class Thread:
     last_time: int = 0
 
     @staticmethod
-    def from_tbdata(data_proto: TypeMessage) -> None:
-        contents = Contents_t.from_tbdata(data_proto)
+    def from_tbdata(data_proto: TypeMessage, fields: ReqFields = ReqFields.ALL) -> Thread:
+        mask = field_mask(fields)
+        contents = Contents_t.from_tbdata(data_proto, mask.media) if mask.contents else Contents_t()
         title = data_proto.title
         tid = data_proto.id
         pid = data_proto.first_post_id
@@ -599,10 +556,10 @@ class Thread:
         is_share = bool(data_proto.is_share_thread)
         is_hide = bool(data_proto.is_frs_mask)
         is_livepost = bool(data_proto.is_livepost)
-        vote_info = VoteInfo.from_tbdata(data_proto.poll_info)
+        vote_info = VoteInfo.from_tbdata(data_proto.poll_info) if mask.vote else VoteInfo()
         if is_share:
             if data_proto.origin_thread_info.pid:
-                share_origin = ShareThread.from_tbdata(data_proto.origin_thread_info)
+                share_origin = ShareThread.from_tbdata(data_proto.origin_thread_info) if mask.share else ShareThread()
             else:
                 is_share = False
                 share_origin = ShareThread()
@@ -648,7 +605,7 @@ class Thread:
     def __hash__(self) -> int:
         return self.pid
 
-    @cached_property
+    @cached_slot_property
     def text(self) -> str:
         if self.title:
             text = f"{self.title}\n{self.contents.text}"
@@ -661,6 +618,56 @@ class Thread:
         return self.type == 71
 
 
+class LazyThread(Thread):
+    """
+    按需解析的主题帖信息
+    公开属性与Thread相同 contents / user / vote_info / share_origin在首次访问时才从protobuf中转换
+    """
+
+    def __init__(self, data_proto: TypeMessage, forum: Forum_t, users: LazyUsers[UserInfo_t]) -> None:
+        self._proto = data_proto
+        self._users = users
+        self.title = data_proto.title
+        self.fid = forum.fid
+        self.fname = forum.fname
+        self.tid = data_proto.id
+        self.pid = data_proto.first_post_id
+        self.author_id = data_proto.author_id
+        self.type = data_proto.thread_type
+        self.tab_id = data_proto.tab_id
+        self.is_good = bool(data_proto.is_good)
+        self.is_top = bool(data_proto.is_top)
+        self.is_share = bool(data_proto.is_share_thread) and bool(data_proto.origin_thread_info.pid)
+        self.is_hide = bool(data_proto.is_frs_mask)
+        self.is_livepost = bool(data_proto.is_livepost)
+        self.view_num = data_proto.view_num
+        self.reply_num = data_proto.reply_num
+        self.share_num = data_proto.share_num
+        self.agree = data_proto.agree.agree_num
+        self.disagree = data_proto.agree.disagree_num
+        self.create_time = data_proto.create_time
+        self.last_time = data_proto.last_time_int
+
+    @cached_property
+    def contents(self) -> Contents_t:
+        return Contents_t.from_tbdata(self._proto)
+
+    @cached_property
+    def user(self) -> UserInfo_t:
+        return self._users[self.author_id]
+
+    @cached_property
+    def vote_info(self) -> VoteInfo:
+        return VoteInfo.from_tbdata(self._proto.poll_info)
+
+    @cached_property
+    def share_origin(self) -> ShareThread:
+        if self.is_share:
+            return ShareThread.from_tbdata(self._proto.origin_thread_info)
+        return ShareThread()
+
+
+@slotted
 @dcs.dataclass
 class Forum_t:
     """
@@ -709,6 +716,7 @@ class Forum_t:
         return Forum_t(fid, fname, category, subcategory, member_num, post_num, thread_num, has_bawu, has_rule)
 
 
+@slotted
 @dcs.dataclass
 class Threads(TbErrorExt, Containers[Thread]):
     """
@@ -730,13 +738,22 @@ class Threads(TbErrorExt, Containers[Thread]):
     tab_map: dict[str, int] = dcs.field(default_factory=dict)
 
     @staticmethod
-    def from_tbdata(data_proto: TypeMessage) -> Threads:
+    def from_tbdata(data_proto: TypeMessage, lazy: bool = False, fields: ReqFields = ReqFields.ALL) -> Threads:
+        mask = field_mask(fields)
         page = Page_t.from_tbdata(data_proto.page)
         forum = Forum_t.from_tbdata(data_proto)
-        tab_map = {p.tab_name: p.tab_id for p in data_proto.nav_tab_info.tab}
+        tab_map = {p.tab_name: p.tab_id for p in data_proto.nav_tab_info.tab} if mask.tab_map else {}
+
+        if lazy:
+            users = LazyUsers(data_proto.user_list, UserInfo_t)
+            objs = [LazyThread(p, forum, users) for p in data_proto.thread_list]
+            return Threads(objs, page, forum, tab_map)
 
-        objs = [Thread.from_tbdata(p) for p in data_proto.thread_list]
-        users = {p.id: UserInfo_t.from_tbdata(p) for p in data_proto.user_list}
+        objs = [Thread.from_tbdata(p, fields) for p in data_proto.thread_list]
+        if mask.user:
+            users = {p.id: convert_user(UserInfo_t, p) for p in data_proto.user_list}
+        else:
+            users = DefaultUsers(UserInfo_t)
         for thread in objs:
             thread.fname = forum.fname
             thread.fid = forum.fid
@@ -3,7 +3,7 @@ from functools import cached_property
 
 from ...enums import Gender
 from ...exception import TbErrorExt
-from .._classdef import TypeMessage
+from .._classdef import GENDERS, TypeMessage
 
 
 @dcs.dataclass
@@ -46,7 +46,7 @@ class UserInfo_guinfo_app(TbErrorExt):
             portrait = portrait[:-13]
         user_name = data_proto.name
         nick_name_old = data_proto.name_show
-        gender = Gender(data_proto.sex)
+        gender = GENDERS[data_proto.sex]
         is_vip = bool(data_proto.vipInfo.v_status)
         is_god = bool(data_proto.new_god_data.status)
         return UserInfo_guinfo_app(user_id, portrait, user_name, nick_name_old, gender, is_vip, is_god)
@@ -4,7 +4,7 @@ import dataclasses as dcs
 from functools import cached_property
 
 from ...exception import TbErrorExt
-from .._classdef import Containers, TypeMessage, VoteInfo
+from .._classdef import Containers, FragDecoder, TypeMessage, VoteInfo
 from .._classdef.contents import (
     _IMAGEHASH_EXP,
     FragAt,
@@ -306,6 +306,20 @@ class FragImage_ut:
         return FragImage_ut(src, big_src, origin_src, origin_size, width, height, hash_)
 
 
+_FRAG_DECODER_UT = FragDecoder(
+    [
+        # 0纯文本 9电话号 18话题 27百科词条
+        ((0, 9, 18, 27), FragText_ut.from_tbdata, ("texts",)),
+        # 11:tid=5047676428
+        ((2, 11), FragEmoji_ut.from_tbdata, ("emojis",)),
+        ((4,), FragAt_ut.from_tbdata, ("ats", "texts")),
+        ((1,), FragLink_ut.from_tbdata, ("links", "texts")),
+    ],
+    # 3|20图像由media解析 5视频由video_info解析 10音频由voice_info解析
+    ignored=(3, 20, 5, 10),
+)
+
+
 @dcs.dataclass
 class Contents_ut(Containers[TypeFragment]):
     """
@@ -335,50 +349,8 @@ class Contents_ut(Containers[TypeFragment]):
 
     @staticmethod
     def from_tbdata(data_proto: TypeMessage) -> Contents_ut:
-        content_protos = data_proto.first_post_content
-
-        texts = []
-        emojis = []
+        objs, (texts, emojis, _, ats, links, _, _, _) = _FRAG_DECODER_UT.decode(data_proto.first_post_content)
         imgs = [FragImage_ut.from_tbdata(p) for p in data_proto.media if p.type != 5]
-        ats = []
-        links = []
-
-        def _frags():
-            for proto in content_protos:
-                _type = proto.type
-                # 0纯文本 9电话号 18话题 27百科词条
-                if _type in [0, 9, 18, 27]:
-                    frag = FragText_ut.from_tbdata(proto)
-                    texts.append(frag)
-                    yield frag
-                # 11:tid=5047676428
-                elif _type in [2, 11]:
-                    frag = FragEmoji_ut.from_tbdata(proto)
-                    emojis.append(frag)
-                    yield frag
-                # img will be init elsewhere
-                elif _type in [3, 20]:
-                    continue
-                elif _type == 4:
-                    frag = FragAt_ut.from_tbdata(proto)
-                    ats.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_ut.from_tbdata(proto)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 5:  # video
-                    continue
-                elif _type == 10:  # voice
-                    continue
-                else:
-                    from ...logging import get_logger as LOG
-
-                    LOG().warning("Unknown fragment type. type=%s proto=%s", _type, proto)
-
-        objs = list(_frags())
         objs += imgs
 
         if data_proto.video_info.video_width:
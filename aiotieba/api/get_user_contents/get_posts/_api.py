@@ -20,20 +20,26 @@ def pack_proto(account: Account, user_id: int, pn: int, rn: int, version: str) -
     return req_proto.SerializeToString()
 
 
-def parse_body(body: bytes) -> UserPostss:
+def parse_proto(body: bytes) -> UserPostResIdl_pb2.UserPostResIdl:
     res_proto = UserPostResIdl_pb2.UserPostResIdl()
     res_proto.ParseFromString(body)
 
     if code := res_proto.error.errorno:
         raise TiebaServerError(code, res_proto.error.errmsg)
 
+    return res_proto
+
+
+def parse_body(body: bytes) -> UserPostss:
+    res_proto = parse_proto(body)
+
     data_proto = res_proto.data
     upostss = UserPostss.from_tbdata(data_proto)
 
     return upostss
 
 
-async def request_http(http_core: HttpCore, user_id: int, pn: int, rn: int, version: str) -> UserPostss:
+async def request_body_http(http_core: HttpCore, user_id: int, pn: int, rn: int, version: str) -> bytes:
     data = pack_proto(http_core.account, user_id, pn, rn, version)
 
     request = http_core.pack_proto_request(
@@ -41,12 +47,21 @@ async def request_http(http_core: HttpCore, user_id: int, pn: int, rn: int, vers
         data,
     )
 
-    body = await http_core.net_core.send_request(request, read_bufsize=8 * 1024)
-    return parse_body(body)
+    return await http_core.net_core.send_request(request, read_bufsize=8 * 1024)
 
 
-async def request_ws(ws_core: WsCore, user_id: int, pn: int, rn: int, version: str) -> UserPostss:
+async def request_http(http_core: HttpCore, user_id: int, pn: int, rn: int, version: str) -> UserPostss:
+    body = await request_body_http(http_core, user_id, pn, rn, version)
+    return await http_core.net_core.parse(parse_body, body)
+
+
+async def request_body_ws(ws_core: WsCore, user_id: int, pn: int, rn: int, version: str) -> bytes:
     data = pack_proto(ws_core.account, user_id, pn, rn, version)
 
     response = await ws_core.send(data, CMD)
-    return parse_body(await response.read())
+    return await response.read()
+
+
+async def request_ws(ws_core: WsCore, user_id: int, pn: int, rn: int, version: str) -> UserPostss:
+    body = await request_body_ws(ws_core, user_id, pn, rn, version)
+    return await ws_core.net_core.parse(parse_body, body)
@@ -1 +1 @@
-from ._api import pack_proto, parse_body, request_http, request_ws
+from ._api import pack_proto, parse_body, parse_proto, request_body_http, request_body_ws, request_http, request_ws
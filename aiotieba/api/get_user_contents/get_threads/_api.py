@@ -21,20 +21,26 @@ def pack_proto(account: Account, user_id: int, pn: int, public_only: bool) -> by
     return req_proto.SerializeToString()
 
 
-def parse_body(body: bytes) -> UserThreads:
+def parse_proto(body: bytes) -> UserPostResIdl_pb2.UserPostResIdl:
     res_proto = UserPostResIdl_pb2.UserPostResIdl()
     res_proto.ParseFromString(body)
 
     if code := res_proto.error.errorno:
         raise TiebaServerError(code, res_proto.error.errmsg)
 
+    return res_proto
+
+
+def parse_body(body: bytes) -> UserThreads:
+    res_proto = parse_proto(body)
+
     data_proto = res_proto.data
     uthreads = UserThreads.from_tbdata(data_proto)
 
     return uthreads
 
 
-async def request_http(http_core: HttpCore, user_id: int, pn: int, public_only: bool) -> UserThreads:
+async def request_body_http(http_core: HttpCore, user_id: int, pn: int, public_only: bool) -> bytes:
     data = pack_proto(http_core.account, user_id, pn, public_only)
 
     request = http_core.pack_proto_request(
@@ -42,12 +48,21 @@ async def request_http(http_core: HttpCore, user_id: int, pn: int, public_only:
         data,
     )
 
-    body = await http_core.net_core.send_request(request, read_bufsize=64 * 1024)
-    return parse_body(body)
+    return await http_core.net_core.send_request(request, read_bufsize=64 * 1024)
 
 
-async def request_ws(ws_core: WsCore, user_id: int, pn: int, public_only: bool) -> UserThreads:
+async def request_http(http_core: HttpCore, user_id: int, pn: int, public_only: bool) -> UserThreads:
+    body = await request_body_http(http_core, user_id, pn, public_only)
+    return await http_core.net_core.parse(parse_body, body)
+
+
+async def request_body_ws(ws_core: WsCore, user_id: int, pn: int, public_only: bool) -> bytes:
     data = pack_proto(ws_core.account, user_id, pn, public_only)
 
     response = await ws_core.send(data, CMD)
-    return parse_body(await response.read())
+    return await response.read()
+
+
+async def request_ws(ws_core: WsCore, user_id: int, pn: int, public_only: bool) -> UserThreads:
+    body = await request_body_ws(ws_core, user_id, pn, public_only)
+    return await ws_core.net_core.parse(parse_body, body)
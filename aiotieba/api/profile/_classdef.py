@@ -5,7 +5,7 @@ from functools import cached_property
 
 from ...enums import Gender, PrivLike, PrivReply
 from ...exception import TbErrorExt
-from .._classdef import Containers, TypeMessage, VoteInfo
+from .._classdef import GENDERS, PRIV_LIKES, PRIV_REPLYS, Containers, FragDecoder, TypeMessage, VoteInfo
 from .._classdef.contents import (
     _IMAGEHASH_EXP,
     FragAt,
@@ -98,7 +98,7 @@ class UserInfo_pf(TbErrorExt):
         nick_name_new = user_proto.name_show
         tieba_uid = int(tieba_uid) if (tieba_uid := user_proto.tieba_uid) else 0
         glevel = user_proto.user_growth.level_id
-        gender = Gender(user_proto.sex)
+        gender = GENDERS[user_proto.sex]
         age = float(age) if (age := user_proto.tb_age) else 0.0
         post_num = user_proto.post_num
         agree_num = data_proto.user_agree_info.total_agree_num
@@ -115,8 +115,8 @@ class UserInfo_pf(TbErrorExt):
             is_blocked = True
         else:
             is_blocked = False
-        priv_like = PrivLike(priv_like) if (priv_like := user_proto.priv_sets.like) else PrivLike.PUBLIC
-        priv_reply = PrivReply(priv_reply) if (priv_reply := user_proto.priv_sets.reply) else PrivReply.ALL
+        priv_like = PRIV_LIKES[user_proto.priv_sets.like]
+        priv_reply = PRIV_REPLYS[user_proto.priv_sets.reply]
         return UserInfo_pf(
             user_id,
             portrait,
@@ -205,6 +205,20 @@ class FragImage_pf:
         return FragImage_pf(src, origin_src, origin_size, width, height, hash_)
 
 
+_FRAG_DECODER_PF = FragDecoder(
+    [
+        # 0纯文本 9电话号 18话题 27百科词条
+        ((0, 9, 18, 27), FragText_pf.from_tbdata, ("texts",)),
+        # 11:tid=5047676428
+        ((2, 11), FragEmoji_pf.from_tbdata, ("emojis",)),
+        ((4,), FragAt_pf.from_tbdata, ("ats", "texts")),
+        ((1,), FragLink_pf.from_tbdata, ("links", "texts")),
+    ],
+    # 3|20图像由media解析 5视频由video_info解析 10音频由voice_info解析
+    ignored=(3, 20, 5, 10),
+)
+
+
 @dcs.dataclass
 class Contents_pf(Containers[TypeFragment]):
     """
@@ -234,49 +248,8 @@ class Contents_pf(Containers[TypeFragment]):
 
     @staticmethod
     def from_tbdata(data_proto: TypeMessage) -> Contents_pf:
-        content_protos = data_proto.first_post_content
-
-        texts = []
-        emojis = []
+        objs, (texts, emojis, _, ats, links, _, _, _) = _FRAG_DECODER_PF.decode(data_proto.first_post_content)
         imgs = [FragImage_pf.from_tbdata(p) for p in data_proto.media if p.type != 5]
-        ats = []
-        links = []
-
-        def _frags():
-            for proto in content_protos:
-                _type = proto.type
-                # 0纯文本 9电话号 18话题 27百科词条
-                if _type in [0, 9, 18, 27]:
-                    frag = FragText_pf.from_tbdata(proto)
-                    texts.append(frag)
-                    yield frag
-                # 11:tid=5047676428
-                elif _type in [2, 11]:
-                    frag = FragEmoji_pf.from_tbdata(proto)
-                    emojis.append(frag)
-                    yield frag
-                elif _type in [3, 20]:
-                    continue
-                elif _type == 4:
-                    frag = FragAt_pf.from_tbdata(proto)
-                    ats.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 1:
-                    frag = FragLink_pf.from_tbdata(proto)
-                    links.append(frag)
-                    texts.append(frag)
-                    yield frag
-                elif _type == 5:  # video
-                    continue
-                elif _type == 10:  # voice
-                    continue
-                else:
-                    from ...logging import get_logger as LOG
-
-                    LOG().warning("Unknown fragment type. type=%s proto=%s", _type, proto)
-
-        objs = list(_frags())
         objs += imgs
 
         if data_proto.video_info.video_width:
@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from ...exception import BoolResponse
 
 from ...core import BLCPCore, BLCPData
+from ...core.metrics import record_io
 
 
 @dataclass
@@ -170,8 +171,11 @@ async def send_request(blcpcore, request_data):
 
     loginBLCPRequest.LcmBody = json.dumps(request_data, ensure_ascii=False).encode('utf-8')
     response = blcpcore.waiter.new(loginBLCPRequest.correlationId)
-    blcpcore.writer.write(loginBLCPRequest.toBytes())
+    req_data = loginBLCPRequest.toBytes()
+    record_io(blcpcore.net_core.metrics, "blcp", len(req_data))
+    blcpcore.writer.write(req_data)
     reps = await response.read()
+    record_io(blcpcore.net_core.metrics, "blcp", response_bytes=len(reps.LcmBody))
     try:
         err_code = json.loads(reps.LcmBody)['err_code']
     except json.JSONDecodeError as e:
@@ -4,7 +4,8 @@ from ...const import APP_BASE_HOST, MAIN_VERSION
 from ...core import Account, HttpCore, WsCore
 from ...enums import BlacklistType
 from ...exception import BoolResponse, TiebaServerError
-from .protobuf import SetUserBlackReqIdl_pb2, SetUserBlackResIdl_pb2
+from .._protobuf import ErrorRes_pb2
+from .protobuf import SetUserBlackReqIdl_pb2
 
 CMD = 309697
 
@@ -23,7 +24,7 @@ def pack_proto(account: Account, user_id: int, btype: BlacklistType) -> bytes:
 
 
 def parse_body(body: bytes) -> None:
-    res_proto = SetUserBlackResIdl_pb2.SetUserBlackResIdl()
+    res_proto = ErrorRes_pb2.ErrorRes()
     res_proto.ParseFromString(body)
 
     if code := res_proto.error.errorno:
@@ -1,8 +1,9 @@
 from ...core import WsCore
 from ...enums import MsgType
 from ...exception import BoolResponse, TiebaServerError
+from .._protobuf import ErrorRes_pb2
 from ..get_group_msg import WsMessage
-from .protobuf import CommitReceivedPmsgReqIdl_pb2, CommitReceivedPmsgResIdl_pb2
+from .protobuf import CommitReceivedPmsgReqIdl_pb2
 
 CMD = 205006
 
@@ -18,7 +19,7 @@ def pack_proto(user_id: int, group_id: int, msg_id: int) -> bytes:
 
 
 def parse_body(body: bytes) -> None:
-    res_proto = CommitReceivedPmsgResIdl_pb2.CommitReceivedPmsgResIdl()
+    res_proto = ErrorRes_pb2.ErrorRes()
     res_proto.ParseFromString(body)
 
     if code := res_proto.error.errorno:
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import copy
+import functools
+import inspect
 import logging
 import socket
 from typing import TYPE_CHECKING, Literal
@@ -97,10 +101,22 @@ from .api import (
     get_forum_level,
     get_roomlist_by_fid,
 )
-from .api._classdef import UserInfo
-from .config import ProxyConfig, TimeoutConfig
+from .api._classdef import UserInfo, check_error
+from .config import (
+    CacheConfig,
+    ForumCacheConfig,
+    LimitConfig,
+    ParseConfig,
+    ProxyConfig,
+    RateLimitConfig,
+    RetryConfig,
+    TimeoutConfig,
+    UserCacheConfig,
+)
 from .const import MAIN_VERSION
 from .core import Account, HttpCore, NetCore, WsCore, BLCPCore
+from .core.metrics import MetricsRegistry
+from .core.resolver import HostOverrideResolver
 from .enums import (
     BawuPermType,
     BawuSearchType,
@@ -110,37 +126,122 @@ from .enums import (
     GroupType,
     PostSortType,
     RankForumType,
+    ReqFields,
     ReqUInfo,
     SearchType,
     ThreadSortType,
     WsStatus,
 )
-from .exception import BoolResponse, IntResponse, StrResponse
-from .helper.cache import ForumInfoCache
+from .exception import BoolResponse, BytesResponse, IntResponse, StrResponse
+from .helper.cache import ForumInfoCache, ResponseCache, UserIdentityCache
+from .helper.context import get_call_context
+from .helper.flight import SingleFlight
+from .helper.paginate import fan_out_pages, iter_pages
 from .helper.utils import handle_exception, is_portrait, is_user_name
 from .logging import get_logger as LOG
 
 if TYPE_CHECKING:
     import datetime
+    from collections.abc import AsyncIterator, Mapping
+
+    from .core.governor import PoolStats
+    from .core.replay import TrafficRecorder, TrafficReplayer
+    from .core.trace import Tracer
 
 
 def _try_websocket(func):
+    @functools.wraps(func)
     async def awrapper(self: Client, *args, **kwargs):
         if self._try_ws:
             await self.init_websocket()
         return await func(self, *args, **kwargs)
 
-    awrapper.__name__ = func.__name__
-
     return awrapper
 
 
 def _force_websocket(func):
+    @functools.wraps(func)
     async def awrapper(self: Client, *args, **kwargs):
         await self.init_websocket()
         return await func(self, *args, **kwargs)
 
-    awrapper.__name__ = func.__name__
+    return awrapper
+
+
+def _call_key(func, signature: inspect.Signature, self: Client, args: tuple, kwargs: dict) -> tuple:
+    bound = signature.bind(self, *args, **kwargs)
+    bound.apply_defaults()
+    return (func.__name__, *list(bound.arguments.values())[1:])
+
+
+def _cache_response(func):
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def awrapper(self: Client, *args, **kwargs):
+        cache = self._response_cache
+        if cache is None or not (ttl := cache.ttl_of(func.__name__)):
+            return await func(self, *args, **kwargs)
+
+        key = _call_key(func, signature, self, args, kwargs)
+
+        if (entry := cache.get(key)) is not None:
+            ret, is_stale = entry
+            if is_stale and not cache.is_refreshing(key):
+
+                async def refresh() -> None:
+                    try:
+                        cache.set(key, await func(self, *args, **kwargs), ttl)
+                    except Exception as err:
+                        LOG().debug("Failed to refresh cache. err=%s key=%s", err, key)
+
+                cache.add_refresh(key, asyncio.get_running_loop().create_task(refresh()))
+
+            return ret
+
+        ret = await func(self, *args, **kwargs)
+        cache.set(key, ret, ttl)
+
+        return ret
+
+    return awrapper
+
+
+def _single_flight(func):
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def awrapper(self: Client, *args, **kwargs):
+        key = _call_key(func, signature, self, args, kwargs)
+
+        async def lead():
+            # 结果与异常均随发起者的调用上下文一并返回
+            try:
+                return await func(self, *args, **kwargs), None, get_call_context()
+            except Exception as err:
+                return None, err, get_call_context()
+
+        ret, err, leader = await self._flights.do(key, lead)
+
+        # 被合并的调用方未产生网络请求 沿用发起者的统计注册表与传输方式 以便计入调用次数
+        if (context := get_call_context()) is not None and leader is not None and context is not leader:
+            context.metrics = leader.metrics
+            context.transport = leader.transport
+
+        if err is not None:
+            raise err
+        return ret
+
+    return awrapper
+
+
+def _remember_users(func):
+    @functools.wraps(func)
+    async def awrapper(self: Client, *args, **kwargs):
+        ret = await func(self, *args, **kwargs)
+        if self._user_cache is not None:
+            self._user_cache.add_from(ret)
+        return ret
 
     return awrapper
 
@@ -156,18 +257,43 @@ class Client:
         try_ws (bool, optional): 尝试使用websocket接口. Defaults to False.
         proxy (bool | ProxyConfig, optional): True则使用环境变量代理 False则禁用代理 输入ProxyConfig实例以手动配置代理. Defaults to False.
         timeout (TimeoutConfig, optional): 超时配置. Defaults to None.
+        cache (bool | CacheConfig, optional): True则使用默认配置缓存只读接口的响应 False则禁用缓存 输入CacheConfig实例以手动配置缓存. Defaults to False.
+        limit (LimitConfig, optional): 连接池与并发配置. Defaults to None.
+        rate_limit (RateLimitConfig, optional): 按端点限流的配置 遇到服务端限流时自动降速. Defaults to None.
+        retry (bool | RetryConfig, optional): True则使用默认配置重试失败的只读请求 False则不重试 输入RetryConfig实例以手动配置重试与对冲. Defaults to False.
+        parse (ParseConfig, optional): 响应解析配置 可指定用于解析大响应的线程池或进程池. Defaults to None.
+        metrics (bool | MetricsRegistry, optional): True则按接口统计调用次数 耗时 收发字节数与错误码 False则不统计 输入MetricsRegistry实例以与其他客户端共享. Defaults to False.
+        tracer (Tracer, optional): 分阶段的追踪器 在排队 连接 发送 等待响应 读取与解析等阶段结束时调用其回调. Defaults to None.
+        tape (TrafficRecorder | TrafficReplayer, optional): 输入TrafficRecorder实例以将每一对成功的请求与响应追加写入录制文件 输入TrafficReplayer实例以从录制文件中回放响应而不访问网络. Defaults to None.
+        user_cache (bool | UserCacheConfig | UserIdentityCache, optional): True则使用默认配置缓存用户身份的对应关系 False则禁用缓存 输入UserCacheConfig实例以手动配置缓存 输入UserIdentityCache实例以与其他客户端共享. Defaults to False.
+        forum_cache (ForumInfoCache | ForumCacheConfig, optional): 吧名与fid映射的缓存 输入ForumCacheConfig实例以创建独立的缓存 为None则使用进程内共享的默认缓存. Defaults to None.
+        connector (aiohttp.TCPConnector, optional): 与其他客户端共享的连接器 由调用方负责关闭 为None则自行创建. Defaults to None.
+        hosts (Mapping[str, str], optional): 域名到本地地址的映射 详见HostOverrideResolver 仅在自行创建连接器时生效. Defaults to None.
     """
 
     __slots__ = [
         '_account',
         '_timeout',
+        '_limit',
+        '_rate_limit',
+        '_retry',
+        '_parse',
+        '_metrics',
+        '_tracer',
+        '_tape',
         '_proxy',
         '_try_ws',
         '_connector',
+        '_own_connector',
+        '_hosts',
         '_http_core',
         '_ws_core',
         '_user',
-        '_blcp_core'
+        '_blcp_core',
+        '_response_cache',
+        '_user_cache',
+        '_forum_cache',
+        '_flights',
     ]
 
     def __init__(
@@ -179,6 +305,18 @@ class Client:
         try_ws: bool = False,
         proxy: bool | ProxyConfig = False,
         timeout: TimeoutConfig | None = None,
+        cache: bool | CacheConfig = False,
+        limit: LimitConfig | None = None,
+        rate_limit: RateLimitConfig | None = None,
+        retry: bool | RetryConfig = False,
+        parse: ParseConfig | None = None,
+        metrics: bool | MetricsRegistry = False,
+        tracer: Tracer | None = None,
+        tape: TrafficRecorder | TrafficReplayer | None = None,
+        user_cache: bool | UserCacheConfig | UserIdentityCache = False,
+        forum_cache: ForumInfoCache | ForumCacheConfig | None = None,
+        connector: aiohttp.TCPConnector | None = None,
+        hosts: Mapping[str, str] | None = None,
     ) -> None:
         if not isinstance(account, Account):
             account = Account(BDUSS, STOKEN)
@@ -188,6 +326,28 @@ class Client:
             timeout = TimeoutConfig()
         self._timeout = timeout
 
+        if not isinstance(limit, LimitConfig):
+            limit = LimitConfig()
+        self._limit = limit
+
+        if not isinstance(rate_limit, RateLimitConfig):
+            rate_limit = RateLimitConfig()
+        self._rate_limit = rate_limit
+
+        if retry is True:
+            retry = RetryConfig()
+        self._retry = retry or None
+
+        if not isinstance(parse, ParseConfig):
+            parse = ParseConfig()
+        self._parse = parse
+
+        if metrics is True:
+            metrics = MetricsRegistry()
+        self._metrics = metrics if isinstance(metrics, MetricsRegistry) else None
+        self._tracer = tracer
+        self._tape = tape
+
         if proxy is True:
             proxy = ProxyConfig.from_env()
         elif not proxy:
@@ -196,19 +356,53 @@ class Client:
 
         self._try_ws = try_ws
 
+        self._connector = connector
+        self._own_connector = connector is None
+        self._hosts = hosts
+
+        if cache is True:
+            cache = CacheConfig()
+        self._response_cache = ResponseCache(cache) if cache else None
+
+        if user_cache is True:
+            user_cache = UserCacheConfig()
+        if isinstance(user_cache, UserCacheConfig):
+            user_cache = UserIdentityCache(user_cache)
+        self._user_cache = user_cache if isinstance(user_cache, UserIdentityCache) else None
+
+        if isinstance(forum_cache, ForumCacheConfig):
+            forum_cache = ForumInfoCache(forum_cache)
+        elif not isinstance(forum_cache, ForumInfoCache):
+            forum_cache = ForumInfoCache.default()
+        self._forum_cache = forum_cache
+        self._flights = SingleFlight()
+
         self._user = UserInfo()
 
     async def __aenter__(self) -> Client:
-        connector = aiohttp.TCPConnector(
-            ttl_dns_cache=self._timeout.dns_ttl,
-            family=socket.AF_INET,
-            keepalive_timeout=self._timeout.http_keepalive,
-            limit=0,
-            ssl=False,
-        )
-        self._connector = connector
+        if self._own_connector:
+            self._connector = aiohttp.TCPConnector(
+                ttl_dns_cache=self._timeout.dns_ttl,
+                family=socket.AF_INET,
+                keepalive_timeout=self._timeout.http_keepalive,
+                limit=self._limit.conn_limit,
+                limit_per_host=self._limit.conn_limit_per_host,
+                resolver=HostOverrideResolver(self._hosts) if self._hosts else None,
+                ssl=False,
+            )
 
-        net_core = NetCore(connector, self._proxy, self._timeout)
+        net_core = NetCore(
+            self._connector,
+            self._proxy,
+            self._timeout,
+            self._limit,
+            self._rate_limit,
+            self._retry,
+            self._parse,
+            self._metrics,
+            self._tracer,
+            self._tape,
+        )
         self._http_core = HttpCore(self._account, net_core)
         self._ws_core = WsCore(self._account, net_core)
         self._blcp_core = BLCPCore(account=self._account, net_core=net_core, user=self._user)
@@ -216,8 +410,12 @@ class Client:
         return self
 
     async def __aexit__(self, exc_type=None, exc_val=None, exc_tb=None) -> None:
+        if self._response_cache is not None:
+            self._response_cache.cancel_refresh()
+        await self._forum_cache.flush()
         await self._ws_core.close()
-        await self._connector.close()
+        if self._own_connector:
+            await self._connector.close()
 
     def __hash__(self) -> int:
         return hash(self.account)
@@ -234,6 +432,52 @@ class Client:
         self._http_core.set_account(new_account)
         self._ws_core.set_account(new_account)
 
+    @property
+    def pool_stats(self) -> PoolStats:
+        """
+        连接池利用率与请求排队时间等统计信息
+        """
+
+        return self._http_core.net_core.pool_stats
+
+    @property
+    def metrics(self) -> MetricsRegistry | None:
+        """
+        按接口与传输方式汇总的调用统计 未启用统计时为None
+
+        Note:
+            可通过to_dict()或to_prometheus()导出
+        """
+
+        return self._metrics
+
+    @property
+    def response_cache(self) -> ResponseCache | None:
+        """
+        响应缓存 未启用缓存时为None
+
+        Note:
+            缓存的返回值会被所有调用方共享 请勿修改其内容
+        """
+
+        return self._response_cache
+
+    @property
+    def user_cache(self) -> UserIdentityCache | None:
+        """
+        用户身份缓存 未启用缓存时为None
+        """
+
+        return self._user_cache
+
+    @property
+    def forum_cache(self) -> ForumInfoCache:
+        """
+        吧名与fid映射的缓存
+        """
+
+        return self._forum_cache
+
     @handle_exception(BoolResponse)
     async def init_websocket(self) -> BoolResponse:
         """
@@ -296,6 +540,7 @@ class Client:
 
         return self._user
 
+    @_single_flight
     async def __login(self) -> None:
         user, tbs = await login.request(self._http_core)
 
@@ -312,11 +557,13 @@ class Client:
             return
         await self.__sync()
 
+    @_single_flight
     async def __sync(self) -> None:
         client_id, sample_id = await sync.request(self._http_core)
         self.account.client_id = client_id
         self.account.sample_id = sample_id
 
+    @_single_flight
     async def __init_z_id(self) -> None:
         if self.account.z_id:
             return
@@ -324,7 +571,9 @@ class Client:
         z_id = await init_z_id.request(self._http_core)
         self.account.z_id = z_id
 
-    @handle_exception(get_forum.Forum)
+    @handle_exception(lambda: get_forum.Forum())
+    @_cache_response
+    @_single_flight
     async def get_forum(self, fname_or_fid: str | int) -> get_forum.Forum:
         """
         通过forum_id获取贴吧信息
@@ -341,7 +590,9 @@ class Client:
 
         return await get_forum.request(self._http_core, fname)
 
-    @handle_exception(get_forum_detail.Forum_detail)
+    @handle_exception(lambda: get_forum_detail.Forum_detail())
+    @_cache_response
+    @_single_flight
     @_try_websocket
     async def get_forum_detail(self, fname_or_fid: str | int) -> get_forum_detail.Forum_detail:
         """
@@ -361,12 +612,13 @@ class Client:
 
         return await get_forum_detail.request_http(self._http_core, fid)
 
+    @_single_flight
     async def __get_fid(self, fname: str) -> int:
-        if fid := ForumInfoCache.get_fid(fname):
+        if fid := await self._forum_cache.fetch_fid(fname):
             return fid
 
         fid = await get_fid.request(self._http_core, fname)
-        ForumInfoCache.add_forum(fname, fid)
+        self._forum_cache.add_forum(fname, fid)
 
         return fid
 
@@ -385,15 +637,16 @@ class Client:
         fid = await self.__get_fid(fname)
         return IntResponse(fid)
 
+    @_single_flight
     async def __get_fname(self, fid: int) -> str:
-        if fname := ForumInfoCache.get_fname(fid):
+        if fname := await self._forum_cache.fetch_fname(fid):
             return fname
 
         fdetail = await self.get_forum_detail(fid)
         fname = fdetail.fname
 
         if fname:
-            ForumInfoCache.add_forum(fname, fid)
+            self._forum_cache.add_forum(fname, fid)
 
         return fname
 
@@ -412,7 +665,10 @@ class Client:
         fname = await self.__get_fname(fid)
         return StrResponse(fname)
 
-    @handle_exception(get_threads.Threads)
+    @handle_exception(lambda: get_threads.Threads())
+    @_cache_response
+    @_remember_users
+    @_single_flight
     @_try_websocket
     async def get_threads(
         self,
@@ -423,6 +679,8 @@ class Client:
         rn: int = 30,
         sort: ThreadSortType = ThreadSortType.REPLY,
         is_good: bool = False,
+        lazy: bool = False,
+        fields: ReqFields = ReqFields.ALL,
     ) -> get_threads.Threads:
         """
         获取首页帖子
@@ -433,6 +691,8 @@ class Client:
             rn (int, optional): 请求的条目数. Defaults to 30. Max to 100.
             sort (ThreadSortType, optional): HOT热门排序 REPLY按回复时间 CREATE按发布时间 FOLLOW关注的人. Defaults to ThreadSortType.REPLY.
             is_good (bool, optional): True则获取精品区帖子 False则获取普通区帖子. Defaults to False.
+            lazy (bool, optional): True则按需解析 内容碎片与用户信息等字段在首次访问时才转换. Defaults to False.
+            fields (ReqFields, optional): 需要解析的子对象 未指定的子对象保留默认值 lazy为True时忽略. Defaults to ReqFields.ALL.
 
         Returns:
             Threads: 帖子列表
@@ -441,11 +701,87 @@ class Client:
         fname = fname_or_fid if isinstance(fname_or_fid, str) else await self.__get_fname(fname_or_fid)
 
         if self._ws_core.status == WsStatus.OPEN:
-            return await get_threads.request_ws(self._ws_core, fname, pn, rn, sort, is_good)
+            return await get_threads.request_ws(self._ws_core, fname, pn, rn, sort, is_good, lazy, fields)
 
-        return await get_threads.request_http(self._http_core, fname, pn, rn, sort, is_good)
+        return await get_threads.request_http(self._http_core, fname, pn, rn, sort, is_good, lazy, fields)
 
-    @handle_exception(get_posts.Posts)
+    @handle_exception(BytesResponse)
+    @_single_flight
+    @_try_websocket
+    async def get_threads_raw(
+        self,
+        fname_or_fid: str | int,
+        /,
+        pn: int = 1,
+        *,
+        rn: int = 30,
+        sort: ThreadSortType = ThreadSortType.REPLY,
+        is_good: bool = False,
+    ) -> BytesResponse:
+        """
+        获取首页帖子的原始响应体
+
+        Args:
+            fname_or_fid (str | int): 贴吧名或fid 优先贴吧名
+            pn (int, optional): 页码. Defaults to 1.
+            rn (int, optional): 请求的条目数. Defaults to 30. Max to 100.
+            sort (ThreadSortType, optional): HOT热门排序 REPLY按回复时间 CREATE按发布时间 FOLLOW关注的人. Defaults to ThreadSortType.REPLY.
+            is_good (bool, optional): True则获取精品区帖子 False则获取普通区帖子. Defaults to False.
+
+        Returns:
+            BytesResponse: 已检查错误码的FrsPageResIdl响应体
+
+        Note:
+            可通过get_threads.parse_proto得到protobuf 或通过get_threads.parse_body得到Threads
+        """
+
+        fname = fname_or_fid if isinstance(fname_or_fid, str) else await self.__get_fname(fname_or_fid)
+
+        if self._ws_core.status == WsStatus.OPEN:
+            body = await get_threads.request_body_ws(self._ws_core, fname, pn, rn, sort, is_good)
+        else:
+            body = await get_threads.request_body_http(self._http_core, fname, pn, rn, sort, is_good)
+
+        check_error(body)
+        return BytesResponse(body)
+
+    def iter_threads(
+        self,
+        fname_or_fid: str | int,
+        /,
+        pn: int = 1,
+        *,
+        rn: int = 30,
+        sort: ThreadSortType = ThreadSortType.REPLY,
+        is_good: bool = False,
+        fields: ReqFields = ReqFields.ALL,
+        prefetch: int = 1,
+    ) -> AsyncIterator[get_threads.Threads]:
+        """
+        逐页迭代首页帖子 并在处理当前页时预取后继页
+
+        Args:
+            fname_or_fid (str | int): 贴吧名或fid 优先贴吧名
+            pn (int, optional): 起始页码. Defaults to 1.
+            rn (int, optional): 请求的条目数. Defaults to 30. Max to 100.
+            sort (ThreadSortType, optional): HOT热门排序 REPLY按回复时间 CREATE按发布时间 FOLLOW关注的人. Defaults to ThreadSortType.REPLY.
+            is_good (bool, optional): True则获取精品区帖子 False则获取普通区帖子. Defaults to False.
+            fields (ReqFields, optional): 需要解析的子对象 未指定的子对象保留默认值. Defaults to ReqFields.ALL.
+            prefetch (int, optional): 预取的页数 为0则不预取. Defaults to 1.
+
+        Returns:
+            AsyncIterator[Threads]: 按页码顺序返回的帖子列表 请求失败时返回带有err的帖子列表并终止迭代
+        """
+
+        async def fetch(pn: int) -> get_threads.Threads:
+            return await self.get_threads(fname_or_fid, pn, rn=rn, sort=sort, is_good=is_good, fields=fields)
+
+        return iter_pages(fetch, pn, prefetch, lambda threads: threads.has_more)
+
+    @handle_exception(lambda: get_posts.Posts())
+    @_cache_response
+    @_remember_users
+    @_single_flight
     @_try_websocket
     async def get_posts(
         self,
@@ -459,6 +795,8 @@ class Client:
         with_comments: bool = False,
         comment_sort_by_agree: bool = True,
         comment_rn: int = 4,
+        lazy: bool = False,
+        fields: ReqFields = ReqFields.ALL,
     ) -> get_posts.Posts:
         """
         获取主题帖内回复
@@ -472,6 +810,8 @@ class Client:
             with_comments (bool, optional): True则同时请求高赞楼中楼 False则返回的Post.comments字段为空. Defaults to False.
             comment_sort_by_agree (bool, optional): True则楼中楼按点赞数顺序 False则楼中楼按时间顺序. Defaults to True.
             comment_rn (int, optional): 请求的楼中楼数量. Defaults to 4. Max to 50.
+            lazy (bool, optional): True则按需解析 内容碎片与用户信息等字段在首次访问时才转换. Defaults to False.
+            fields (ReqFields, optional): 需要解析的子对象 未指定的子对象保留默认值 lazy为True时忽略. Defaults to ReqFields.ALL.
 
         Returns:
             Posts: 回复列表
@@ -479,17 +819,232 @@ class Client:
 
         if self._ws_core.status == WsStatus.OPEN:
             return await get_posts.request_ws(
-                self._ws_core, tid, pn, rn, sort, only_thread_author, with_comments, comment_sort_by_agree, comment_rn
+                self._ws_core,
+                tid,
+                pn,
+                rn,
+                sort,
+                only_thread_author,
+                with_comments,
+                comment_sort_by_agree,
+                comment_rn,
+                lazy,
+                fields,
             )
 
         return await get_posts.request_http(
-            self._http_core, tid, pn, rn, sort, only_thread_author, with_comments, comment_sort_by_agree, comment_rn
+            self._http_core,
+            tid,
+            pn,
+            rn,
+            sort,
+            only_thread_author,
+            with_comments,
+            comment_sort_by_agree,
+            comment_rn,
+            lazy,
+            fields,
         )
 
-    @handle_exception(get_comments.Comments)
+    @handle_exception(BytesResponse)
+    @_single_flight
+    @_try_websocket
+    async def get_posts_raw(
+        self,
+        tid: int,
+        /,
+        pn: int = 1,
+        *,
+        rn: int = 30,
+        sort: PostSortType = PostSortType.ASC,
+        only_thread_author: bool = False,
+        with_comments: bool = False,
+        comment_sort_by_agree: bool = True,
+        comment_rn: int = 4,
+    ) -> BytesResponse:
+        """
+        获取主题帖内回复的原始响应体
+
+        Args:
+            tid (int): 所在主题帖tid
+            pn (int, optional): 页码. Defaults to 1.
+            rn (int, optional): 请求的条目数. Defaults to 30.
+            sort (PostSortType, optional): ASC时间顺序 DESC时间倒序 HOT热门序. Defaults to PostSortType.ASC.
+            only_thread_author (bool, optional): True则只看楼主 False则请求全部. Defaults to False.
+            with_comments (bool, optional): True则同时请求高赞楼中楼 False则不请求楼中楼. Defaults to False.
+            comment_sort_by_agree (bool, optional): True则楼中楼按点赞数顺序 False则楼中楼按时间顺序. Defaults to True.
+            comment_rn (int, optional): 请求的楼中楼数量. Defaults to 4. Max to 50.
+
+        Returns:
+            BytesResponse: 已检查错误码的PbPageResIdl响应体
+
+        Note:
+            可通过get_posts.parse_proto得到protobuf 或通过get_posts.parse_body得到Posts
+        """
+
+        if self._ws_core.status == WsStatus.OPEN:
+            body = await get_posts.request_body_ws(
+                self._ws_core,
+                tid,
+                pn,
+                rn,
+                sort,
+                only_thread_author,
+                with_comments,
+                comment_sort_by_agree,
+                comment_rn,
+            )
+        else:
+            body = await get_posts.request_body_http(
+                self._http_core,
+                tid,
+                pn,
+                rn,
+                sort,
+                only_thread_author,
+                with_comments,
+                comment_sort_by_agree,
+                comment_rn,
+            )
+
+        check_error(body)
+        return BytesResponse(body)
+
+    def iter_posts(
+        self,
+        tid: int,
+        /,
+        pn: int = 1,
+        *,
+        rn: int = 30,
+        sort: PostSortType = PostSortType.ASC,
+        only_thread_author: bool = False,
+        with_comments: bool = False,
+        comment_sort_by_agree: bool = True,
+        comment_rn: int = 4,
+        fields: ReqFields = ReqFields.ALL,
+        prefetch: int = 1,
+    ) -> AsyncIterator[get_posts.Posts]:
+        """
+        逐页迭代主题帖内回复 并在处理当前页时预取后继页
+
+        Args:
+            tid (int): 所在主题帖tid
+            pn (int, optional): 起始页码. Defaults to 1.
+            rn (int, optional): 请求的条目数. Defaults to 30.
+            sort (PostSortType, optional): ASC时间顺序 DESC时间倒序 HOT热门序. Defaults to PostSortType.ASC.
+            only_thread_author (bool, optional): True则只看楼主 False则请求全部. Defaults to False.
+            with_comments (bool, optional): True则同时请求高赞楼中楼 False则返回的Post.comments字段为空. Defaults to False.
+            comment_sort_by_agree (bool, optional): True则楼中楼按点赞数顺序 False则楼中楼按时间顺序. Defaults to True.
+            comment_rn (int, optional): 请求的楼中楼数量. Defaults to 4. Max to 50.
+            fields (ReqFields, optional): 需要解析的子对象 未指定的子对象保留默认值. Defaults to ReqFields.ALL.
+            prefetch (int, optional): 预取的页数 为0则不预取. Defaults to 1.
+
+        Returns:
+            AsyncIterator[Posts]: 按页码顺序返回的回复列表 请求失败时返回带有err的回复列表并终止迭代
+        """
+
+        async def fetch(pn: int) -> get_posts.Posts:
+            return await self.get_posts(
+                tid,
+                pn,
+                rn=rn,
+                sort=sort,
+                only_thread_author=only_thread_author,
+                with_comments=with_comments,
+                comment_sort_by_agree=comment_sort_by_agree,
+                comment_rn=comment_rn,
+                fields=fields,
+            )
+
+        return iter_pages(fetch, pn, prefetch, lambda posts: posts.has_more)
+
+    async def iter_all_posts(
+        self,
+        tid: int,
+        /,
+        *,
+        rn: int = 30,
+        only_thread_author: bool = False,
+        with_comments: bool = False,
+        comment_sort_by_agree: bool = True,
+        comment_rn: int = 4,
+        fields: ReqFields = ReqFields.ALL,
+        concurrency: int = 8,
+    ) -> AsyncIterator[get_posts.Posts]:
+        """
+        并发获取主题帖内的全部回复
+
+        先请求第1页以获得总页数 再以有限的并发度请求其余各页 按楼层顺序逐页返回
+
+        Args:
+            tid (int): 所在主题帖tid
+            rn (int, optional): 每页请求的条目数. Defaults to 30.
+            only_thread_author (bool, optional): True则只看楼主 False则请求全部. Defaults to False.
+            with_comments (bool, optional): True则同时请求高赞楼中楼 False则返回的Post.comments字段为空. Defaults to False.
+            comment_sort_by_agree (bool, optional): True则楼中楼按点赞数顺序 False则楼中楼按时间顺序. Defaults to True.
+            comment_rn (int, optional): 请求的楼中楼数量. Defaults to 4. Max to 50.
+            fields (ReqFields, optional): 需要解析的子对象 未指定的子对象保留默认值. Defaults to ReqFields.ALL.
+            concurrency (int, optional): 同时进行中的请求数上限. Defaults to 8.
+
+        Yields:
+            Posts: 按页码顺序返回的回复列表 请求失败的页带有err
+
+        Note:
+            抓取期间楼层可能因删帖或新回复而在页间移动 已返回过的pid会从后续页中剔除\n
+            若抓取结束时最后一页仍有后继页 则继续逐页请求直到没有后继页
+        """
+
+        async def fetch(pn: int) -> get_posts.Posts:
+            return await self.get_posts(
+                tid,
+                pn,
+                rn=rn,
+                sort=PostSortType.ASC,
+                only_thread_author=only_thread_author,
+                with_comments=with_comments,
+                comment_sort_by_agree=comment_sort_by_agree,
+                comment_rn=comment_rn,
+                fields=fields,
+            )
+
+        seen_pids = set()
+
+        def dedup(posts: get_posts.Posts) -> get_posts.Posts:
+            # 返回的Posts可能被响应缓存或合并的请求共享 因此不能原地修改
+            deduped = copy.copy(posts)
+            deduped.objs = [post for post in posts.objs if post.pid not in seen_pids]
+            seen_pids.update(post.pid for post in deduped.objs)
+            return deduped
+
+        posts = dedup(await fetch(1))
+        yield posts
+        if posts.err is not None or not posts.has_more:
+            return
+
+        last_pn = max(posts.page.total_page, 1)
+        async for posts in fan_out_pages(fetch, range(2, last_pn + 1), concurrency):
+            yield dedup(posts)
+
+        if posts.err is None and posts.has_more:
+            async for posts in iter_pages(fetch, last_pn + 1, concurrency, lambda posts: posts.has_more):
+                yield dedup(posts)
+
+    @handle_exception(lambda: get_comments.Comments())
+    @_cache_response
+    @_remember_users
+    @_single_flight
     @_try_websocket
     async def get_comments(
-        self, tid: int, pid: int, /, pn: int = 1, *, is_comment: bool = False
+        self,
+        tid: int,
+        pid: int,
+        /,
+        pn: int = 1,
+        *,
+        is_comment: bool = False,
+        lazy: bool = False,
+        fields: ReqFields = ReqFields.ALL,
     ) -> get_comments.Comments:
         """
         获取楼中楼回复
@@ -499,17 +1054,86 @@ class Client:
             pid (int): 所在楼层的pid或楼中楼的pid
             pn (int, optional): 页码. Defaults to 1.
             is_comment (bool, optional): pid是否指向楼中楼 若指向楼中楼则获取其附近的楼中楼列表. Defaults to False.
+            lazy (bool, optional): True则按需解析 内容碎片与用户信息等字段在首次访问时才转换. Defaults to False.
+            fields (ReqFields, optional): 需要解析的子对象 未指定的子对象保留默认值 lazy为True时忽略. Defaults to ReqFields.ALL.
 
         Returns:
             Comments: 楼中楼列表
         """
 
         if self._ws_core.status == WsStatus.OPEN:
-            return await get_comments.request_ws(self._ws_core, tid, pid, pn, is_comment)
+            return await get_comments.request_ws(self._ws_core, tid, pid, pn, is_comment, lazy, fields)
 
-        return await get_comments.request_http(self._http_core, tid, pid, pn, is_comment)
+        return await get_comments.request_http(self._http_core, tid, pid, pn, is_comment, lazy, fields)
 
-    @handle_exception(search_exact.ExactSearches)
+    @handle_exception(BytesResponse)
+    @_single_flight
+    @_try_websocket
+    async def get_comments_raw(
+        self,
+        tid: int,
+        pid: int,
+        /,
+        pn: int = 1,
+        *,
+        is_comment: bool = False,
+    ) -> BytesResponse:
+        """
+        获取楼中楼回复的原始响应体
+
+        Args:
+            tid (int): 所在主题帖tid
+            pid (int): 所在楼层的pid或楼中楼的pid
+            pn (int, optional): 页码. Defaults to 1.
+            is_comment (bool, optional): pid是否指向楼中楼 若指向楼中楼则获取其附近的楼中楼列表. Defaults to False.
+
+        Returns:
+            BytesResponse: 已检查错误码的PbFloorResIdl响应体
+
+        Note:
+            可通过get_comments.parse_proto得到protobuf 或通过get_comments.parse_body得到Comments
+        """
+
+        if self._ws_core.status == WsStatus.OPEN:
+            body = await get_comments.request_body_ws(self._ws_core, tid, pid, pn, is_comment)
+        else:
+            body = await get_comments.request_body_http(self._http_core, tid, pid, pn, is_comment)
+
+        check_error(body)
+        return BytesResponse(body)
+
+    def iter_comments(
+        self,
+        tid: int,
+        pid: int,
+        /,
+        pn: int = 1,
+        *,
+        is_comment: bool = False,
+        fields: ReqFields = ReqFields.ALL,
+        prefetch: int = 1,
+    ) -> AsyncIterator[get_comments.Comments]:
+        """
+        逐页迭代楼中楼回复 并在处理当前页时预取后继页
+
+        Args:
+            tid (int): 所在主题帖tid
+            pid (int): 所在楼层的pid或楼中楼的pid
+            pn (int, optional): 起始页码. Defaults to 1.
+            is_comment (bool, optional): pid是否指向楼中楼 若指向楼中楼则获取其附近的楼中楼列表. Defaults to False.
+            fields (ReqFields, optional): 需要解析的子对象 未指定的子对象保留默认值. Defaults to ReqFields.ALL.
+            prefetch (int, optional): 预取的页数 为0则不预取. Defaults to 1.
+
+        Returns:
+            AsyncIterator[Comments]: 按页码顺序返回的楼中楼列表 请求失败时返回带有err的楼中楼列表并终止迭代
+        """
+
+        async def fetch(pn: int) -> get_comments.Comments:
+            return await self.get_comments(tid, pid, pn, is_comment=is_comment, fields=fields)
+
+        return iter_pages(fetch, pn, prefetch, lambda comments: comments.has_more)
+
+    @handle_exception(lambda: search_exact.ExactSearches())
     async def search_exact(
         self,
         fname_or_fid: str | int,
@@ -540,7 +1164,43 @@ class Client:
 
         return await search_exact.request(self._http_core, fname, query, pn, rn, search_type, only_thread)
 
-    @handle_exception(profile.UserInfo_pf)
+    def iter_search_exact(
+        self,
+        fname_or_fid: str | int,
+        query: str,
+        /,
+        pn: int = 1,
+        *,
+        rn: int = 30,
+        search_type: SearchType = SearchType.ALL,
+        only_thread: bool = False,
+        prefetch: int = 1,
+    ) -> AsyncIterator[search_exact.ExactSearches]:
+        """
+        逐页迭代贴吧搜索结果 并在处理当前页时预取后继页
+
+        Args:
+            fname_or_fid (str | int): 查询的贴吧名或fid 优先贴吧名
+            query (str): 查询文本
+            pn (int, optional): 起始页码. Defaults to 1.
+            rn (int, optional): 请求的条目数. Defaults to 30.
+            search_type (SearchType, optional): 查询模式 默认查询全部. Defaults to SearchType.ALL.
+            only_thread (bool, optional): 是否仅查询主题帖. Defaults to False.
+            prefetch (int, optional): 预取的页数 为0则不预取. Defaults to 1.
+
+        Returns:
+            AsyncIterator[ExactSearches]: 按页码顺序返回的搜索结果列表 请求失败时返回带有err的搜索结果列表并终止迭代
+        """
+
+        async def fetch(pn: int) -> search_exact.ExactSearches:
+            return await self.search_exact(
+                fname_or_fid, query, pn, rn=rn, search_type=search_type, only_thread=only_thread
+            )
+
+        return iter_pages(fetch, pn, prefetch, lambda searches: searches.has_more)
+
+    @handle_exception(lambda: profile.UserInfo_pf())
+    @_remember_users
     @_try_websocket
     async def _get_uinfo_profile(self, uid_or_portrait: str | int) -> profile.UserInfo_pf:
         """
@@ -558,7 +1218,8 @@ class Client:
 
         return await profile.get_uinfo_profile.request_http(self._http_core, uid_or_portrait)
 
-    @handle_exception(get_uinfo_getuserinfo_app.UserInfo_guinfo_app)
+    @handle_exception(lambda: get_uinfo_getuserinfo_app.UserInfo_guinfo_app())
+    @_remember_users
     @_try_websocket
     async def _get_uinfo_getuserinfo(self, user_id: int) -> get_uinfo_getuserinfo_app.UserInfo_guinfo_app:
         """
@@ -582,7 +1243,8 @@ class Client:
 
         return user
 
-    @handle_exception(get_uinfo_getUserInfo_web.UserInfo_guinfo_web)
+    @handle_exception(lambda: get_uinfo_getUserInfo_web.UserInfo_guinfo_web())
+    @_remember_users
     async def _get_uinfo_getUserInfo(self, user_id: int) -> get_uinfo_getUserInfo_web.UserInfo_guinfo_web:
         """
         接口 http://tieba.baidu.com/im/pcmsg/query/getUserInfo
@@ -602,7 +1264,8 @@ class Client:
 
         return user
 
-    @handle_exception(get_uinfo_user_json.UserInfo_json)
+    @handle_exception(lambda: get_uinfo_user_json.UserInfo_json())
+    @_remember_users
     async def _get_uinfo_user_json(self, user_name: str) -> get_uinfo_user_json.UserInfo_json:
         """
         接口 http://tieba.baidu.com/i/sys/user_json
@@ -619,7 +1282,8 @@ class Client:
 
         return user
 
-    @handle_exception(get_uinfo_panel.UserInfo_panel)
+    @handle_exception(lambda: get_uinfo_panel.UserInfo_panel())
+    @_remember_users
     async def _get_uinfo_panel(self, name_or_portrait: str) -> get_uinfo_panel.UserInfo_panel:
         """
         接口 https://tieba.baidu.com/home/get/panel
@@ -638,6 +1302,7 @@ class Client:
 
         return await get_uinfo_panel.request(self._http_core, name_or_portrait)
 
+    @_single_flight
     async def get_user_info(self, id_: str | int, /, require: ReqUInfo = ReqUInfo.ALL) -> UserInfo:
         """
         获取用户信息
@@ -654,6 +1319,10 @@ class Client:
             LOG().warning("Null input")
             return UserInfo()
 
+        if self._user_cache is not None and (require | ReqUInfo.BASIC) == ReqUInfo.BASIC:
+            if (entry := self._user_cache.get(id_)) is not None:
+                return get_uinfo_user_json.UserInfo_json(*entry)
+
         if isinstance(id_, int):
             if (require | ReqUInfo.BASIC) == ReqUInfo.BASIC:
                 # 仅有BASIC需求
@@ -677,7 +1346,8 @@ class Client:
                 user = await self._get_uinfo_user_json(id_)
                 return await self._get_uinfo_profile(user.portrait)
 
-    @handle_exception(tieba_uid2user_info.UserInfo_TUid)
+    @handle_exception(lambda: tieba_uid2user_info.UserInfo_TUid())
+    @_remember_users
     @_try_websocket
     async def tieba_uid2user_info(self, tieba_uid: int) -> tieba_uid2user_info.UserInfo_TUid:
         """
@@ -698,7 +1368,7 @@ class Client:
 
         return await tieba_uid2user_info.request_http(self._http_core, tieba_uid)
 
-    @handle_exception(profile.Homepage)
+    @handle_exception(lambda: profile.Homepage())
     @_try_websocket
     async def get_homepage(self, id_: str | int, /, pn: int = 1) -> profile.Homepage:
         """
@@ -723,7 +1393,7 @@ class Client:
 
         return await profile.get_homepage.request_http(self._http_core, user_id, pn)
 
-    @handle_exception(get_follows.Follows)
+    @handle_exception(lambda: get_follows.Follows())
     async def get_follows(self, id_: str | int | None = None, /, pn: int = 1) -> get_follows.Follows:
         """
         获取关注列表
@@ -748,7 +1418,7 @@ class Client:
 
         return await get_follows.request(self._http_core, user_id, pn)
 
-    @handle_exception(get_fans.Fans)
+    @handle_exception(lambda: get_fans.Fans())
     async def get_fans(self, id_: str | int | None = None, /, pn: int = 1) -> get_fans.Fans:
         """
         获取粉丝列表
@@ -773,7 +1443,7 @@ class Client:
 
         return await get_fans.request(self._http_core, user_id, pn)
 
-    @handle_exception(get_blacklist.BlacklistUsers)
+    @handle_exception(lambda: get_blacklist.BlacklistUsers())
     async def get_blacklist(self) -> get_blacklist.BlacklistUsers:
         """
         获取新版用户黑名单列表
@@ -784,7 +1454,7 @@ class Client:
 
         return await get_blacklist.request(self._http_core)
 
-    @handle_exception(get_blacklist_old.BlacklistOldUsers)
+    @handle_exception(lambda: get_blacklist_old.BlacklistOldUsers())
     @_try_websocket
     async def get_blacklist_old(self, pn: int = 1, /, *, rn: int = 10) -> get_blacklist_old.BlacklistOldUsers:
         """
@@ -803,7 +1473,7 @@ class Client:
 
         return await get_blacklist_old.request_http(self._http_core, pn, rn)
 
-    @handle_exception(get_follow_forums.FollowForums)
+    @handle_exception(lambda: get_follow_forums.FollowForums())
     async def get_follow_forums(
         self, id_: str | int, /, pn: int = 1, *, rn: int = 50
     ) -> get_follow_forums.FollowForums:
@@ -827,7 +1497,7 @@ class Client:
 
         return await get_follow_forums.request(self._http_core, user_id, pn, rn)
 
-    @handle_exception(get_self_follow_forums.SelfFollowForums)
+    @handle_exception(lambda: get_self_follow_forums.SelfFollowForums())
     async def get_self_follow_forums(self, pn: int = 1) -> get_self_follow_forums.SelfFollowForums:
         """
         获取本账号关注贴吧列表
@@ -844,7 +1514,7 @@ class Client:
 
         return await get_self_follow_forums.request(self._http_core, pn)
 
-    @handle_exception(get_dislike_forums.DislikeForums)
+    @handle_exception(lambda: get_dislike_forums.DislikeForums())
     @_try_websocket
     async def get_dislike_forums(self, pn: int = 1, /, *, rn: int = 20) -> get_dislike_forums.DislikeForums:
         """
@@ -884,7 +1554,7 @@ class Client:
 
         return await get_user_contents.get_posts.request_http(self._http_core, user_id, pn, rn, MAIN_VERSION)
 
-    @handle_exception(get_user_contents.UserPostss)
+    @handle_exception(lambda: get_user_contents.UserPostss())
     async def get_user_posts(
         self, id_: str | int | None = None, pn: int = 1, *, rn: int = 20
     ) -> get_user_contents.UserPostss:
@@ -906,7 +1576,50 @@ class Client:
         else:
             return await self.__get_user_posts(id_, pn, rn)
 
-    @handle_exception(get_user_contents.UserThreads)
+    @handle_exception(BytesResponse)
+    @_try_websocket
+    async def get_user_posts_raw(self, id_: str | int | None = None, pn: int = 1, *, rn: int = 20) -> BytesResponse:
+        """
+        获取用户发布的回复列表的原始响应体
+
+        Args:
+            id_ (str | int | None): 用户id user_id / user_name / portrait 优先user_id
+                默认为None即获取本账号信息. Defaults to None.
+            pn (int, optional): 页码. Defaults to 1.
+            rn (int, optional): 请求的条目数. Defaults to 20. Max to 50.
+
+        Returns:
+            BytesResponse: 已检查错误码的UserPostResIdl响应体
+
+        Note:
+            可通过get_user_contents.get_posts.parse_proto得到protobuf 或通过get_user_contents.get_posts.parse_body得到UserPostss
+        """
+
+        if id_ is None:
+            user = await self.get_self_info(ReqUInfo.USER_ID)
+            user_id = user.user_id
+            if self._ws_core.status == WsStatus.OPEN:
+                body = await get_user_contents.get_posts.request_body_ws(self._ws_core, user_id, pn, rn, MAIN_VERSION)
+            else:
+                body = await get_user_contents.get_posts.request_body_http(
+                    self._http_core, user_id, pn, rn, MAIN_VERSION
+                )
+
+        else:
+            if not isinstance(id_, int):
+                user = await self.get_user_info(id_, ReqUInfo.USER_ID)
+                user_id = user.user_id
+            else:
+                user_id = id_
+
+            UPOST_VERSION = "8.9.8.5"
+
+            body = await get_user_contents.get_posts.request_body_http(self._http_core, user_id, pn, rn, UPOST_VERSION)
+
+        check_error(body)
+        return BytesResponse(body)
+
+    @handle_exception(lambda: get_user_contents.UserThreads())
     @_try_websocket
     async def get_user_threads(
         self, id_: str | int | None = None, pn: int = 1, *, public_only: bool = False
@@ -938,7 +1651,67 @@ class Client:
 
         return await get_user_contents.get_threads.request_http(self._http_core, user_id, pn, public_only)
 
-    @handle_exception(get_replys.Replys)
+    @handle_exception(BytesResponse)
+    @_try_websocket
+    async def get_user_threads_raw(
+        self, id_: str | int | None = None, pn: int = 1, *, public_only: bool = False
+    ) -> BytesResponse:
+        """
+        获取用户发布的主题帖列表的原始响应体
+
+        Args:
+            id_ (str | int | None): 用户id user_id / user_name / portrait 优先user_id
+                默认为None即获取本账号信息. Defaults to None.
+            pn (int, optional): 页码. Defaults to 1.
+            public_only (bool, optional): 是否仅获取公开主题帖 该选项在获取他人主题帖时无效. Defaults to False.
+
+        Returns:
+            BytesResponse: 已检查错误码的UserPostResIdl响应体
+
+        Note:
+            可通过get_user_contents.get_threads.parse_proto得到protobuf 或通过get_user_contents.get_threads.parse_body得到UserThreads
+        """
+
+        if id_ is None:
+            user = await self.get_self_info(ReqUInfo.USER_ID)
+            user_id = user.user_id
+        elif not isinstance(id_, int):
+            user = await self.get_user_info(id_, ReqUInfo.USER_ID)
+            user_id = user.user_id
+        else:
+            user_id = id_
+
+        if self._ws_core.status == WsStatus.OPEN:
+            body = await get_user_contents.get_threads.request_body_ws(self._ws_core, user_id, pn, public_only)
+        else:
+            body = await get_user_contents.get_threads.request_body_http(self._http_core, user_id, pn, public_only)
+
+        check_error(body)
+        return BytesResponse(body)
+
+    def iter_user_threads(
+        self, id_: str | int | None = None, pn: int = 1, *, public_only: bool = False, prefetch: int = 1
+    ) -> AsyncIterator[get_user_contents.UserThreads]:
+        """
+        逐页迭代用户发布的主题帖 并在处理当前页时预取后继页
+
+        Args:
+            id_ (str | int | None): 用户id user_id / user_name / portrait 优先user_id
+                默认为None即获取本账号信息. Defaults to None.
+            pn (int, optional): 起始页码. Defaults to 1.
+            public_only (bool, optional): 是否仅获取公开主题帖 该选项在获取他人主题帖时无效. Defaults to False.
+            prefetch (int, optional): 预取的页数 为0则不预取. Defaults to 1.
+
+        Returns:
+            AsyncIterator[UserThreads]: 按页码顺序返回的主题帖列表 遇到空页时终止迭代 请求失败时返回带有err的主题帖列表并终止迭代
+        """
+
+        async def fetch(pn: int) -> get_user_contents.UserThreads:
+            return await self.get_user_threads(id_, pn, public_only=public_only)
+
+        return iter_pages(fetch, pn, prefetch, bool)
+
+    @handle_exception(lambda: get_replys.Replys())
     @_try_websocket
     async def get_replys(self, pn: int = 1) -> get_replys.Replys:
         """
@@ -956,7 +1729,7 @@ class Client:
 
         return await get_replys.request_http(self._http_core, pn)
 
-    @handle_exception(get_ats.Ats)
+    @handle_exception(lambda: get_ats.Ats())
     async def get_ats(self, pn: int = 1) -> get_ats.Ats:
         """
         获取@信息
@@ -970,7 +1743,7 @@ class Client:
 
         return await get_ats.request(self._http_core, pn)
 
-    @handle_exception(get_images.ImageBytes)
+    @handle_exception(lambda: get_images.ImageBytes())
     async def get_image_bytes(self, img_url: str) -> get_images.ImageBytes:
         """
         从链接获取静态图像的原始字节流
@@ -984,7 +1757,7 @@ class Client:
 
         return await get_images.request_bytes(self._http_core, yarl.URL(img_url))
 
-    @handle_exception(get_images.Image)
+    @handle_exception(lambda: get_images.Image())
     async def get_image(self, img_url: str) -> get_images.Image:
         """
         从链接获取静态图像
@@ -998,7 +1771,7 @@ class Client:
 
         return await get_images.request(self._http_core, yarl.URL(img_url))
 
-    @handle_exception(get_images.Image)
+    @handle_exception(lambda: get_images.Image())
     async def hash2image(self, raw_hash: str, /, size: Literal['s', 'm', 'l'] = 's') -> get_images.Image:
         """
         通过百度图库hash获取静态图像
@@ -1027,7 +1800,7 @@ class Client:
 
         return await get_images.request(self._http_core, img_url)
 
-    @handle_exception(get_images.Image)
+    @handle_exception(lambda: get_images.Image())
     async def get_portrait(self, id_: str | int, /, size: Literal['s', 'm', 'l'] = 's') -> get_images.Image:
         """
         获取用户头像
@@ -1068,7 +1841,7 @@ class Client:
         user = await get_selfinfo_moindex.request(self._http_core)
         self._user |= user
 
-    @handle_exception(get_square_forums.SquareForums)
+    @handle_exception(lambda: get_square_forums.SquareForums())
     @_try_websocket
     async def get_square_forums(self, cname: str, /, pn: int = 1, *, rn: int = 20) -> get_square_forums.SquareForums:
         """
@@ -1088,7 +1861,7 @@ class Client:
 
         return await get_square_forums.request_http(self._http_core, cname, pn, rn)
 
-    @handle_exception(get_bawu_info.BawuInfo)
+    @handle_exception(lambda: get_bawu_info.BawuInfo())
     @_try_websocket
     async def get_bawu_info(self, fname_or_fid: str | int) -> get_bawu_info.BawuInfo:
         """
@@ -1162,7 +1935,7 @@ class Client:
 
         return await del_bawu.request(self._http_core, fid, portrait, bawu_type)
 
-    @handle_exception(get_bawu_perm.BawuPerm)
+    @handle_exception(lambda: get_bawu_perm.BawuPerm())
     async def get_bawu_perm(self, fname_or_fid: str | int, /, id_: str | int) -> get_bawu_perm.BawuPerm:
         """
         获取指定吧务已分配的权限
@@ -1211,7 +1984,7 @@ class Client:
 
         return await set_bawu_perm.request(self._http_core, fid, portrait, perms)
 
-    @handle_exception(get_tab_map.TabMap)
+    @handle_exception(lambda: get_tab_map.TabMap())
     @_try_websocket
     async def get_tab_map(self, fname_or_fid: str | int) -> get_tab_map.TabMap:
         """
@@ -1231,7 +2004,7 @@ class Client:
 
         return await get_tab_map.request_http(self._http_core, fname)
 
-    @handle_exception(get_god_threads.GodThreads)
+    @handle_exception(lambda: get_god_threads.GodThreads())
     async def get_god_threads(self, /, pn: int = 1, rn=10) -> get_god_threads.GodThreads:
         """
         获取pn页的精选神帖列表
@@ -1246,7 +2019,7 @@ class Client:
 
         return await get_god_threads.request(self._http_core, pn, rn)
 
-    @handle_exception(get_rank_users.RankUsers)
+    @handle_exception(lambda: get_rank_users.RankUsers())
     async def get_rank_users(self, fname_or_fid: str | int, /, pn: int = 1) -> get_rank_users.RankUsers:
         """
         获取pn页的等级排行榜用户列表
@@ -1263,7 +2036,7 @@ class Client:
 
         return await get_rank_users.request(self._http_core, fname, pn)
 
-    @handle_exception(get_member_users.MemberUsers)
+    @handle_exception(lambda: get_member_users.MemberUsers())
     async def get_member_users(self, fname_or_fid: str | int, /, pn: int = 1) -> get_member_users.MemberUsers:
         """
         获取pn页的最新关注用户列表
@@ -1283,7 +2056,7 @@ class Client:
 
         return await get_member_users.request(self._http_core, fname, pn)
 
-    @handle_exception(get_rank_forums.RankForums)
+    @handle_exception(lambda: get_rank_forums.RankForums())
     async def get_rank_forums(
         self, fname_or_fid: str | int, /, pn: int = 1, *, rank_type: RankForumType = RankForumType.WEEKLY
     ) -> get_rank_forums.RankForums:
@@ -1303,7 +2076,7 @@ class Client:
 
         return await get_rank_forums.request(self._http_core, fname, pn, rank_type)
 
-    @handle_exception(get_blocks.Blocks)
+    @handle_exception(lambda: get_blocks.Blocks())
     async def get_blocks(self, fname_or_fid: str | int, /, name: str = '', pn: int = 1) -> get_blocks.Blocks:
         """
         获取pn页的待解封用户列表
@@ -1321,7 +2094,7 @@ class Client:
 
         return await get_blocks.request(self._http_core, fid, name, pn)
 
-    @handle_exception(get_recovers.Recovers)
+    @handle_exception(lambda: get_recovers.Recovers())
     async def get_recovers(
         self, fname_or_fid: str | int, /, pn: int = 1, *, rn: int = 10, id_: str | int | None = None
     ) -> get_recovers.Recovers:
@@ -1348,7 +2121,7 @@ class Client:
 
         return await get_recovers.request(self._http_core, fid, user_id, pn, rn)
 
-    @handle_exception(get_bawu_userlogs.Userlogs)
+    @handle_exception(lambda: get_bawu_userlogs.Userlogs())
     async def get_bawu_userlogs(
         self,
         fname_or_fid: str | int,
@@ -1386,7 +2159,7 @@ class Client:
             self._http_core, fname, pn, search_value, search_type, start_dt, end_dt, op_type
         )
 
-    @handle_exception(get_bawu_postlogs.Postlogs)
+    @handle_exception(lambda: get_bawu_postlogs.Postlogs())
     async def get_bawu_postlogs(
         self,
         fname_or_fid: str | int,
@@ -1424,7 +2197,7 @@ class Client:
             self._http_core, fname, pn, search_value, search_type, start_dt, end_dt, op_type
         )
 
-    @handle_exception(get_unblock_appeals.Appeals)
+    @handle_exception(lambda: get_unblock_appeals.Appeals())
     async def get_unblock_appeals(
         self, fname_or_fid: str | int, /, pn: int = 1, *, rn: int = 5
     ) -> get_unblock_appeals.Appeals:
@@ -1445,7 +2218,7 @@ class Client:
 
         return await get_unblock_appeals.request(self._http_core, fid, pn, rn)
 
-    @handle_exception(get_bawu_blacklist.BawuBlacklistUsers)
+    @handle_exception(lambda: get_bawu_blacklist.BawuBlacklistUsers())
     async def get_bawu_blacklist(
         self, fname_or_fid: str | int, /, pn: int = 1
     ) -> get_bawu_blacklist.BawuBlacklistUsers:
@@ -1467,7 +2240,7 @@ class Client:
 
         return await get_bawu_blacklist.request(self._http_core, fname, pn)
 
-    @handle_exception(get_statistics.Statistics)
+    @handle_exception(lambda: get_statistics.Statistics())
     async def get_statistics(self, fname_or_fid: str | int) -> get_statistics.Statistics:
         """
         获取吧务后台中最近24天的统计数据
@@ -1483,7 +2256,7 @@ class Client:
 
         return await get_statistics.request(self._http_core, fid)
 
-    @handle_exception(get_recom_status.RecomStatus)
+    @handle_exception(lambda: get_recom_status.RecomStatus())
     async def get_recom_status(self, fname_or_fid: str | int) -> get_recom_status.RecomStatus:
         """
         获取大吧主推荐功能的月度配额状态
@@ -2449,7 +3222,7 @@ class Client:
 
         return await set_msg_readed.request(self._ws_core, message)
 
-    @handle_exception(get_group_msg.WsMsgGroups)
+    @handle_exception(lambda: get_group_msg.WsMsgGroups())
     @_force_websocket
     async def get_group_msg(self, group_ids: list[int], *, get_type: int = 1) -> get_group_msg.WsMsgGroups:
         """
@@ -2545,7 +3318,7 @@ class Client:
         else:
             raise
 
-    @handle_exception(get_forum_level.LevelInfo)
+    @handle_exception(lambda: get_forum_level.LevelInfo())
     @_try_websocket
     async def get_forum_level(self, forum_id: int):
         """
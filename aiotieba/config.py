@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import dataclasses as dcs
+from typing import TYPE_CHECKING
 
 import aiohttp
 import yarl
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
 
 @dcs.dataclass
 class ProxyConfig:
@@ -76,3 +80,205 @@ class TimeoutConfig:
     @property
     def ws_timeout(self) -> aiohttp.ClientWSTimeout:
         return aiohttp.ClientWSTimeout(self.ws_read, self.ws_close)
+
+
+@dcs.dataclass
+class LimitConfig:
+    """
+    连接池与并发配置
+
+    Args:
+        conn_limit (int, optional): 连接池的最大连接数 为0则不限制. Defaults to 0.
+        conn_limit_per_host (int, optional): 对单个host的最大连接数 为0则不限制. Defaults to 0.
+        max_inflight (int, optional): 同时进行中的http请求的最大数量 超出的请求按优先级排队 为0则不限制. Defaults to 0.
+
+    Note:
+        websocket连接不计入max_inflight
+    """
+
+    conn_limit: int = 0
+    conn_limit_per_host: int = 0
+    max_inflight: int = 0
+
+
+@dcs.dataclass
+class RateLimitConfig:
+    """
+    限流配置
+
+    Args:
+        rates (dict[str, float], optional): 限流键到每秒请求数的映射 未列出的端点不限流. Defaults to None.
+        burst (float, optional): 令牌桶容量 以秒为单位 即允许突发的请求数为速率乘以burst. Defaults to 1.0.
+        throttle_codes (frozenset[int], optional): 视为服务端限流的错误码. Defaults to None.
+        backoff (float, optional): 每次遇到服务端限流时将速率乘以该系数. Defaults to 0.5.
+        recovery (float, optional): 速率每秒恢复的比例 以原始速率为基准. Defaults to 0.01.
+        min_rate (float, optional): 速率下限. Defaults to 0.1.
+
+    Note:
+        http请求的限流键为请求路径 如`/c/f/frs/page` 以`/`结尾的键作为路径前缀匹配 如`/mo/q/manage/`\n
+        websocket请求的限流键为cmd 如`301001`\n
+        未配置速率的端点在遇到服务端限流后 会以此前观测到的请求速率为基准降速 恢复后重新变为不限流\n
+        throttle_codes为None时使用默认配置 即`220034`和`340011`
+    """
+
+    rates: dict[str, float] = dcs.field(default_factory=dict)
+    burst: float = 1.0
+    throttle_codes: frozenset[int] = frozenset([220034, 340011])
+    backoff: float = 0.5
+    recovery: float = 0.01
+    min_rate: float = 0.1
+
+    def __init__(
+        self,
+        rates: dict[str, float] | None = None,
+        burst: float = 1.0,
+        throttle_codes: frozenset[int] | None = None,
+        backoff: float = 0.5,
+        recovery: float = 0.01,
+        min_rate: float = 0.1,
+    ) -> None:
+        if rates is None:
+            rates = {}
+        self.rates = rates
+        self.burst = burst
+        if throttle_codes is None:
+            throttle_codes = frozenset([220034, 340011])
+        self.throttle_codes = frozenset(throttle_codes)
+        self.backoff = backoff
+        self.recovery = recovery
+        self.min_rate = min_rate
+
+
+@dcs.dataclass
+class RetryConfig:
+    """
+    只读请求的重试与对冲配置
+
+    Args:
+        max_retries (int, optional): 最大重试次数. Defaults to 2.
+        backoff_base (float, optional): 首次重试前的最长等待时间 此后每次翻倍. Defaults to 0.2.
+        backoff_max (float, optional): 重试前的最长等待时间上限. Defaults to 3.0.
+        hedge (bool, optional): 是否启用对冲请求 即请求耗时超过历史分位数时再发送一个相同请求 并采用先到达的响应. Defaults to False.
+        hedge_quantile (float, optional): 用于计算对冲延迟的耗时分位数. Defaults to 0.95.
+        hedge_min_samples (int, optional): 端点的耗时样本数达到该值后才启用对冲. Defaults to 20.
+
+    Note:
+        所有时间均以秒为单位\n
+        仅重试连接失败 读取超时与5xx / 429状态码 不重试写操作与登录同步\n
+        实际等待时间在0到当次上限之间随机抖动
+    """
+
+    max_retries: int = 2
+    backoff_base: float = 0.2
+    backoff_max: float = 3.0
+    hedge: bool = False
+    hedge_quantile: float = 0.95
+    hedge_min_samples: int = 20
+
+
+@dcs.dataclass
+class ParseConfig:
+    """
+    响应解析配置
+
+    Args:
+        executor (Executor, optional): 用于解析大响应的线程池或进程池 为None则总是在事件循环中解析. Defaults to None.
+        threshold (int, optional): 响应体达到该字节数时交由executor解析. Defaults to 64KiB.
+
+    Note:
+        executor由调用方负责关闭\n
+        使用进程池时解析结果经pickle传回 且无法与事件循环所在进程共享用户信息的驻留\n
+        lazy为True的按需解析总是在事件循环中进行
+    """
+
+    executor: Executor | None = None
+    threshold: int = 64 * 1024
+
+
+def _default_cache_ttls() -> dict[str, float]:
+    return {
+        "get_forum": 600.0,
+        "get_forum_detail": 600.0,
+        "get_threads": 10.0,
+        "get_posts": 10.0,
+        "get_comments": 10.0,
+    }
+
+
+@dcs.dataclass
+class CacheConfig:
+    """
+    响应缓存配置
+
+    Args:
+        maxsize (int, optional): 缓存的最大条目数 超出后淘汰最久未使用的条目. Defaults to 256.
+        ttls (dict[str, float], optional): 接口名到缓存有效期的映射 未列出的接口不缓存. Defaults to None.
+        stale_while_revalidate (bool, optional): 缓存过期后先返回旧结果并在后台刷新. Defaults to False.
+        stale_ttl (float, optional): 过期结果在过期后仍可被返回的最长时间. Defaults to 60.0.
+
+    Note:
+        所有时间均以秒为单位\n
+        ttls为None时使用默认配置 即缓存get_forum / get_forum_detail 600秒 缓存get_threads / get_posts / get_comments 10秒
+    """
+
+    maxsize: int = 256
+    ttls: dict[str, float] = dcs.field(default_factory=_default_cache_ttls)
+    stale_while_revalidate: bool = False
+    stale_ttl: float = 60.0
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttls: dict[str, float] | None = None,
+        stale_while_revalidate: bool = False,
+        stale_ttl: float = 60.0,
+    ) -> None:
+        self.maxsize = maxsize
+        if ttls is None:
+            ttls = _default_cache_ttls()
+        self.ttls = ttls
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_ttl = stale_ttl
+
+
+@dcs.dataclass
+class ForumCacheConfig:
+    """
+    吧名与fid映射缓存的配置
+
+    Args:
+        maxsize (int, optional): 内存中的最大条目数 超出后淘汰最久未使用的条目. Defaults to 1024.
+        path (str, optional): sqlite数据库文件路径 为空则仅缓存在内存中. Defaults to ''.
+
+    Note:
+        吧名与fid的映射几乎不会变化 因此条目没有有效期\n
+        多个进程可以共享同一个数据库文件
+    """
+
+    maxsize: int = 1024
+    path: str = ""
+
+    def __init__(self, maxsize: int = 1024, path: str = "") -> None:
+        self.maxsize = maxsize
+        self.path = path
+
+
+@dcs.dataclass
+class UserCacheConfig:
+    """
+    用户身份缓存的配置
+
+    Args:
+        maxsize (int, optional): 缓存的最大用户数 超出后淘汰最久未使用的用户. Defaults to 4096.
+        ttl (float, optional): 缓存有效期 以秒为单位. Defaults to 3600.0.
+
+    Note:
+        仅缓存 user_id / portrait / user_name 三者的对应关系
+    """
+
+    maxsize: int = 4096
+    ttl: float = 3600.0
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 3600.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
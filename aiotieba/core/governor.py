@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses as dcs
+import heapq
+import itertools
+import time
+
+from ..enums import Priority
+
+
+@dcs.dataclass
+class PoolStats:
+    """
+    连接池与请求队列的统计信息
+
+    Attributes:
+        inflight (int): 进行中的http请求数
+        max_inflight (int): 进行中的http请求数上限 为0则不限制
+        waiting (int): 正在排队的http请求数
+        wait_count (int): 曾经排队的http请求总数
+        wait_time_total (float): 累计排队时间 以秒为单位
+        wait_time_max (float): 最长排队时间 以秒为单位
+
+        conn_acquired (int): 正在使用的连接数 取自aiohttp的私有属性 无法获取时为0
+        conn_idle (int): 空闲的长连接数 取自aiohttp的私有属性 无法获取时为0
+        conn_limit (int): 连接池的最大连接数 为0则不限制
+        conn_limit_per_host (int): 对单个host的最大连接数 为0则不限制
+
+        utilization (float): 连接池利用率 连接池不限制连接数时恒为0.0
+    """
+
+    inflight: int = 0
+    max_inflight: int = 0
+    waiting: int = 0
+    wait_count: int = 0
+    wait_time_total: float = 0.0
+    wait_time_max: float = 0.0
+
+    conn_acquired: int = 0
+    conn_idle: int = 0
+    conn_limit: int = 0
+    conn_limit_per_host: int = 0
+
+    @property
+    def utilization(self) -> float:
+        if not self.conn_limit:
+            return 0.0
+        return self.conn_acquired / self.conn_limit
+
+
+class ConcurrencyGovernor:
+    """
+    限制进行中的http请求数 超出上限的请求按优先级排队
+
+    Args:
+        max_inflight (int): 进行中的请求数上限 为0则不限制
+    """
+
+    __slots__ = [
+        "max_inflight",
+        "inflight",
+        "_waiters",
+        "_seq",
+        "wait_count",
+        "wait_time_total",
+        "wait_time_max",
+    ]
+
+    def __init__(self, max_inflight: int) -> None:
+        self.max_inflight = max_inflight
+        self.inflight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self.wait_count = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    @property
+    def waiting(self) -> int:
+        """
+        正在排队的请求数
+        """
+
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    async def acquire(self, priority: Priority = Priority.NORMAL) -> None:
+        """
+        获取一个请求配额 配额不足时排队等待
+
+        Args:
+            priority (Priority, optional): 优先级. Defaults to Priority.NORMAL.
+        """
+
+        if not self.max_inflight or (self.inflight < self.max_inflight and not self._waiters):
+            self.inflight += 1
+            return
+
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        start = time.perf_counter()
+
+        try:
+            await fut
+        except BaseException:
+            if fut.done() and not fut.cancelled():
+                # 配额已移交但调用方被取消 归还配额
+                self.release()
+            raise
+        finally:
+            wait_time = time.perf_counter() - start
+            self.wait_count += 1
+            self.wait_time_total += wait_time
+            if wait_time > self.wait_time_max:
+                self.wait_time_max = wait_time
+
+    def release(self) -> None:
+        """
+        归还一个请求配额 并将其移交给优先级最高的等待者
+        """
+
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(None)
+                return
+
+        self.inflight -= 1
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import bisect
+from typing import TYPE_CHECKING
+
+from ..exception import TiebaServerError
+from ..helper.context import get_call_context
+
+if TYPE_CHECKING:
+    from ..helper.context import CallContext
+
+# 调用耗时直方图的桶上界 以秒为单位
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class EndpointStats:
+    """
+    单个接口在单种传输方式下的统计
+
+    Attributes:
+        calls (int): 调用次数
+        errors (dict[str, int]): 错误码到次数的映射 非TiebaServerError的异常以异常类名计
+        latency_counts (list[int]): 落入各耗时桶的调用次数 最后一项对应+Inf
+        latency_sum (float): 累计调用耗时 以秒为单位
+        request_bytes (int): 累计请求字节数
+        response_bytes (int): 累计响应字节数
+        parse_time (float): 累计解析耗时 以秒为单位
+    """
+
+    __slots__ = [
+        "calls",
+        "errors",
+        "latency_counts",
+        "latency_sum",
+        "request_bytes",
+        "response_bytes",
+        "parse_time",
+    ]
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors: dict[str, int] = {}
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.parse_time = 0.0
+
+    def to_dict(self) -> dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), self.latency_counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+
+        return {
+            "calls": self.calls,
+            "errors": dict(self.errors),
+            "latency_sum": self.latency_sum,
+            "latency_buckets": buckets,
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "parse_time": self.parse_time,
+        }
+
+
+class MetricsRegistry:
+    """
+    按接口与传输方式汇总的调用统计
+
+    Note:
+        传输方式为http / ws / blcp 未产生网络请求的调用(如命中缓存)不计入统计\n
+        被合并的并发相同调用各自计入调用次数 但收发字节数只计入一次\n
+        解析耗时仅统计经由NetCore.parse解析的接口
+    """
+
+    __slots__ = ["_stats"]
+
+    def __init__(self) -> None:
+        self._stats: dict[tuple[str, str], EndpointStats] = {}
+
+    def observe(self, context: CallContext, elapsed: float, err: Exception | None = None) -> None:
+        """
+        记录一次接口调用
+
+        Args:
+            context (CallContext): 调用上下文
+            elapsed (float): 调用耗时 以秒为单位
+            err (Exception | None, optional): 调用抛出的异常. Defaults to None.
+        """
+
+        key = (context.name, context.transport)
+        if (stats := self._stats.get(key)) is None:
+            stats = self._stats[key] = EndpointStats()
+
+        stats.calls += 1
+        stats.latency_counts[bisect.bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+        stats.latency_sum += elapsed
+        stats.request_bytes += context.request_bytes
+        stats.response_bytes += context.response_bytes
+        stats.parse_time += context.parse_time
+
+        if err is not None:
+            code = str(err.code) if isinstance(err, TiebaServerError) else type(err).__name__
+            stats.errors[code] = stats.errors.get(code, 0) + 1
+
+    def get(self, name: str, transport: str) -> EndpointStats | None:
+        """
+        获取某个接口在某种传输方式下的统计
+
+        Args:
+            name (str): 接口名 如get_threads
+            transport (str): 传输方式
+
+        Returns:
+            EndpointStats | None: 尚无记录时返回None
+        """
+
+        return self._stats.get((name, transport))
+
+    def reset(self) -> None:
+        """
+        清空所有统计
+        """
+
+        self._stats.clear()
+
+    def to_dict(self) -> dict[str, dict[str, dict]]:
+        """
+        导出为字典
+
+        Returns:
+            dict[str, dict[str, dict]]: 接口名 -> 传输方式 -> 统计项
+        """
+
+        ret = {}
+        for (name, transport), stats in sorted(self._stats.items()):
+            ret.setdefault(name, {})[transport] = stats.to_dict()
+        return ret
+
+    def to_prometheus(self, prefix: str = "aiotieba") -> str:
+        """
+        导出为Prometheus文本格式
+
+        Args:
+            prefix (str, optional): 指标名前缀. Defaults to "aiotieba".
+
+        Returns:
+            str: Prometheus文本
+        """
+
+        items = sorted(self._stats.items())
+        lines = []
+
+        def header(name: str, type_: str, help_: str) -> str:
+            lines.append(f"# HELP {prefix}_{name} {help_}")
+            lines.append(f"# TYPE {prefix}_{name} {type_}")
+            return f"{prefix}_{name}"
+
+        def labels(name: str, transport: str, **extra: str) -> str:
+            pairs = [f'api="{name}"', f'transport="{transport}"']
+            pairs.extend(f'{k}="{v}"' for k, v in extra.items())
+            return "{" + ",".join(pairs) + "}"
+
+        metric = header("calls_total", "counter", "Number of Client API calls")
+        for (name, transport), stats in items:
+            lines.append(f"{metric}{labels(name, transport)} {stats.calls}")
+
+        metric = header("errors_total", "counter", "Number of failed Client API calls by error code")
+        for (name, transport), stats in items:
+            for code, count in sorted(stats.errors.items()):
+                lines.append(f"{metric}{labels(name, transport, code=code)} {count}")
+
+        metric = header("call_duration_seconds", "histogram", "Client API call latency")
+        for (name, transport), stats in items:
+            for bound, cumulative in stats.to_dict()["latency_buckets"].items():
+                lines.append(f"{metric}_bucket{labels(name, transport, le=bound)} {cumulative}")
+            lines.extend((
+                f"{metric}_sum{labels(name, transport)} {stats.latency_sum}",
+                f"{metric}_count{labels(name, transport)} {stats.calls}",
+            ))
+
+        for attr, help_ in (
+            ("request_bytes", "Bytes sent"),
+            ("response_bytes", "Bytes received"),
+        ):
+            metric = header(f"{attr}_total", "counter", help_)
+            for (name, transport), stats in items:
+                lines.append(f"{metric}{labels(name, transport)} {getattr(stats, attr)}")
+
+        metric = header("parse_seconds_total", "counter", "Time spent parsing response bodies")
+        for (name, transport), stats in items:
+            lines.append(f"{metric}{labels(name, transport)} {stats.parse_time}")
+
+        return "\n".join(lines) + "\n"
+
+
+def record_io(metrics: MetricsRegistry | None, transport: str, request_bytes: int = 0, response_bytes: int = 0) -> None:
+    """
+    将一次网络收发计入当前接口调用
+
+    Args:
+        metrics (MetricsRegistry | None): 统计注册表 为None则不记录
+        transport (str): 传输方式
+        request_bytes (int, optional): 请求字节数. Defaults to 0.
+        response_bytes (int, optional): 响应字节数. Defaults to 0.
+    """
+
+    if metrics is None or (context := get_call_context()) is None:
+        return
+
+    context.metrics = metrics
+    context.transport = transport
+    context.request_bytes += request_bytes
+    context.response_bytes += response_bytes
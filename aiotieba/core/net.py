@@ -2,13 +2,22 @@ from __future__ import annotations
 
 import asyncio
 import dataclasses as dcs
-from typing import Callable
+import time
+from typing import Any, Callable, TypeVar
 
 import aiohttp
 
-from ..config import ProxyConfig, TimeoutConfig
+from ..config import LimitConfig, ParseConfig, ProxyConfig, RateLimitConfig, RetryConfig, TimeoutConfig
+from ..enums import Priority, TracePhase
 from ..exception import HTTPStatusError
 from ..helper import timeout
+from ..helper.context import get_call_context
+from .governor import ConcurrencyGovernor, PoolStats
+from .metrics import MetricsRegistry, record_io
+from .ratelimit import RateLimiter
+from .replay import TrafficRecorder, TrafficReplayer, dump_request_body
+from .retry import LatencyTracker, backoff_delay, is_retryable
+from .trace import Tracer, trace
 
 
 def check_status_code(response: aiohttp.ClientResponse) -> None:
@@ -17,6 +26,41 @@ def check_status_code(response: aiohttp.ClientResponse) -> None:
 
 
 TypeHeadersChecker = Callable[[aiohttp.ClientResponse], None]
+TypeParsed = TypeVar("TypeParsed")
+
+_HIGH_PRIORITY_PATHS = frozenset([
+    "/c/s/login",
+    "/c/s/sync",
+    "/bawu2/platform/addBlack",
+    "/bawu2/platform/cancelBlack",
+    "/mo/q/bawublock",
+    "/mo/q/bawublockclear",
+    "/mo/q/bawurecoverthread",
+    "/mo/q/bawuteamadd",
+    "/mo/q/bawuteamclear",
+    "/mo/q/multiAppealhandle",
+    "/mo/q/setAuthToolPerm",
+    "/mo/q/submit/modifyNickname",
+    "/mo/q/usergrowth/commitUGTaskInfo",
+])
+
+
+def get_priority(request: aiohttp.ClientRequest) -> Priority:
+    """
+    根据请求路径判断请求的优先级
+    写操作与登录同步为HIGH 其余为NORMAL
+
+    Args:
+        request (aiohttp.ClientRequest): 待发送的请求
+
+    Returns:
+        Priority: 优先级
+    """
+
+    path = request.url.path
+    if path.startswith("/c/c/") or path in _HIGH_PRIORITY_PATHS:
+        return Priority.HIGH
+    return Priority.NORMAL
 
 
 @dcs.dataclass
@@ -28,17 +72,39 @@ class NetCore:
         connector (aiohttp.TCPConnector): 用于生成TCP连接的连接器
         proxy (ProxyConfig, optional): 代理配置. Defaults to None.
         timeout (TimeoutConfig, optional): 超时配置. Defaults to None.
+        limit (LimitConfig, optional): 并发配置. Defaults to None.
+        rate_limit (RateLimitConfig, optional): 限流配置. Defaults to None.
+        retry (RetryConfig, optional): 重试配置 为None则不重试. Defaults to None.
+        parse (ParseConfig, optional): 响应解析配置. Defaults to None.
+        metrics (MetricsRegistry, optional): 调用统计注册表 为None则不统计. Defaults to None.
+        tracer (Tracer, optional): 分阶段的追踪器 为None则不追踪. Defaults to None.
+        tape (TrafficRecorder | TrafficReplayer, optional): 流量录制器或回放器 为None则正常收发. Defaults to None.
     """
 
     connector: aiohttp.TCPConnector
     proxy: ProxyConfig
     timeout: TimeoutConfig
+    governor: ConcurrencyGovernor
+    rate_limiter: RateLimiter
+    retry: RetryConfig | None
+    latency: LatencyTracker
+    parsing: ParseConfig
+    metrics: MetricsRegistry | None
+    tracer: Tracer | None
+    tape: TrafficRecorder | TrafficReplayer | None
 
     def __init__(
         self,
         connector: aiohttp.TCPConnector,
         proxy: ProxyConfig | None = None,
         timeout: TimeoutConfig | None = None,
+        limit: LimitConfig | None = None,
+        rate_limit: RateLimitConfig | None = None,
+        retry: RetryConfig | None = None,
+        parse: ParseConfig | None = None,
+        metrics: MetricsRegistry | None = None,
+        tracer: Tracer | None = None,
+        tape: TrafficRecorder | TrafficReplayer | None = None,
     ) -> None:
         self.connector = connector
 
@@ -50,6 +116,81 @@ class NetCore:
             timeout = TimeoutConfig()
         self.timeout = timeout
 
+        if not isinstance(limit, LimitConfig):
+            limit = LimitConfig()
+        self.governor = ConcurrencyGovernor(limit.max_inflight)
+
+        if not isinstance(rate_limit, RateLimitConfig):
+            rate_limit = RateLimitConfig()
+        self.rate_limiter = RateLimiter(rate_limit)
+
+        self.retry = retry
+        self.latency = LatencyTracker()
+
+        if not isinstance(parse, ParseConfig):
+            parse = ParseConfig()
+        self.parsing = parse
+
+        self.metrics = metrics
+        self.tracer = tracer
+        self.tape = tape
+
+    @property
+    def pool_stats(self) -> PoolStats:
+        """
+        连接池与请求队列的统计信息
+        """
+
+        governor = self.governor
+        connector = self.connector
+        # aiohttp未公开连接数 _acquired与_conns为私有属性 已在aiohttp 3.11至3.14上核对
+        # 属性不存在时相应的统计值为0
+        acquired = getattr(connector, "_acquired", ())
+        conns = getattr(connector, "_conns", {})
+        return PoolStats(
+            governor.inflight,
+            governor.max_inflight,
+            governor.waiting,
+            governor.wait_count,
+            governor.wait_time_total,
+            governor.wait_time_max,
+            len(acquired),
+            sum(len(idle) for idle in conns.values()),
+            connector.limit,
+            connector.limit_per_host,
+        )
+
+    async def parse(
+        self, parse_func: Callable[..., TypeParsed], body: bytes, *args: Any, inline: bool = False
+    ) -> TypeParsed:
+        """
+        解析响应体
+        响应体达到阈值时交由配置的executor解析 以免长时间阻塞事件循环
+
+        Args:
+            parse_func (Callable[..., TypeParsed]): 解析函数 使用进程池时须为可pickle的模块级函数
+            body (bytes): 响应体
+            args (Any): 传递给解析函数的其余参数
+            inline (bool, optional): True则总是在事件循环中解析. Defaults to False.
+
+        Returns:
+            TypeParsed: 解析结果
+        """
+
+        parsing = self.parsing
+        start = time.perf_counter()
+        try:
+            with trace(self.tracer, TracePhase.PARSE, parse_func.__module__):
+                if inline or parsing.executor is None or len(body) < parsing.threshold:
+                    return parse_func(body, *args)
+
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(parsing.executor, parse_func, body, *args)
+
+        finally:
+            if self.metrics is not None and (context := get_call_context()) is not None:
+                context.parse_time += time.perf_counter() - start
+
     async def req2res(
         self, request: aiohttp.ClientRequest, read_until_eof: bool = True, read_bufsize: int = 64 * 1024
     ) -> aiohttp.ClientResponse:
@@ -66,10 +207,14 @@ class NetCore:
             ClientResponse: 响应
         """
 
+        tracer = self.tracer
+        path = request.url.path
+
         # 获取TCP连接
         try:
-            async with timeout(self.timeout.http_connect, self.connector._loop):
-                conn = await self.connector.connect(request, [], self.timeout.http_timeout)
+            with trace(tracer, TracePhase.CONNECT, path):
+                async with timeout(self.timeout.http_connect, self.connector._loop):
+                    conn = await self.connector.connect(request, [], self.timeout.http_timeout)
         except asyncio.TimeoutError as exc:
             raise aiohttp.ServerTimeoutError(f"Connection timeout to host {request.url}") from exc
 
@@ -83,12 +228,15 @@ class NetCore:
 
         # 发送请求
         try:
-            response = await request.send(conn)
+            with trace(tracer, TracePhase.SEND, path):
+                response = await request.send(conn)
         except BaseException:
             conn.close()
             raise
         try:
-            await response.start(conn)
+            # 等待响应头
+            with trace(tracer, TracePhase.WAIT, path):
+                await response.start(conn)
         except BaseException:
             response.close()
             raise
@@ -100,6 +248,7 @@ class NetCore:
         request: aiohttp.ClientRequest,
         read_bufsize: int = 64 * 1024,
         headers_checker: TypeHeadersChecker = check_status_code,
+        priority: Priority | None = None,
     ) -> bytes:
         """
         简单发送http请求
@@ -109,21 +258,122 @@ class NetCore:
             request (aiohttp.ClientRequest): 待发送的请求
             read_bufsize (int, optional): 读缓冲区大小 以字节为单位. Defaults to 64KiB.
             headers_checker (TypeHeadersChecker, optional): headers检查函数. Defaults to check_status_code.
+            priority (Priority, optional): 排队时的优先级 为None则根据请求路径自动判断. Defaults to None.
 
         Returns:
             bytes: body
         """
 
-        response = await self.req2res(request, True, read_bufsize)
+        if priority is None:
+            priority = get_priority(request)
+
+        with trace(self.tracer, TracePhase.REQUEST, request.url.path):
+            return await self.__send_with_retry(request, read_bufsize, headers_checker, priority)
+
+    async def __send_with_retry(
+        self,
+        request: aiohttp.ClientRequest,
+        read_bufsize: int,
+        headers_checker: TypeHeadersChecker,
+        priority: Priority,
+    ) -> bytes:
+        # 仅重试只读请求
+        if self.retry is None or priority != Priority.NORMAL:
+            return await self.__send_once(request, read_bufsize, headers_checker, priority)
+
+        attempt = 0
+        while True:
+            try:
+                if self.retry.hedge:
+                    return await self.__send_hedged(request, read_bufsize, headers_checker, priority)
+                return await self.__send_once(request, read_bufsize, headers_checker, priority)
+
+            except Exception as err:  # noqa: PERF203
+                if attempt >= self.retry.max_retries or not is_retryable(err):
+                    raise
+                await asyncio.sleep(backoff_delay(self.retry, attempt))
+                attempt += 1
+
+    async def __send_hedged(
+        self,
+        request: aiohttp.ClientRequest,
+        read_bufsize: int,
+        headers_checker: TypeHeadersChecker,
+        priority: Priority,
+    ) -> bytes:
+        hedge_delay = self.latency.quantile(request.url.path, self.retry.hedge_quantile, self.retry.hedge_min_samples)
+        if hedge_delay is None:
+            return await self.__send_once(request, read_bufsize, headers_checker, priority)
+
+        loop = asyncio.get_running_loop()
+        pending = {loop.create_task(self.__send_once(request, read_bufsize, headers_checker, priority))}
+
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_delay)
+            if not done:
+                # 耗时超过历史分位数 发送对冲请求
+                pending.add(loop.create_task(self.__send_once(request, read_bufsize, headers_checker, priority)))
+
+            error = None
+            while True:
+                for task in done:
+                    if (err := task.exception()) is None:
+                        return task.result()
+                    error = err
+                if not pending:
+                    raise error
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def __send_once(
+        self,
+        request: aiohttp.ClientRequest,
+        read_bufsize: int,
+        headers_checker: TypeHeadersChecker,
+        priority: Priority,
+    ) -> bytes:
+        path = request.url.path
+
+        with trace(self.tracer, TracePhase.QUEUE, path):
+            await self.rate_limiter.acquire(path)
+            await self.governor.acquire(priority)
+        try:
+            start = time.perf_counter()
+            # 在发送前记录 以便连接失败的调用也能按传输方式计入统计
+            record_io(self.metrics, "http", getattr(request.body, "size", None) or 0)
+
+            if isinstance(self.tape, TrafficReplayer):
+                body, delay = self.tape.pop("http", path)
+                with trace(self.tracer, TracePhase.WAIT, path):
+                    await asyncio.sleep(delay)
+
+            else:
+                response = await self.req2res(request, True, read_bufsize)
+
+                try:
+                    # 检查headers
+                    headers_checker(response)
+
+                    # 读取响应
+                    with trace(self.tracer, TracePhase.READ, path):
+                        response._body = await response.content.read()
+                    body = response._body
+
+                finally:
+                    # 释放连接
+                    response.release()
 
-        # 检查headers
-        headers_checker(response)
+                if self.tape is not None:
+                    end = time.perf_counter()
+                    self.tape.write("http", path, await dump_request_body(request), body, start, end)
 
-        # 读取响应
-        response._body = await response.content.read()
-        body = response._body
+            self.latency.add(path, time.perf_counter() - start)
+            record_io(self.metrics, "http", response_bytes=len(body))
 
-        # 释放连接
-        response.release()
+        finally:
+            self.governor.release()
 
         return body
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+from ..helper.context import get_call_context
+
+if TYPE_CHECKING:
+    from ..config import RateLimitConfig
+
+
+class TokenBucket:
+    """
+    可根据服务端限流反馈自动调整速率的令牌桶
+
+    Args:
+        base (float): 配置的速率 以每秒请求数为单位 为0则不限流
+    """
+
+    __slots__ = [
+        "base",
+        "configured",
+        "scale",
+        "tokens",
+        "stamp",
+        "last_throttle",
+        "window_start",
+        "window_count",
+        "observed",
+    ]
+
+    def __init__(self, base: float) -> None:
+        self.base = base
+        self.configured = base > 0
+        self.scale = 1.0
+        self.tokens = 0.0
+        now = time.monotonic()
+        self.stamp = now
+        self.last_throttle = 0.0
+        self.window_start = now
+        self.window_count = 0
+        self.observed = 0.0
+
+    @property
+    def rate(self) -> float:
+        """
+        当前速率 为0则不限流
+        """
+
+        return self.base * self.scale
+
+    def refill(self, config: RateLimitConfig, now: float) -> None:
+        dt = now - self.stamp
+        self.stamp = now
+
+        if self.scale < 1.0:
+            self.scale = min(1.0, self.scale + config.recovery * dt)
+            if self.scale == 1.0 and not self.configured:
+                # 已完全恢复 重新变为不限流
+                self.base = 0.0
+
+        if rate := self.rate:
+            capacity = max(1.0, rate * config.burst)
+            self.tokens = min(capacity, self.tokens + rate * dt)
+
+        # 统计实际请求速率
+        if (elapsed := now - self.window_start) >= 1.0:
+            self.observed = self.window_count / elapsed
+            self.window_start = now
+            self.window_count = 0
+
+
+class RateLimiter:
+    """
+    按端点限流的令牌桶集合
+
+    Args:
+        config (RateLimitConfig): 限流配置
+    """
+
+    __slots__ = ["config", "_buckets", "_key_cache"]
+
+    def __init__(self, config: RateLimitConfig) -> None:
+        self.config = config
+        self._buckets: dict[str, TokenBucket] = {}
+        self._key_cache: dict[str, str] = {}
+
+    def get_key(self, endpoint: str) -> str:
+        """
+        获取端点对应的限流键
+        优先精确匹配 其次匹配最长的以`/`结尾的前缀
+
+        Args:
+            endpoint (str): 请求路径或websocket cmd
+
+        Returns:
+            str: 限流键
+        """
+
+        if (key := self._key_cache.get(endpoint, None)) is not None:
+            return key
+
+        key = endpoint
+        if endpoint not in self.config.rates:
+            prefixes = [k for k in self.config.rates if k.endswith("/") and endpoint.startswith(k)]
+            if prefixes:
+                key = max(prefixes, key=len)
+
+        self._key_cache[endpoint] = key
+        return key
+
+    def __get_bucket(self, key: str) -> TokenBucket:
+        bucket = self._buckets.get(key, None)
+        if bucket is None:
+            bucket = TokenBucket(self.config.rates.get(key, 0.0))
+            if bucket.base:
+                bucket.tokens = max(1.0, bucket.base * self.config.burst)
+            self._buckets[key] = bucket
+        return bucket
+
+    def get_rate(self, endpoint: str) -> float:
+        """
+        获取端点的当前速率
+
+        Args:
+            endpoint (str): 请求路径或websocket cmd
+
+        Returns:
+            float: 每秒请求数 为0则不限流
+        """
+
+        bucket = self._buckets.get(self.get_key(endpoint), None)
+        if bucket is None:
+            return self.config.rates.get(self.get_key(endpoint), 0.0)
+        bucket.refill(self.config, time.monotonic())
+        return bucket.rate
+
+    async def acquire(self, endpoint: str) -> None:
+        """
+        获取一个令牌 令牌不足时等待
+
+        Args:
+            endpoint (str): 请求路径或websocket cmd
+        """
+
+        key = self.get_key(endpoint)
+        bucket = self.__get_bucket(key)
+
+        if (context := get_call_context()) is not None:
+            context.endpoints.append((self, key))
+
+        bucket.refill(self.config, time.monotonic())
+        bucket.window_count += 1
+
+        if not (rate := bucket.rate):
+            return
+
+        # 预占令牌 令牌为负数时按欠缺量等待
+        bucket.tokens -= 1.0
+        if bucket.tokens >= 0.0:
+            return
+
+        try:
+            await asyncio.sleep(-bucket.tokens / rate)
+        except BaseException:
+            bucket.tokens += 1.0
+            raise
+
+    def feedback(self, key: str, code: int) -> None:
+        """
+        反馈服务端错误码 遇到限流错误码时降低对应端点的速率
+
+        Args:
+            key (str): 限流键
+            code (int): 服务端错误码
+        """
+
+        if code not in self.config.throttle_codes:
+            return
+
+        bucket = self.__get_bucket(key)
+        now = time.monotonic()
+        bucket.refill(self.config, now)
+
+        # 同一批并发请求返回的多个限流错误只计一次
+        if now - bucket.last_throttle < 1.0:
+            return
+        bucket.last_throttle = now
+
+        config = self.config
+        if not bucket.base:
+            bucket.base = max(
+                config.min_rate, bucket.observed, bucket.window_count / max(now - bucket.window_start, 1.0)
+            )
+            bucket.scale = 1.0
+        bucket.scale = max(config.min_rate / bucket.base, bucket.scale * config.backoff)
+        bucket.tokens = min(bucket.tokens, 0.0)
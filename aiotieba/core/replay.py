@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import dataclasses as dcs
+import json
+import pathlib
+import struct
+import time
+from typing import TYPE_CHECKING, BinaryIO
+
+from ..logging import get_logger as LOG
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    import aiohttp
+
+# 每条记录以4字节的json头部长度开始
+_HEADER_LEN = struct.Struct(">I")
+
+
+@dcs.dataclass
+class TrafficRecord:
+    """
+    一对录制的请求与响应
+
+    Attributes:
+        transport (str): 传输方式 http或ws
+        target (str): http请求的路径或websocket请求的cmd
+        time (float): 请求发出时刻相对录制开始的偏移 以秒为单位
+        elapsed (float): 从发出请求到读完响应的耗时 以秒为单位
+        request (bytes): 请求体 websocket请求为打包前的protobuf序列化结果
+        response (bytes): 响应体 websocket响应为解包后的protobuf序列化结果
+    """
+
+    transport: str
+    target: str
+    time: float = 0.0
+    elapsed: float = 0.0
+    request: bytes = b""
+    response: bytes = b""
+
+
+def iter_records(path: str | pathlib.Path) -> Iterator[TrafficRecord]:
+    """
+    按录制顺序遍历录制文件中的所有记录
+
+    Args:
+        path (str | pathlib.Path): 录制文件的路径
+
+    Yields:
+        TrafficRecord: 录制的请求与响应
+
+    Note:
+        末尾不完整的记录会被忽略 以便读取录制进程崩溃时遗留的文件
+    """
+
+    with pathlib.Path(path).open("rb") as file:
+        while len(prefix := file.read(_HEADER_LEN.size)) == _HEADER_LEN.size:
+            (header_len,) = _HEADER_LEN.unpack(prefix)
+            header_bytes = file.read(header_len)
+            if len(header_bytes) != header_len:
+                return
+
+            header = json.loads(header_bytes)
+            request = file.read(header["request"])
+            response = file.read(header["response"])
+            if len(response) != header["response"]:
+                return
+
+            yield TrafficRecord(
+                header["transport"], header["target"], header["time"], header["elapsed"], request, response
+            )
+
+
+class _BytesWriter:
+    """
+    收集Payload.write写出的数据
+    """
+
+    __slots__ = ["chunks"]
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+
+    async def write(self, data: bytes) -> None:
+        self.chunks.append(bytes(data))
+
+
+async def dump_request_body(request: aiohttp.ClientRequest) -> bytes:
+    """
+    获取http请求的请求体
+
+    Args:
+        request (aiohttp.ClientRequest): http请求
+
+    Returns:
+        bytes: 请求体
+    """
+
+    body = request.body
+    if isinstance(body, (bytes, bytearray)):
+        return bytes(body)
+
+    writer = _BytesWriter()
+    await body.write(writer)
+    return b"".join(writer.chunks)
+
+
+class TrafficRecorder:
+    """
+    将每一对成功的请求与响应追加写入录制文件
+
+    Args:
+        path (str | pathlib.Path): 录制文件的路径 已存在时在末尾追加
+
+    Note:
+        记录交由单独的写线程按顺序写入并flush 不会阻塞事件循环 录制进程崩溃时至多丢失尚未写入的记录\n
+        文件由调用方负责关闭 关闭时等待所有记录写入完毕 可配合with语句使用\n
+        录制文件包含BDUSS等凭据签名后的请求体 请勿公开分发
+    """
+
+    __slots__ = ["path", "_file", "_writer", "_start"]
+
+    def __init__(self, path: str | pathlib.Path) -> None:
+        self.path = pathlib.Path(path)
+        self._file: BinaryIO | None = None
+        self._writer: concurrent.futures.ThreadPoolExecutor | None = None
+        self._start = time.perf_counter()
+
+    def __enter__(self) -> TrafficRecorder:
+        return self
+
+    def __exit__(self, exc_type=None, exc_val=None, exc_tb=None) -> None:
+        self.close()
+
+    def write(self, transport: str, target: str, request: bytes, response: bytes, start: float, end: float) -> None:
+        """
+        追加一条记录
+
+        Args:
+            transport (str): 传输方式 http或ws
+            target (str): http请求的路径或websocket请求的cmd
+            request (bytes): 请求体
+            response (bytes): 响应体
+            start (float): 发出请求的时刻 取自time.perf_counter()
+            end (float): 读完响应的时刻 取自time.perf_counter()
+        """
+
+        header = {
+            "transport": transport,
+            "target": target,
+            "time": start - self._start,
+            "elapsed": end - start,
+            "request": len(request),
+            "response": len(response),
+        }
+        header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+
+        record = b"".join((_HEADER_LEN.pack(len(header_bytes)), header_bytes, request, response))
+
+        # 单线程的写线程保证记录按提交顺序写入
+        if self._writer is None:
+            self._writer = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix="TrafficRecorder")
+        self._writer.submit(self.__write, record)
+
+    def __write(self, record: bytes) -> None:
+        try:
+            if self._file is None:
+                self._file = self.path.open("ab")
+            self._file.write(record)
+            self._file.flush()
+        except OSError as err:
+            LOG().warning("Failed to write traffic record. path=%s err=%r", self.path, err)
+
+    def close(self) -> None:
+        """
+        等待所有记录写入完毕后关闭录制文件
+        """
+
+        if self._writer is not None:
+            self._writer.shutdown()
+            self._writer = None
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class TrafficReplayer:
+    """
+    从录制文件中回放响应 不产生任何网络请求
+
+    Args:
+        path (str | pathlib.Path): 录制文件的路径
+        speed (float, optional): 回放速度 1.0按录制时的耗时返回响应 2.0则耗时减半 0则立即返回. Defaults to 1.0.
+
+    Note:
+        请求体中含有时间戳与签名 每次运行都不相同 因此按传输方式与路径或cmd匹配 同一端点的响应按录制顺序依次返回\n
+        某端点的响应耗尽后 再次请求该端点会抛出LookupError
+    """
+
+    __slots__ = ["speed", "_records"]
+
+    def __init__(self, path: str | pathlib.Path, speed: float = 1.0) -> None:
+        self.speed = speed
+        self._records: dict[tuple[str, str], collections.deque[TrafficRecord]] = {}
+        for record in iter_records(path):
+            self._records.setdefault((record.transport, record.target), collections.deque()).append(record)
+
+    @property
+    def remaining(self) -> int:
+        """
+        尚未回放的记录数
+        """
+
+        return sum(len(records) for records in self._records.values())
+
+    def pop(self, transport: str, target: str) -> tuple[bytes, float]:
+        """
+        取出端点的下一条响应
+
+        Args:
+            transport (str): 传输方式 http或ws
+            target (str): http请求的路径或websocket请求的cmd
+
+        Returns:
+            tuple[bytes, float]: 响应体, 按回放速度缩放后的耗时
+
+        Raises:
+            LookupError: 该端点没有剩余的录制响应
+        """
+
+        records = self._records.get((transport, target))
+        if not records:
+            raise LookupError(f"no recorded response left for {transport} {target}")
+
+        record = records.popleft()
+        delay = record.elapsed / self.speed if self.speed > 0 else 0.0
+        return record.response, delay
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import socket
+from typing import TYPE_CHECKING
+
+import aiohttp
+from aiohttp.abc import AbstractResolver
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from aiohttp.abc import ResolveResult
+
+
+class HostOverrideResolver(AbstractResolver):
+    """
+    将指定的域名解析到给定的地址 其余域名交由默认解析器解析
+    可用于将客户端指向本地的替身服务器 而无需修改各接口的url
+
+    Args:
+        hosts (Mapping[str, str]): 域名到地址的映射 键可以是`域名`或`域名:端口` 值可以是`ip`或`ip:端口` 带端口的ipv6地址须写作`[ip]:端口`
+
+    Note:
+        同时存在时`域名:端口`优先于`域名`\n
+        值中未给出端口时沿用原端口\n
+        请求头中的Host与tls的SNI仍为原域名 因此替身服务器可以按Host区分app与web接口\n
+        如`{"tiebac.baidu.com:80": "127.0.0.1:8080", "tiebac.baidu.com:443": "127.0.0.1:8443"}`
+    """
+
+    __slots__ = ["_hosts", "_fallback"]
+
+    def __init__(self, hosts: Mapping[str, str]) -> None:
+        self._hosts: dict[str, tuple[str, int | None]] = {}
+        for key, value in hosts.items():
+            if value.startswith("["):
+                # [ipv6]:端口
+                ip, _, port = value[1:].partition("]")
+                port = port.removeprefix(":")
+            elif value.count(":") == 1:
+                ip, _, port = value.partition(":")
+            else:
+                ip, port = value, ""
+            self._hosts[key] = (ip, int(port) if port else None)
+
+        self._fallback: AbstractResolver | None = None
+
+    async def resolve(
+        self, host: str, port: int = 0, family: socket.AddressFamily = socket.AF_INET
+    ) -> list[ResolveResult]:
+        if (target := self._hosts.get(f"{host}:{port}")) is None and (target := self._hosts.get(host)) is None:
+            if self._fallback is None:
+                self._fallback = aiohttp.DefaultResolver()
+            return await self._fallback.resolve(host, port, family)
+
+        ip, new_port = target
+        return [
+            {
+                "hostname": host,
+                "host": ip,
+                "port": port if new_port is None else new_port,
+                "family": socket.AF_INET6 if ":" in ip else socket.AF_INET,
+                "proto": 0,
+                "flags": socket.AI_NUMERICHOST | socket.AI_NUMERICSERV,
+            }
+        ]
+
+    async def close(self) -> None:
+        if self._fallback is not None:
+            await self._fallback.close()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from collections import deque
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+from ..exception import HTTPStatusError
+
+if TYPE_CHECKING:
+    from ..config import RetryConfig
+
+
+def is_retryable(err: BaseException) -> bool:
+    """
+    判断异常是否可以通过重试恢复
+
+    Args:
+        err (BaseException): 捕获的异常
+
+    Returns:
+        bool: 连接失败 读取超时与5xx / 429状态码返回True
+    """
+
+    if isinstance(err, HTTPStatusError):
+        return err.code >= 500 or err.code == 429
+    return isinstance(err, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError))
+
+
+def backoff_delay(config: RetryConfig, attempt: int) -> float:
+    """
+    计算带随机抖动的指数退避时间
+
+    Args:
+        config (RetryConfig): 重试配置
+        attempt (int): 已重试的次数 从0开始
+
+    Returns:
+        float: 等待时间 以秒为单位
+    """
+
+    cap = min(config.backoff_max, config.backoff_base * (1 << attempt))
+    return random.uniform(0.0, cap)
+
+
+class LatencyTracker:
+    """
+    记录各端点最近的请求耗时
+
+    Args:
+        maxlen (int, optional): 每个端点保留的样本数. Defaults to 128.
+    """
+
+    __slots__ = ["maxlen", "_samples"]
+
+    def __init__(self, maxlen: int = 128) -> None:
+        self.maxlen = maxlen
+        self._samples: dict[str, deque[float]] = {}
+
+    def add(self, endpoint: str, latency: float) -> None:
+        """
+        添加一个耗时样本
+
+        Args:
+            endpoint (str): 端点
+            latency (float): 耗时 以秒为单位
+        """
+
+        samples = self._samples.get(endpoint, None)
+        if samples is None:
+            samples = deque(maxlen=self.maxlen)
+            self._samples[endpoint] = samples
+        samples.append(latency)
+
+    def quantile(self, endpoint: str, q: float, min_samples: int = 1) -> float | None:
+        """
+        计算端点耗时的分位数
+
+        Args:
+            endpoint (str): 端点
+            q (float): 分位数 取值0~1
+            min_samples (int, optional): 样本数不足该值时返回None. Defaults to 1.
+
+        Returns:
+            float | None: 耗时 以秒为单位
+        """
+
+        samples = self._samples.get(endpoint, None)
+        if samples is None or len(samples) < max(1, min_samples):
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import contextlib
+import dataclasses as dcs
+import itertools
+import time
+from typing import TYPE_CHECKING, Callable
+
+from ..helper.context import get_call_context
+from ..logging import get_logger as LOG
+
+if TYPE_CHECKING:
+    from ..enums import TracePhase
+
+_trace_ids = itertools.count(1)
+
+
+@dcs.dataclass
+class TraceSpan:
+    """
+    一个阶段的追踪记录
+
+    Attributes:
+        phase (TracePhase): 阶段
+        trace_id (int): 关联id 同一次Client接口调用产生的所有记录共享该id 不在接口调用中时为0
+        api (str): 接口名 不在接口调用中时为空字符串
+        target (str): http请求的路径 websocket请求的cmd 或解析函数所在的模块
+        start (float): 开始时刻 取自time.perf_counter()
+        end (float): 结束时刻 取自time.perf_counter()
+        error (BaseException | None): 该阶段抛出的异常
+
+        duration (float): 耗时 以秒为单位
+    """
+
+    phase: TracePhase
+    trace_id: int = 0
+    api: str = ""
+    target: str = ""
+    start: float = 0.0
+    end: float = 0.0
+    error: BaseException | None = None
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+TypeTraceCallback = Callable[[TraceSpan], None]
+
+
+class Tracer:
+    """
+    在各阶段结束时调用回调 可用于接入分布式追踪或绘制火焰图
+
+    Args:
+        callbacks (TypeTraceCallback): 回调函数
+
+    Note:
+        回调在事件循环中同步执行 应尽快返回\n
+        回调抛出的异常会被记录到日志 不会影响请求本身\n
+        仅get_threads get_posts get_comments与get_user_contents等经NetCore.parse解析的接口产生PARSE记录 其余接口直接在请求函数中解析\n
+        交由executor解析时 PARSE阶段包含排队等待executor的时间
+    """
+
+    __slots__ = ["callbacks"]
+
+    def __init__(self, *callbacks: TypeTraceCallback) -> None:
+        self.callbacks = list(callbacks)
+
+    def add_callback(self, callback: TypeTraceCallback) -> None:
+        """
+        添加回调
+
+        Args:
+            callback (TypeTraceCallback): 回调函数
+        """
+
+        self.callbacks.append(callback)
+
+    def emit(self, span: TraceSpan) -> None:
+        """
+        将追踪记录分发给所有回调
+
+        Args:
+            span (TraceSpan): 追踪记录
+        """
+
+        for callback in self.callbacks:
+            try:
+                callback(span)
+            except Exception as err:  # noqa: PERF203
+                LOG().warning("Trace callback failed. callback=%r err=%r", callback, err)
+
+
+class _SpanRecorder:
+    __slots__ = ["tracer", "phase", "target", "start"]
+
+    def __init__(self, tracer: Tracer, phase: TracePhase, target: str) -> None:
+        self.tracer = tracer
+        self.phase = phase
+        self.target = target
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        end = time.perf_counter()
+
+        if (context := get_call_context()) is not None:
+            if not context.trace_id:
+                context.trace_id = next(_trace_ids)
+            trace_id = context.trace_id
+            api = context.name
+        else:
+            trace_id = 0
+            api = ""
+
+        self.tracer.emit(TraceSpan(self.phase, trace_id, api, self.target, self.start, end, exc_val))
+
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+def trace(tracer: Tracer | None, phase: TracePhase, target: str) -> contextlib.AbstractContextManager:
+    """
+    记录with块的耗时 并在退出时分发追踪记录
+
+    Args:
+        tracer (Tracer | None): 追踪器 为None则不记录
+        phase (TracePhase): 阶段
+        target (str): 请求路径等目标
+
+    Returns:
+        AbstractContextManager
+    """
+
+    if tracer is None:
+        return _NULL_SPAN
+    return _SpanRecorder(tracer, phase, target)
@@ -16,13 +16,18 @@ import yarl
 from cryptography.hazmat.primitives import padding
 from cryptography.hazmat.primitives.ciphers import algorithms
 
-from ..enums import WsStatus
+from ..enums import TracePhase, WsStatus
 from ..exception import HTTPStatusError
 from ..helper import timeout
+from ..helper.context import get_call_context
+from .metrics import record_io
+from .replay import TrafficReplayer
+from .trace import trace
 
 if TYPE_CHECKING:
     from .account import Account
     from .net import NetCore
+    from .trace import Tracer
 
 TypeWebsocketCallback = Callable[["WsCore", bytes, int], Awaitable[None]]
 
@@ -67,7 +72,7 @@ def pack_ws_bytes(
     return data
 
 
-def parse_ws_bytes(account: Account, data: bytes) -> tuple[bytes, int, int]:
+def parse_ws_bytes(account: Account, data: bytes) -> tuple[bytes | bytearray, int, int]:
     """
     对websocket返回数据进行解包
 
@@ -76,9 +81,13 @@ def parse_ws_bytes(account: Account, data: bytes) -> tuple[bytes, int, int]:
         data (bytes): 接收到的websocket数据
 
     Returns:
-        bytes: 解包后的websocket数据
+        bytes | bytearray: 解包后的websocket数据
         int: 对应请求的cmd类型
         int: 对应请求的id
+
+    Note:
+        加密的数据直接解密到一个预先按长度分配的bytearray中 并原地去除填充\n
+        相比逐步拼接的bytes 每个响应只需一次完整复制
     """
 
     data_view = memoryview(data)
@@ -86,18 +95,38 @@ def parse_ws_bytes(account: Account, data: bytes) -> tuple[bytes, int, int]:
     cmd = int.from_bytes(data_view[1:5], "big")
     req_id = int.from_bytes(data_view[5:9], "big")
 
-    data = data_view[9:].tobytes()
+    data_view = data_view[9:]
     if flag & 0b10000000:
-        decryptor = account.aes_ecb_chiper.decryptor()
-        data = decryptor.update(data) + decryptor.finalize()
-        unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
-        data = unpadder.update(data) + unpadder.finalize()
+        data = _decrypt_into(account, data_view)
+    elif flag & 0b01000000:
+        data = data_view
+    else:
+        data = data_view.tobytes()
     if flag & 0b01000000:
         data = gzip.decompress(data)
 
     return data, cmd, req_id
 
 
+_AES_BLOCK_BYTES = algorithms.AES.block_size // 8
+
+
+def _decrypt_into(account: Account, data_view: memoryview) -> bytearray:
+    # update_into要求输出缓冲区比输入多出block_size-1字节
+    buffer = bytearray(len(data_view) + _AES_BLOCK_BYTES - 1)
+    decryptor = account.aes_ecb_chiper.decryptor()
+    size = decryptor.update_into(data_view, buffer)
+    decryptor.finalize()
+
+    # 原地去除PKCS7填充
+    pad_size = buffer[size - 1] if size else 0
+    if not 0 < pad_size <= _AES_BLOCK_BYTES or buffer.count(pad_size, size - pad_size, size) != pad_size:
+        raise ValueError("Invalid padding bytes.")
+    del buffer[size - pad_size :]
+
+    return buffer
+
+
 @dcs.dataclass
 class MsgIDPair:
     """
@@ -176,18 +205,24 @@ class WsResponse:
         future (asyncio.Future): 用于等待读事件到来的Future
         req_id (int): 请求id
         read_timeout (float): 读超时时间
+        cmd (int, optional): 请求的cmd类型. Defaults to 0.
+        tracer (Tracer, optional): 追踪器. Defaults to None.
     """
 
     loop: asyncio.AbstractEventLoop
     future: asyncio.Future
     req_id: int
     read_timeout: float
+    cmd: int
+    tracer: Tracer | None
 
-    def __init__(self, req_id: int, read_timeout: float) -> None:
+    def __init__(self, req_id: int, read_timeout: float, cmd: int = 0, tracer: Tracer | None = None) -> None:
         self.loop = asyncio.get_running_loop()
         self.future = self.loop.create_future()
         self.req_id = req_id
         self.read_timeout = read_timeout
+        self.cmd = cmd
+        self.tracer = tracer
 
     async def read(self) -> bytes:
         """
@@ -201,8 +236,9 @@ class WsResponse:
         """
 
         try:
-            async with timeout(self.read_timeout, self.loop):
-                return await self.future
+            with trace(self.tracer, TracePhase.WS_READ, str(self.cmd)):
+                async with timeout(self.read_timeout, self.loop):
+                    data = await self.future
         except asyncio.TimeoutError as err:
             self.future.cancel()
             raise asyncio.TimeoutError("Timeout to read") from err
@@ -210,6 +246,12 @@ class WsResponse:
             self.future.cancel()
             raise
 
+        # 发送时已由record_io标记了当前调用
+        if (context := get_call_context()) is not None and context.metrics is not None:
+            context.response_bytes += len(data)
+
+        return data
+
 
 @dcs.dataclass
 class WsWaiter:
@@ -221,31 +263,33 @@ class WsWaiter:
     waiter: weakref.WeakValueDictionary
     req_id: int
     read_timeout: float
+    tracer: Tracer | None
 
-    def __init__(self, read_timeout: float) -> None:
+    def __init__(self, read_timeout: float, tracer: Tracer | None = None) -> None:
         self.loop = asyncio.get_running_loop()
         self.waiter = weakref.WeakValueDictionary()
         self.req_id = int(time.time())
         self.read_timeout = read_timeout
+        self.tracer = tracer
         weakref.finalize(self, self.__cancel_all)
 
     def __cancel_all(self) -> None:
         for ws_resp in self.waiter.values():
             ws_resp.future.cancel()
 
-    def new(self) -> WsResponse:
+    def new(self, cmd: int = 0) -> WsResponse:
         """
         创建一个可用于等待数据的响应对象
 
         Args:
-            req_id (int): 请求id
+            cmd (int, optional): 请求的cmd类型. Defaults to 0.
 
         Returns:
             WsResponse: websocket响应
         """
 
         self.req_id += 1
-        ws_resp = WsResponse(self.req_id, self.read_timeout)
+        ws_resp = WsResponse(self.req_id, self.read_timeout, cmd, self.tracer)
         self.waiter[self.req_id] = ws_resp
         return ws_resp
 
@@ -259,7 +303,7 @@ class WsWaiter:
         """
 
         ws_resp: WsResponse = self.waiter.get(req_id, None)
-        if ws_resp is None:
+        if ws_resp is None or ws_resp.future.done():
             return
         ws_resp.future.set_result(data)
 
@@ -305,9 +349,13 @@ class WsCore:
 
         self._status = WsStatus.CONNECTING
 
-        self.waiter = WsWaiter(self.net_core.timeout.ws_read)
+        self.waiter = WsWaiter(self.net_core.timeout.ws_read, self.net_core.tracer)
         self.mid_manager = MsgIDManager()
 
+        if isinstance(self.net_core.tape, TrafficReplayer):
+            # 回放时无需建立连接 响应均由send从录制文件中取出
+            return
+
         from aiohttp import hdrs
 
         ws_url = yarl.URL.build(scheme="ws", host="im.tieba.baidu.com", port=8000)
@@ -363,7 +411,7 @@ class WsCore:
         self.ws_dispatcher = self.loop.create_task(self.__ws_dispatch(), name="ws_dispatcher")
 
     async def close(self) -> None:
-        if self.status == WsStatus.OPEN:
+        if self.status == WsStatus.OPEN and self.websocket is not None:
             await self.websocket.close()
             self.ws_dispatcher.cancel()
         self._status = WsStatus.CLOSED
@@ -392,7 +440,11 @@ class WsCore:
         websocket状态
         """
 
-        if self._status != WsStatus.CLOSED and self.websocket._writer.transport.is_closing():
+        if (
+            self._status != WsStatus.CLOSED
+            and self.websocket is not None
+            and self.websocket._writer.transport.is_closing()
+        ):
             self._status = WsStatus.CLOSED
         return self._status
 
@@ -413,16 +465,39 @@ class WsCore:
             asyncio.TimeoutError: 发送超时
         """
 
-        response = self.waiter.new()
-        req_data = pack_ws_bytes(self.account, data, cmd, response.req_id, compress=compress, encrypt=encrypt)
-
-        try:
-            async with timeout(self.net_core.timeout.ws_send, self.loop):
-                await self.websocket.send_bytes(req_data)
-        except asyncio.TimeoutError as err:
-            response.future.cancel()
-            raise asyncio.TimeoutError("Timeout to send") from err
-        except BaseException:
-            response.future.cancel()
-        else:
-            return response
+        tracer = self.net_core.tracer
+        tape = self.net_core.tape
+        target = str(cmd)
+
+        with trace(tracer, TracePhase.QUEUE, target):
+            await self.net_core.rate_limiter.acquire(target)
+
+        response = self.waiter.new(cmd)
+
+        with trace(tracer, TracePhase.WS_SEND, target):
+            req_data = pack_ws_bytes(self.account, data, cmd, response.req_id, compress=compress, encrypt=encrypt)
+            record_io(self.net_core.metrics, "ws", len(req_data))
+
+            if isinstance(tape, TrafficReplayer):
+                res_data, delay = tape.pop("ws", target)
+                self.loop.call_later(delay, self.waiter.set_done, response.req_id, res_data)
+                return response
+
+            start = time.perf_counter()
+            try:
+                async with timeout(self.net_core.timeout.ws_send, self.loop):
+                    await self.websocket.send_bytes(req_data)
+            except asyncio.TimeoutError as err:
+                response.future.cancel()
+                raise asyncio.TimeoutError("Timeout to send") from err
+            except BaseException:
+                response.future.cancel()
+            else:
+                if tape is not None:
+
+                    def record(future: asyncio.Future) -> None:
+                        if not future.cancelled():
+                            tape.write("ws", target, data, future.result(), start, time.perf_counter())
+
+                    response.future.add_done_callback(record)
+                return response
@@ -71,6 +71,88 @@ class ReqUInfo(enum.Flag):
     ALL = BASIC | NICK_NAME | TIEBA_UID | OTHER
 
 
+class ReqFields(enum.Flag):
+    """
+    使用该枚举类指定get_threads / get_posts / get_comments需要解析的子对象
+    未指定的子对象保留默认值 id 计数与时间等标量字段总是会被解析
+
+    Note:
+        CONTENTS 正文的文本 表情 @ 链接等内容碎片\n
+        MEDIA 正文的图像 视频与音频碎片 仅在同时指定CONTENTS时生效\n
+        USER 发布者的用户信息\n
+        VOTE 投票信息\n
+        SHARE 被分享的主题帖\n
+        TAB_MAP 分区名到分区id的映射 仅用于get_threads\n
+        COMMENTS 楼层内嵌的楼中楼 仅用于get_posts\n
+        SIGN 小尾巴 仅用于get_posts\n
+        TEXT = CONTENTS | SIGN
+    """
+
+    CONTENTS = enum.auto()
+    MEDIA = enum.auto()
+    USER = enum.auto()
+    VOTE = enum.auto()
+    SHARE = enum.auto()
+    TAB_MAP = enum.auto()
+    COMMENTS = enum.auto()
+    SIGN = enum.auto()
+    TEXT = CONTENTS | SIGN
+    ALL = TEXT | MEDIA | USER | VOTE | SHARE | TAB_MAP | COMMENTS
+
+
+class Priority(enum.IntEnum):
+    """
+    http请求的调度优先级 数值越小越优先
+
+    Note:
+        HIGH 写操作与登录同步 如删帖 封禁\n
+        NORMAL 读操作
+    """
+
+    HIGH = 0
+    NORMAL = 1
+
+
+class PoolStrategy(enum.IntEnum):
+    """
+    客户端池选取客户端的策略
+
+    Note:
+        ROUND_ROBIN 轮流选取\n
+        LEAST_LOADED 选取进行中与排队中的请求数最少的客户端
+    """
+
+    ROUND_ROBIN = 0
+    LEAST_LOADED = 1
+
+
+class TracePhase(StrEnum):
+    """
+    追踪记录的阶段
+
+    Note:
+        REQUEST http请求的全程 包含重试与对冲\n
+        QUEUE 在限流器与并发上限处排队\n
+        CONNECT 获取连接 包含建立TCP连接\n
+        SEND 发送请求\n
+        WAIT 等待响应头 即首字节时间\n
+        READ 读取响应体\n
+        WS_SEND 打包并发送websocket请求\n
+        WS_READ 等待websocket响应\n
+        PARSE 解析响应体 包含protobuf反序列化与数据类的构造 仅覆盖经NetCore.parse解析的接口
+    """
+
+    REQUEST = "request"
+    QUEUE = "queue"
+    CONNECT = "connect"
+    SEND = "send"
+    WAIT = "wait"
+    READ = "read"
+    WS_SEND = "ws_send"
+    WS_READ = "ws_read"
+    PARSE = "parse"
+
+
 class ThreadSortType(enum.IntEnum):
     """
     主题帖排序
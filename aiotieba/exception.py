@@ -82,6 +82,32 @@ class StrResponse(TbErrorExt, str):
         return hash(str(self))
 
 
+@dcs.dataclass
+class BytesResponse(TbErrorExt, bytes):
+    """
+    bytes返回值
+    是内置bytes的子类
+
+    Attributes:
+        err (Exception | None): 捕获的异常
+    """
+
+    __slots__ = []
+
+    def __new__(cls, b: bytes = b"") -> BytesResponse:
+        obj = super().__new__(cls, b)
+        return obj
+
+    def __init__(self, b: bytes = b"") -> None:
+        pass
+
+    def __repr__(self) -> str:
+        return repr(bytes(self))
+
+    def __hash__(self) -> int:
+        return hash(bytes(self))
+
+
 class TiebaServerError(RuntimeError):
     """
     贴吧服务器异常
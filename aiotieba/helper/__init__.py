@@ -1,4 +1,4 @@
-from . import cache, crypto, utils
+from . import cache, context, crypto, flight, paginate, utils
 from .utils import (
     default_datetime,
     handle_exception,
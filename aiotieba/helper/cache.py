@@ -1,58 +1,554 @@
 from __future__ import annotations
 
+import asyncio
+import functools
+import threading
+import time
 from collections import OrderedDict
-from typing import ClassVar
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from ..config import ForumCacheConfig
+from ..logging import get_logger as LOG
+
+if TYPE_CHECKING:
+    import sqlite3
+    from collections.abc import Hashable, Iterable
+
+    from ..config import CacheConfig, UserCacheConfig
 
 
 class ForumInfoCache:
     """
-    吧信息缓存
+    吧名与fid的双向映射缓存
+
+    Args:
+        config (ForumCacheConfig, optional): 缓存配置. Defaults to None.
+
+    Attributes:
+        hits (int): 命中的次数 包含命中数据库的次数
+        disk_hits (int): 内存未命中但数据库命中的次数
+        misses (int): 未命中的次数
+
+    Note:
+        数据库的读写均在事件循环的默认executor中进行 以免锁竞争阻塞事件循环\n
+        add_forum写入的映射会排队 在executor中批量写入数据库
     """
 
-    _fname2fid: ClassVar[OrderedDict] = OrderedDict()
-    _fid2fname: ClassVar[OrderedDict] = OrderedDict()
+    __slots__ = [
+        "config",
+        "_fname2fid",
+        "_fid2fname",
+        "_db",
+        "_db_lock",
+        "_pending",
+        "_flush_task",
+        "hits",
+        "disk_hits",
+        "misses",
+    ]
+
+    _default: ClassVar[ForumInfoCache | None] = None
+
+    def __init__(self, config: ForumCacheConfig | None = None) -> None:
+        if not isinstance(config, ForumCacheConfig):
+            config = ForumCacheConfig()
+        self.config = config
+
+        self._fname2fid: OrderedDict[str, int] = OrderedDict()
+        self._fid2fname: dict[int, str] = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        # 数据库连接在首次读写时于executor中建立
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._pending: list[tuple[str, int]] = []
+        self._flush_task: asyncio.Task | None = None
 
     @classmethod
-    def get_fid(cls, fname: str) -> int:
+    def default(cls) -> ForumInfoCache:
         """
-        通过贴吧名获取forum_id
+        获取进程内共享的默认缓存
+
+        Returns:
+            ForumInfoCache: 默认缓存
+        """
+
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    def get_fid(self, fname: str) -> int:
+        """
+        通过贴吧名获取forum_id 仅查询内存
 
         Args:
             fname (str): 贴吧名
 
         Returns:
-            int: 该贴吧的forum_id
+            int: 该贴吧的forum_id 未命中时返回0
         """
 
-        return cls._fname2fid.get(fname, "")
+        if (fid := self._fname2fid.get(fname)) is not None:
+            self._fname2fid.move_to_end(fname)
+            self.hits += 1
+            return fid
 
-    @classmethod
-    def get_fname(cls, fid: int) -> str:
+        self.misses += 1
+        return 0
+
+    def get_fname(self, fid: int) -> str:
         """
-        通过forum_id获取贴吧名
+        通过forum_id获取贴吧名 仅查询内存
 
         Args:
             fid (int): forum_id
 
         Returns:
-            str: 该贴吧的贴吧名
+            str: 该贴吧的贴吧名 未命中时返回空字符串
         """
 
-        return cls._fid2fname.get(fid, "")
+        if (fname := self._fid2fname.get(fid)) is not None:
+            self._fname2fid.move_to_end(fname)
+            self.hits += 1
+            return fname
 
-    @classmethod
-    def add_forum(cls, fname: str, fid: int) -> None:
+        self.misses += 1
+        return ""
+
+    async def fetch_fid(self, fname: str) -> int:
+        """
+        通过贴吧名获取forum_id 内存未命中时在executor中查询数据库
+
+        Args:
+            fname (str): 贴吧名
+
+        Returns:
+            int: 该贴吧的forum_id 未命中时返回0
+        """
+
+        if not self.config.path or fname in self._fname2fid:
+            return self.get_fid(fname)
+
+        loop = asyncio.get_running_loop()
+        row = await loop.run_in_executor(None, self.__select, "SELECT fid FROM forum WHERE fname=?", fname)
+        if row is None:
+            self.misses += 1
+            return 0
+
+        fid = row[0]
+        self.__put(fname, fid)
+        self.hits += 1
+        self.disk_hits += 1
+        return fid
+
+    async def fetch_fname(self, fid: int) -> str:
+        """
+        通过forum_id获取贴吧名 内存未命中时在executor中查询数据库
+
+        Args:
+            fid (int): forum_id
+
+        Returns:
+            str: 该贴吧的贴吧名 未命中时返回空字符串
+        """
+
+        if not self.config.path or fid in self._fid2fname:
+            return self.get_fname(fid)
+
+        loop = asyncio.get_running_loop()
+        row = await loop.run_in_executor(None, self.__select, "SELECT fname FROM forum WHERE fid=?", fid)
+        if row is None:
+            self.misses += 1
+            return ""
+
+        fname = row[0]
+        self.__put(fname, fid)
+        self.hits += 1
+        self.disk_hits += 1
+        return fname
+
+    def add_forum(self, fname: str, fid: int) -> None:
         """
         将贴吧名与forum_id的映射关系添加到缓存
 
         Args:
             fname (str): 贴吧名
             fid (int): 贴吧id
+
+        Note:
+            启用数据库时写入会排队 在事件循环外调用时留待flush或close写入
+        """
+
+        self.__put(fname, fid)
+        if not self.config.path:
+            return
+
+        self._pending.append((fname, fid))
+        if self._flush_task is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            self._flush_task = loop.create_task(self.__flush())
+
+    def preload(self, forums: Iterable[tuple[str, int]]) -> None:
+        """
+        批量添加贴吧名与forum_id的映射关系
+
+        Args:
+            forums (Iterable[tuple[str, int]]): (贴吧名, forum_id)的序列
+
+        Note:
+            内存中仅保留最后的maxsize条 启用数据库时全部写入数据库\n
+            数据库写入是同步的 应在启动时调用
+        """
+
+        forums = list(forums)
+        for fname, fid in forums[-self.config.maxsize :]:
+            self.__put(fname, fid)
+        if self.config.path:
+            self.__write(forums)
+
+    async def flush(self) -> None:
+        """
+        等待排队的映射全部写入数据库
+        """
+
+        if self._flush_task is None:
+            if not self._pending:
+                return
+            self._flush_task = asyncio.get_running_loop().create_task(self.__flush())
+        await asyncio.shield(self._flush_task)
+
+    async def __flush(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            # 写入期间新增的映射合并为下一批
+            while self._pending:
+                forums, self._pending = self._pending, []
+                try:
+                    await loop.run_in_executor(None, self.__write, forums)
+                except Exception as err:  # noqa: PERF203
+                    LOG().warning("Failed to write forum cache. path=%s err=%r", self.config.path, err)
+        finally:
+            self._flush_task = None
+
+    def __connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            import sqlite3
+
+            db = sqlite3.connect(self.config.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("CREATE TABLE IF NOT EXISTS forum (fname TEXT PRIMARY KEY, fid INTEGER NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS forum_fid ON forum (fid)")
+            self._db = db
+        return self._db
+
+    def __select(self, sql: str, key: str | int) -> tuple | None:
+        with self._db_lock:
+            return self.__connect().execute(sql, (key,)).fetchone()
+
+    def __write(self, forums: list[tuple[str, int]]) -> None:
+        with self._db_lock:
+            db = self.__connect()
+            db.execute("BEGIN")
+            try:
+                db.executemany("INSERT OR REPLACE INTO forum VALUES (?,?)", forums)
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+
+    def __put(self, fname: str, fid: int) -> None:
+        if (old_fid := self._fname2fid.get(fname)) is not None and self._fid2fname.get(old_fid) == fname:
+            del self._fid2fname[old_fid]
+        self._fname2fid[fname] = fid
+        self._fname2fid.move_to_end(fname)
+        self._fid2fname[fid] = fname
+
+        if len(self._fname2fid) > self.config.maxsize:
+            old_fname, old_fid = self._fname2fid.popitem(last=False)
+            if self._fid2fname.get(old_fid) == old_fname:
+                del self._fid2fname[old_fid]
+
+    def close(self) -> None:
+        """
+        同步写入排队的映射并关闭数据库连接
+        """
+
+        if self._pending:
+            forums, self._pending = self._pending, []
+            self.__write(forums)
+
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __len__(self) -> int:
+        return self._fname2fid.__len__()
+
+
+class ResponseCache:
+    """
+    带有效期的LRU响应缓存
+
+    Args:
+        config (CacheConfig): 缓存配置
+
+    Attributes:
+        hits (int): 命中未过期条目的次数
+        stale_hits (int): 命中过期条目并返回旧结果的次数
+        misses (int): 未命中的次数
+    """
+
+    __slots__ = [
+        "config",
+        "_entries",
+        "_refreshing",
+        "hits",
+        "stale_hits",
+        "misses",
+    ]
+
+    def __init__(self, config: CacheConfig) -> None:
+        self.config = config
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._refreshing: dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def ttl_of(self, name: str) -> float:
+        """
+        获取接口的缓存有效期
+
+        Args:
+            name (str): 接口名
+
+        Returns:
+            float: 有效期 以秒为单位 为0则不缓存
+        """
+
+        return self.config.ttls.get(name, 0.0)
+
+    def get(self, key: Hashable) -> tuple[Any, bool] | None:
+        """
+        查询缓存
+
+        Args:
+            key (Hashable): 缓存键
+
+        Returns:
+            tuple[Any, bool] | None: 缓存值与是否已过期 未命中时返回None
+        """
+
+        entry = self._entries.get(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expire = entry
+        now = time.monotonic()
+        if now < expire:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value, False
+
+        if self.config.stale_while_revalidate and now < expire + self.config.stale_ttl:
+            self._entries.move_to_end(key)
+            self.stale_hits += 1
+            return value, True
+
+        del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """
+        写入缓存
+
+        Args:
+            key (Hashable): 缓存键
+            value (Any): 缓存值
+            ttl (float): 有效期 以秒为单位
+        """
+
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.config.maxsize:
+            self._entries.popitem(last=False)
+
+    def is_refreshing(self, key: Hashable) -> bool:
+        """
+        该缓存键是否正在后台刷新
+        """
+
+        return key in self._refreshing
+
+    def add_refresh(self, key: Hashable, task: asyncio.Task) -> None:
+        """
+        登记一个后台刷新任务 任务结束后自动注销
+
+        Args:
+            key (Hashable): 缓存键
+            task (asyncio.Task): 刷新任务
+        """
+
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    def cancel_refresh(self) -> None:
+        """
+        取消所有后台刷新任务
+        """
+
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        self._refreshing.clear()
+
+    def clear(self) -> None:
+        """
+        清空缓存 不重置计数器
+        """
+
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return self._entries.__len__()
+
+
+def _peek_user(obj: Any) -> Any:
+    # 按需解析的user为cached_property 尚未访问时返回None
+    if isinstance(getattr(type(obj), "user", None), functools.cached_property) and "user" not in vars(obj):
+        return None
+    return getattr(obj, "user", None)
+
+
+class UserIdentityCache:
+    """
+    带有效期的LRU用户身份缓存
+    维护 user_id / portrait / user_name 三者的对应关系
+
+    Args:
+        config (UserCacheConfig): 缓存配置
+
+    Attributes:
+        hits (int): 命中的次数
+        misses (int): 未命中的次数
+    """
+
+    __slots__ = [
+        "config",
+        "_entries",
+        "_portraits",
+        "_names",
+        "hits",
+        "misses",
+    ]
+
+    def __init__(self, config: UserCacheConfig) -> None:
+        self.config = config
+        self._entries: OrderedDict[int, tuple[str, str, float]] = OrderedDict()
+        self._portraits: dict[str, int] = {}
+        self._names: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, id_: str | int) -> tuple[int, str, str] | None:
+        """
+        查询用户身份
+
+        Args:
+            id_ (str | int): 用户id user_id / portrait / user_name
+
+        Returns:
+            tuple[int, str, str] | None: (user_id, portrait, user_name) 未命中时返回None
+        """
+
+        if isinstance(id_, int):
+            user_id = id_
+        elif (user_id := self._portraits.get(id_)) is None:
+            user_id = self._names.get(id_)
+
+        entry = self._entries.get(user_id) if user_id is not None else None
+        if entry is None:
+            self.misses += 1
+            return None
+
+        portrait, user_name, expire = entry
+        if time.monotonic() >= expire:
+            self.__remove(user_id)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return user_id, portrait, user_name
+
+    def add(self, user_id: int, portrait: str, user_name: str) -> None:
+        """
+        写入用户身份
+
+        Args:
+            user_id (int): user_id
+            portrait (str): portrait
+            user_name (str): 用户名 可以为空
+        """
+
+        if user_id in self._entries:
+            self.__remove(user_id)
+
+        self._entries[user_id] = (portrait, user_name, time.monotonic() + self.config.ttl)
+        self._portraits[portrait] = user_id
+        if user_name:
+            self._names[user_name] = user_id
+
+        if len(self._entries) > self.config.maxsize:
+            self.__remove(next(iter(self._entries)))
+
+    def add_from(self, obj: Any) -> None:
+        """
+        从解析结果中收集用户身份
+
+        Args:
+            obj (Any): 用户信息 或objs中的元素带有user字段的列表容器
+
+        Note:
+            user_id或portrait缺失的用户会被忽略\n
+            按需解析的结果中尚未转换的用户会被跳过 以免收集时转换全部用户
+        """
+
+        self.__add_user(obj)
+        if (user := _peek_user(obj)) is not None:
+            self.__add_user(user)
+        for item in getattr(obj, "objs", ()):
+            if (user := _peek_user(item)) is not None:
+                self.__add_user(user)
+
+    def __add_user(self, user: Any) -> None:
+        user_id = getattr(user, "user_id", 0)
+        portrait = getattr(user, "portrait", "")
+        if user_id > 0 and portrait:
+            self.add(user_id, portrait, getattr(user, "user_name", ""))
+
+    def __remove(self, user_id: int) -> None:
+        portrait, user_name, _ = self._entries.pop(user_id)
+        if self._portraits.get(portrait) == user_id:
+            del self._portraits[portrait]
+        if user_name and self._names.get(user_name) == user_id:
+            del self._names[user_name]
+
+    def clear(self) -> None:
+        """
+        清空缓存 不重置计数器
         """
 
-        if len(cls._fname2fid) == 128:
-            cls._fname2fid.popitem(last=False)
-            cls._fid2fname.popitem(last=False)
+        self._entries.clear()
+        self._portraits.clear()
+        self._names.clear()
 
-        cls._fname2fid[fname] = fid
-        cls._fid2fname[fid] = fname
+    def __len__(self) -> int:
+        return self._entries.__len__()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import contextvars
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..core.metrics import MetricsRegistry
+    from ..core.ratelimit import RateLimiter
+
+
+class CallContext:
+    """
+    一次Client接口调用的上下文
+    用于在装饰器与网络层之间传递调用期间产生的信息
+
+    Attributes:
+        name (str): 接口名
+        endpoints (list[tuple[RateLimiter, str]]): 本次调用经过的限流器与限流键
+        metrics (MetricsRegistry | None): 本次调用所用网络核心的统计注册表 未产生网络请求时为None
+        transport (str): 最近一次网络请求的传输方式 http / ws / blcp
+        request_bytes (int): 累计请求字节数
+        response_bytes (int): 累计响应字节数
+        parse_time (float): 累计解析耗时 以秒为单位
+        trace_id (int): 追踪记录的关联id 在产生第一条追踪记录时分配 此前为0
+    """
+
+    __slots__ = [
+        "name",
+        "endpoints",
+        "metrics",
+        "transport",
+        "request_bytes",
+        "response_bytes",
+        "parse_time",
+        "trace_id",
+    ]
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.endpoints: list[tuple[RateLimiter, str]] = []
+        self.metrics: MetricsRegistry | None = None
+        self.transport = ""
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.parse_time = 0.0
+        self.trace_id = 0
+
+
+CALL_CONTEXT: contextvars.ContextVar[CallContext | None] = contextvars.ContextVar("aiotieba_call_context", default=None)
+
+
+def get_call_context() -> CallContext | None:
+    """
+    获取当前接口调用的上下文
+
+    Returns:
+        CallContext | None: 不在接口调用中时返回None
+    """
+
+    return CALL_CONTEXT.get()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Hashable
+
+
+class SingleFlight:
+    """
+    合并并发的相同请求
+
+    同一时刻对同一个键的多次调用只会执行一次 所有调用方共享其结果或异常
+    """
+
+    __slots__ = ["_flights"]
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, coro_func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        执行或加入一次调用
+
+        Args:
+            key (Hashable): 调用键 键相同的并发调用会被合并
+            coro_func (Callable[[], Awaitable[Any]]): 无参协程函数 仅在当前没有相同调用时被执行
+
+        Returns:
+            Any: coro_func的返回值
+        """
+
+        task = self._flights.get(key, None)
+        if task is None:
+            task = asyncio.ensure_future(coro_func())
+            self._flights[key] = task
+            task.add_done_callback(lambda t: self.__on_done(key, t))
+
+        # 单个调用方被取消时不影响其他调用方
+        return await asyncio.shield(task)
+
+    def __on_done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._flights.get(key, None) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            # 所有调用方都已被取消时避免告警
+            task.exception()
+
+    def __len__(self) -> int:
+        return self._flights.__len__()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import TYPE_CHECKING, Callable, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Iterable
+
+TypePage = TypeVar("TypePage")
+
+
+async def iter_pages(
+    fetch: Callable[[int], Awaitable[TypePage]],
+    pn: int,
+    prefetch: int,
+    has_more: Callable[[TypePage], bool],
+) -> AsyncIterator[TypePage]:
+    """
+    按页码顺序迭代分页接口 并在调用方处理当前页时预取后继页
+
+    Args:
+        fetch (Callable[[int], Awaitable[TypePage]]): 以页码为参数的请求函数 失败时返回的页应带有err
+        pn (int): 起始页码
+        prefetch (int): 预取的页数 为0则不预取
+        has_more (Callable[[TypePage], bool]): 判断是否还有后继页
+
+    Yields:
+        TypePage: 按页码顺序返回的页 请求失败的页会被返回 随后迭代终止
+
+    Note:
+        迭代终止或被提前中断时 所有未完成的预取请求都会被取消
+    """
+
+    loop = asyncio.get_running_loop()
+    tasks: deque[asyncio.Task] = deque()
+    next_pn = pn
+
+    def schedule() -> None:
+        nonlocal next_pn
+        tasks.append(loop.create_task(fetch(next_pn)))
+        next_pn += 1
+
+    try:
+        schedule()
+        while tasks:
+            page = await tasks.popleft()
+
+            if page.err is not None or not has_more(page):
+                yield page
+                break
+
+            while len(tasks) < prefetch:
+                schedule()
+
+            yield page
+
+            if not tasks:
+                schedule()
+
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def fan_out_pages(
+    fetch: Callable[[int], Awaitable[TypePage]],
+    pns: Iterable[int],
+    concurrency: int,
+) -> AsyncIterator[TypePage]:
+    """
+    并发请求多个页 并按页码顺序返回
+
+    Args:
+        fetch (Callable[[int], Awaitable[TypePage]]): 以页码为参数的请求函数
+        pns (Iterable[int]): 待请求的页码
+        concurrency (int): 同时进行中的请求数上限
+
+    Yields:
+        TypePage: 按pns顺序返回的页 请求失败的页也会被返回
+
+    Note:
+        已完成但尚未被返回的页不会超过concurrency个\n
+        迭代被提前中断时 所有未完成的请求都会被取消
+    """
+
+    loop = asyncio.get_running_loop()
+    tasks: deque[asyncio.Task] = deque()
+    pn_iter = iter(pns)
+
+    try:
+        for pn in pn_iter:
+            tasks.append(loop.create_task(fetch(pn)))
+            if len(tasks) >= concurrency:
+                break
+
+        while tasks:
+            page = await tasks.popleft()
+            if (pn := next(pn_iter, None)) is not None:
+                tasks.append(loop.create_task(fetch(pn)))
+            yield page
+
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -4,10 +4,13 @@ import asyncio
 import functools
 import logging
 import sys
+import time
 from datetime import datetime
 from typing import Any, Callable
 
+from ..exception import TiebaServerError
 from ..logging import get_logger
+from .context import CALL_CONTEXT, CallContext
 
 if sys.version_info >= (3, 11):
     async_timeout = asyncio
@@ -81,15 +84,29 @@ def handle_exception(
                     record = logger.makeRecord(logger.name, log_level, None, 0, log_str, None, None, func.__name__)
                     logger.handle(record)
 
+            context = CallContext(func.__name__)
+            token = CALL_CONTEXT.set(context)
+            start = time.perf_counter()
+
             try:
                 ret = await func(self, *args, **kwargs)
 
                 if ok_log_level:
                     _log(ok_log_level)
 
+                if context.metrics is not None:
+                    context.metrics.observe(context, time.perf_counter() - start)
+
             except Exception as err:
                 _log(err_log_level, err)
 
+                if context.metrics is not None:
+                    context.metrics.observe(context, time.perf_counter() - start, err)
+
+                if isinstance(err, TiebaServerError):
+                    for limiter, key in context.endpoints:
+                        limiter.feedback(key, err.code)
+
                 ret = null_factory()
                 ret.err = err
 
@@ -98,6 +115,9 @@ def handle_exception(
             else:
                 return ret
 
+            finally:
+                CALL_CONTEXT.reset(token)
+
         return awrapper
 
     return wrapper
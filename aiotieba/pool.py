@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import socket
+from typing import TYPE_CHECKING, Callable
+
+import aiohttp
+
+from .client import Client
+from .config import (
+    CacheConfig,
+    ForumCacheConfig,
+    LimitConfig,
+    ParseConfig,
+    ProxyConfig,
+    RateLimitConfig,
+    RetryConfig,
+    TimeoutConfig,
+    UserCacheConfig,
+)
+from .core import Account
+from .core.metrics import MetricsRegistry
+from .core.resolver import HostOverrideResolver
+from .enums import PoolStrategy
+from .helper.cache import ForumInfoCache, UserIdentityCache
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+
+    from .core.replay import TrafficRecorder, TrafficReplayer
+    from .core.trace import Tracer
+
+
+class ClientPool:
+    """
+    共享同一连接器的多账号客户端池
+
+    Args:
+        accounts (Iterable[Account]): 账号列表
+        strategy (PoolStrategy, optional): 未指定账号时选取客户端的策略. Defaults to PoolStrategy.ROUND_ROBIN.
+        try_ws (bool, optional): 尝试使用websocket接口. Defaults to False.
+        proxy (bool | ProxyConfig, optional): True则使用环境变量代理 False则禁用代理 输入ProxyConfig实例以手动配置代理. Defaults to False.
+        timeout (TimeoutConfig, optional): 超时配置. Defaults to None.
+        cache (bool | CacheConfig, optional): 各客户端的响应缓存配置. Defaults to False.
+        limit (LimitConfig, optional): 连接池与并发配置 连接数上限作用于整个池 并发上限作用于单个客户端. Defaults to None.
+        rate_limit (RateLimitConfig, optional): 各客户端按端点限流的配置. Defaults to None.
+        retry (bool | RetryConfig, optional): 各客户端的重试配置. Defaults to False.
+        parse (ParseConfig, optional): 各客户端的响应解析配置 其中的executor由所有客户端共享. Defaults to None.
+        metrics (bool | MetricsRegistry, optional): 所有客户端共享的调用统计 False则不统计. Defaults to False.
+        tracer (Tracer, optional): 所有客户端共享的分阶段追踪器. Defaults to None.
+        tape (TrafficRecorder | TrafficReplayer, optional): 所有客户端共享的流量录制器或回放器. Defaults to None.
+        user_cache (bool | UserCacheConfig | UserIdentityCache, optional): 所有客户端共享的用户身份缓存 False则禁用缓存. Defaults to False.
+        forum_cache (ForumInfoCache | ForumCacheConfig, optional): 所有客户端共享的吧名与fid映射缓存 为None则使用进程内共享的默认缓存. Defaults to None.
+        hosts (Mapping[str, str], optional): 域名到本地地址的映射 详见HostOverrideResolver. Defaults to None.
+
+    Note:
+        所有客户端共享一个TCPConnector 因此DNS缓存与空闲长连接在账号间复用\n
+        每个账号仍持有独立的限流器 websocket会话与响应缓存
+    """
+
+    __slots__ = [
+        "_accounts",
+        "_strategy",
+        "_try_ws",
+        "_proxy",
+        "_timeout",
+        "_cache",
+        "_limit",
+        "_rate_limit",
+        "_retry",
+        "_parse",
+        "_metrics",
+        "_tracer",
+        "_tape",
+        "_user_cache",
+        "_forum_cache",
+        "_hosts",
+        "_connector",
+        "_clients",
+        "_index",
+        "_cursor",
+    ]
+
+    def __init__(
+        self,
+        accounts: Iterable[Account],
+        *,
+        strategy: PoolStrategy = PoolStrategy.ROUND_ROBIN,
+        try_ws: bool = False,
+        proxy: bool | ProxyConfig = False,
+        timeout: TimeoutConfig | None = None,
+        cache: bool | CacheConfig = False,
+        limit: LimitConfig | None = None,
+        rate_limit: RateLimitConfig | None = None,
+        retry: bool | RetryConfig = False,
+        parse: ParseConfig | None = None,
+        metrics: bool | MetricsRegistry = False,
+        tracer: Tracer | None = None,
+        tape: TrafficRecorder | TrafficReplayer | None = None,
+        user_cache: bool | UserCacheConfig | UserIdentityCache = False,
+        forum_cache: ForumInfoCache | ForumCacheConfig | None = None,
+        hosts: Mapping[str, str] | None = None,
+    ) -> None:
+        self._accounts = list(dict.fromkeys(accounts))
+        self._strategy = strategy
+        self._try_ws = try_ws
+        self._proxy = proxy
+
+        if not isinstance(timeout, TimeoutConfig):
+            timeout = TimeoutConfig()
+        self._timeout = timeout
+
+        if not isinstance(limit, LimitConfig):
+            limit = LimitConfig()
+        self._limit = limit
+
+        self._cache = cache
+        self._rate_limit = rate_limit
+        self._retry = retry
+        self._parse = parse
+
+        if metrics is True:
+            metrics = MetricsRegistry()
+        self._metrics = metrics or None
+        self._tracer = tracer
+        self._tape = tape
+
+        if user_cache is True:
+            user_cache = UserCacheConfig()
+        if isinstance(user_cache, UserCacheConfig):
+            user_cache = UserIdentityCache(user_cache)
+        self._user_cache = user_cache
+
+        if isinstance(forum_cache, ForumCacheConfig):
+            forum_cache = ForumInfoCache(forum_cache)
+        self._forum_cache = forum_cache
+        self._hosts = hosts
+
+        self._connector = None
+        self._clients: list[Client] = []
+        self._index: dict[str, Client] = {}
+        self._cursor = 0
+
+    async def __aenter__(self) -> ClientPool:
+        self._connector = aiohttp.TCPConnector(
+            ttl_dns_cache=self._timeout.dns_ttl,
+            family=socket.AF_INET,
+            keepalive_timeout=self._timeout.http_keepalive,
+            limit=self._limit.conn_limit,
+            limit_per_host=self._limit.conn_limit_per_host,
+            resolver=HostOverrideResolver(self._hosts) if self._hosts else None,
+            ssl=False,
+        )
+
+        try:
+            for account in self._accounts:
+                await self.__add_client(account)
+        except BaseException:
+            await self.__aexit__()
+            raise
+
+        return self
+
+    async def __aexit__(self, exc_type=None, exc_val=None, exc_tb=None) -> None:
+        clients = self._clients
+        self._clients = []
+        self._index.clear()
+        for client in clients:
+            await client.__aexit__()
+        await self._connector.close()
+
+    async def __add_client(self, account: Account) -> Client:
+        client = Client(
+            account=account,
+            try_ws=self._try_ws,
+            proxy=self._proxy,
+            timeout=self._timeout,
+            cache=self._cache,
+            limit=self._limit,
+            rate_limit=self._rate_limit,
+            retry=self._retry,
+            parse=self._parse,
+            metrics=self._metrics,
+            tracer=self._tracer,
+            tape=self._tape,
+            user_cache=self._user_cache,
+            forum_cache=self._forum_cache,
+            connector=self._connector,
+        )
+        await client.__aenter__()
+        self._clients.append(client)
+        self._index[account.BDUSS] = client
+        return client
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __iter__(self) -> Iterator[Client]:
+        return iter(self._clients)
+
+    @property
+    def connector(self) -> aiohttp.TCPConnector:
+        """
+        共享的连接器
+        """
+
+        return self._connector
+
+    @property
+    def metrics(self) -> MetricsRegistry | None:
+        """
+        所有客户端共享的调用统计 未启用统计时为None
+        """
+
+        return self._metrics
+
+    async def add(self, account: Account) -> Client:
+        """
+        向已打开的池中添加账号
+
+        Args:
+            account (Account): 账号
+
+        Returns:
+            Client: 该账号对应的客户端 账号已存在时返回现有的客户端
+        """
+
+        if (client := self._index.get(account.BDUSS)) is not None:
+            return client
+        self._accounts.append(account)
+        return await self.__add_client(account)
+
+    async def remove(self, account: Account) -> None:
+        """
+        从池中移除账号并关闭其客户端
+
+        Args:
+            account (Account): 账号
+        """
+
+        if (client := self._index.pop(account.BDUSS, None)) is None:
+            return
+        self._clients.remove(client)
+        self._accounts.remove(account)
+        await client.__aexit__()
+
+    def get(
+        self,
+        account: Account | str | None = None,
+        *,
+        predicate: Callable[[Client], bool] | None = None,
+    ) -> Client:
+        """
+        选取一个客户端
+
+        Args:
+            account (Account | str, optional): 指定的账号或其BDUSS 为None则按策略选取任意账号. Defaults to None.
+            predicate (Callable[[Client], bool], optional): 未指定账号时 仅在满足该条件的客户端中选取. Defaults to None.
+
+        Returns:
+            Client: 客户端
+
+        Raises:
+            KeyError: 指定的账号不在池中
+            LookupError: 没有可选的客户端
+        """
+
+        if account is not None:
+            if isinstance(account, Account):
+                account = account.BDUSS
+            return self._index[account]
+
+        clients = self._clients
+        if predicate is not None:
+            clients = [client for client in clients if predicate(client)]
+        if not clients:
+            raise LookupError("no client available in pool")
+
+        if self._strategy == PoolStrategy.LEAST_LOADED:
+            return min(clients, key=_load_of)
+
+        self._cursor += 1
+        return clients[self._cursor % len(clients)]
+
+
+def _load_of(client: Client) -> int:
+    stats = client.pool_stats
+    return stats.inflight + stats.waiting
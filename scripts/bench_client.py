@@ -0,0 +1,102 @@
+"""
+在本地的替身服务器上测量Client的端到端吞吐量
+
+用法: python scripts/bench_client.py [--accounts 账号数] [--concurrency 并发数] [--duration 秒] [--ws] [--retry]
+      [--max-inflight 上限] [--latency 秒] [--jitter 秒] [--error-rate 比例] [--rps 每秒请求数]
+
+在同一进程中启动standin_server.py中的替身服务器 并通过hosts参数将ClientPool指向它
+按get_threads / get_posts / get_comments 各占1/3的比例持续发起请求 报告吞吐量 延迟分位数与错误分布
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+from typing import TYPE_CHECKING
+
+from standin_server import StandinConfig, StandinServer
+
+import aiotieba as tb
+from aiotieba.core.metrics import MetricsRegistry
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+async def worker(pool: tb.ClientPool, deadline: float, counter: Iterator[int], latencies: list[float]) -> None:
+    # 参数各不相同 以免被SingleFlight合并
+    calls = [
+        lambda client, i: client.get_threads("forum", pn=i),
+        lambda client, i: client.get_posts(i),
+        lambda client, i: client.get_comments(1, i),
+    ]
+
+    while (start := time.perf_counter()) < deadline:
+        i = next(counter)
+        await calls[i % len(calls)](pool.get(), i)
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(args: argparse.Namespace) -> None:
+    accounts = [tb.Account(f"{i:0>192}") for i in range(args.accounts)]
+    config = StandinConfig(args.latency, args.jitter, args.error_rate, args.rps)
+    server = StandinServer(config, accounts)
+    await server.start()
+
+    metrics = MetricsRegistry()
+    try:
+        async with tb.ClientPool(
+            accounts,
+            try_ws=args.ws,
+            limit=tb.config.LimitConfig(max_inflight=args.max_inflight),
+            retry=args.retry,
+            metrics=metrics,
+            hosts=server.hosts,
+        ) as pool:
+            if args.ws:
+                for client in pool:
+                    if err := (await client.init_websocket()).err:
+                        raise err
+
+            counter = itertools.count(1)
+            latencies = []
+            start = time.perf_counter()
+            deadline = start + args.duration
+            await asyncio.gather(*[worker(pool, deadline, counter, latencies) for _ in range(args.concurrency)])
+            elapsed = time.perf_counter() - start
+    finally:
+        await server.close()
+
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"calls: {len(latencies)} in {elapsed:.1f} s -> {len(latencies) / elapsed:.0f} calls/s")
+    print(f"latency: p50 {quantiles[49] * 1000:.1f} ms  p99 {quantiles[98] * 1000:.1f} ms")
+    print(f"server: {server.stats}")
+
+    for name, transports in metrics.to_dict().items():
+        for transport, stats in transports.items():
+            print(f"{name} ({transport}): {stats['calls']} calls  errors {stats['errors']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="benchmark Client throughput against the local stand-in server")
+    parser.add_argument("--accounts", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--ws", action="store_true", help="use the websocket endpoints")
+    parser.add_argument("--retry", action="store_true", help="retry failed read requests")
+    parser.add_argument("--max-inflight", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rps", type=float, default=0.0)
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
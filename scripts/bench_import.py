@@ -0,0 +1,60 @@
+"""
+测量导入aiotieba的耗时与内存占用
+
+用法: python scripts/bench_import.py [重复次数]
+
+每次测量都在新的解释器中以`python -X importtime`导入aiotieba 报告累计导入耗时的中位数
+并统计导入后已执行的模块数与进程的峰值RSS
+"""
+
+from __future__ import annotations
+
+import statistics
+import subprocess
+import sys
+
+_PROBE = """
+import sys
+import aiotieba
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+except ImportError:
+    rss = -1
+executed = [m for m, v in sys.modules.items() if type(v).__name__ != "_LazyModule"]
+print(len(executed), sum(m.endswith("_pb2") for m in executed), "bs4" in sys.modules, rss)
+"""
+
+
+def measure() -> tuple[int, int, int, bool, int]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE], capture_output=True, text=True, check=True
+    )
+
+    # importtime的输出格式为 import time: self [us] | cumulative | imported package
+    for line in proc.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if name.strip() == "aiotieba":
+            import_us = int(cumulative)
+            break
+
+    num_modules, num_pb2, has_bs4, rss = proc.stdout.split()
+    return import_us, int(num_modules), int(num_pb2), has_bs4 == "True", int(rss)
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    results = [measure() for _ in range(repeat)]
+    import_ms = statistics.median(r[0] for r in results) / 1000
+    _, num_modules, num_pb2, has_bs4, rss = results[-1]
+
+    print(f"import aiotieba: {import_ms:.1f} ms (median of {repeat})")
+    print(f"modules executed: {num_modules} ({num_pb2} *_pb2)")
+    print(f"bs4 imported: {has_bs4}")
+    if rss >= 0:
+        print(f"peak rss: {rss / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
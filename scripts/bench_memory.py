@@ -0,0 +1,90 @@
+"""
+测量解析后每个Post对象占用的内存
+
+用法: python scripts/bench_memory.py [页数]
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import tracemalloc
+
+from aiotieba.api.get_posts import parse_body
+from aiotieba.api.get_posts.protobuf import PbPageResIdl_pb2
+
+
+def make_body(pn: int) -> bytes:
+    """
+    构造一页包含30个楼层的合成响应 每个楼层带有文本 图片 @ 以及2条楼中楼
+    """
+
+    res_proto = PbPageResIdl_pb2.PbPageResIdl()
+    data_proto = res_proto.data
+    data_proto.forum.id = 1
+    data_proto.forum.name = "forum"
+    data_proto.thread.id = 1
+    data_proto.thread.author.id = 1
+    frag_proto = data_proto.thread.origin_thread_info.content.add()
+    frag_proto.type = 4
+
+    for i in range(30):
+        post_proto = data_proto.post_list.add()
+        post_proto.id = pn * 100 + i
+        post_proto.floor = i + 1
+        post_proto.author_id = i % 10 + 1
+        for text in ("hello world ", "some more text"):
+            frag_proto = post_proto.content.add()
+            frag_proto.type = 0
+            frag_proto.text = text
+        frag_proto = post_proto.content.add()
+        frag_proto.type = 3
+        frag_proto.cdn_src = "http://tiebapic.baidu.com/forum/pic/item/0123456789abcdef0123456789abcdef01234567.jpg"
+        frag_proto.bsize = "720,960"
+        frag_proto = post_proto.content.add()
+        frag_proto.type = 4
+        frag_proto.text = "@someone"
+        frag_proto.uid = 2
+
+        for j in range(2):
+            comment_proto = post_proto.sub_post_list.sub_post_list.add()
+            comment_proto.id = pn * 10000 + i * 10 + j
+            comment_proto.author_id = j + 1
+            frag_proto = comment_proto.content.add()
+            frag_proto.type = 0
+            frag_proto.text = "reply"
+
+    for i in range(10):
+        user_proto = data_proto.user_list.add()
+        user_proto.id = i + 1
+        user_proto.portrait = f"tb.1.{i:08x}.abcdefghijklmnopqrstuv"
+        user_proto.name = f"user{i}"
+
+    return res_proto.SerializeToString()
+
+
+def main(num_pages: int) -> None:
+    bodies = [make_body(pn) for pn in range(num_pages)]
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    pages = [parse_body(body) for body in bodies]
+    for posts in pages:
+        for post in posts:
+            _ = post.text
+            for comment in post.comments:
+                _ = comment.text
+
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    num_posts = sum(len(posts) for posts in pages)
+    print(f"posts: {num_posts}")
+    print(f"bytes per Post (incl. contents, fragments and comments): {(after - before) / num_posts:.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,472 @@
+"""
+测量各接口parse_body解析每页响应的吞吐量与内存分配
+
+用法: python scripts/bench_parse.py [--fixtures 目录] [--tape 路径] [--dump 目录] [--only 名称 ...] [--repeat 次数] [--save 路径] [--compare 路径]
+
+默认使用合成的响应体 其中的用户名 portrait与文本均为占位符 不含真实数据
+--fixtures 优先从该目录读取录制的响应体 文件名为`用例名.后缀` 如frs_page.bin bawu_postlogs.html
+--tape 从TrafficRecorder的录制文件中为每个用例选取其端点最大的响应体 优先级低于--fixtures
+--dump 将合成的响应体写入该目录 可作为录制响应体的模板
+--repeat 吞吐量取该次数独立测量的中位数 减少单次测量的波动
+--save 将结果保存为json
+--compare 与保存的结果比较 吞吐量下降或分配的内存块数增加超过--tolerance时返回非零退出码
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses as dcs
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+from aiotieba import ReqFields
+from aiotieba.api import (
+    get_bawu_postlogs,
+    get_bawu_userlogs,
+    get_comments,
+    get_posts,
+    get_recovers,
+    get_threads,
+)
+from aiotieba.api.get_comments.protobuf import PbFloorResIdl_pb2
+from aiotieba.api.get_posts.protobuf import PbPageResIdl_pb2
+from aiotieba.api.get_threads.protobuf import FrsPageResIdl_pb2
+from aiotieba.api.get_user_contents import get_posts as get_user_posts
+from aiotieba.api.get_user_contents.protobuf import UserPostResIdl_pb2
+from aiotieba.api.profile import get_homepage
+from aiotieba.api.profile.protobuf import ProfileResIdl_pb2
+from aiotieba.core.replay import iter_records
+
+_IMG_SRC = "http://tiebapic.baidu.com/forum/pic/item/0123456789abcdef0123456789abcdef01234567.jpg"
+
+
+def _portrait(i: int) -> str:
+    return f"tb.1.{i:08x}.abcdefghijklmnopqrstuv"
+
+
+def _add_frags(content_protos, with_img: bool = True) -> None:
+    for text in ("hello world ", "some more text"):
+        frag_proto = content_protos.add()
+        frag_proto.type = 0
+        frag_proto.text = text
+    frag_proto = content_protos.add()
+    frag_proto.type = 2
+    frag_proto.text = "image_emoticon1"
+    frag_proto.c = "呵呵"
+    if with_img:
+        frag_proto = content_protos.add()
+        frag_proto.type = 3
+        frag_proto.cdn_src = _IMG_SRC
+        frag_proto.bsize = "720,960"
+    frag_proto = content_protos.add()
+    frag_proto.type = 4
+    frag_proto.text = "@someone"
+    frag_proto.uid = 2
+
+
+def _fill_user(user_proto, i: int) -> None:
+    user_proto.id = i + 1
+    user_proto.portrait = _portrait(i)
+    user_proto.name = f"user{i}"
+    user_proto.name_show = f"nick{i}"
+    user_proto.gender = i % 3
+    user_proto.level_id = i % 18 + 1
+    user_proto.priv_sets.like = 1
+    user_proto.priv_sets.reply = 1
+
+
+def _add_users(user_protos) -> None:
+    for i in range(20):
+        _fill_user(user_protos.add(), i)
+
+
+def make_frs_page() -> bytes:
+    """
+    一页包含50个主题帖的FrsPage响应
+    """
+
+    res_proto = FrsPageResIdl_pb2.FrsPageResIdl()
+    data_proto = res_proto.data
+    data_proto.forum.id = 1
+    data_proto.forum.name = "forum"
+
+    for i in range(50):
+        thread_proto = data_proto.thread_list.add()
+        thread_proto.id = i + 1
+        thread_proto.first_post_id = i + 1000
+        thread_proto.author_id = i % 20 + 1
+        thread_proto.title = f"title{i}"
+        _add_frags(thread_proto.first_post_content)
+
+    _add_users(data_proto.user_list)
+
+    return res_proto.SerializeToString()
+
+
+def make_pb_page() -> bytes:
+    """
+    一页包含30个楼层的PbPage响应 每个楼层带有2条楼中楼
+    """
+
+    res_proto = PbPageResIdl_pb2.PbPageResIdl()
+    data_proto = res_proto.data
+    data_proto.forum.id = 1
+    data_proto.forum.name = "forum"
+    data_proto.thread.id = 1
+    data_proto.thread.author.id = 1
+    frag_proto = data_proto.thread.origin_thread_info.content.add()
+    frag_proto.type = 4
+
+    for i in range(30):
+        post_proto = data_proto.post_list.add()
+        post_proto.id = i + 100
+        post_proto.floor = i + 1
+        post_proto.author_id = i % 20 + 1
+        _add_frags(post_proto.content)
+
+        for j in range(2):
+            comment_proto = post_proto.sub_post_list.sub_post_list.add()
+            comment_proto.id = i * 10 + j
+            comment_proto.author_id = j + 1
+            _add_frags(comment_proto.content, with_img=False)
+
+    _add_users(data_proto.user_list)
+
+    return res_proto.SerializeToString()
+
+
+def make_pb_floor() -> bytes:
+    """
+    一页包含30条楼中楼的PbFloor响应
+    """
+
+    res_proto = PbFloorResIdl_pb2.PbFloorResIdl()
+    data_proto = res_proto.data
+    data_proto.forum.id = 1
+    data_proto.forum.name = "forum"
+    data_proto.thread.id = 1
+    data_proto.post.id = 100
+    data_proto.post.floor = 2
+    _fill_user(data_proto.post.author, 0)
+    _add_frags(data_proto.post.content)
+    data_proto.page.current_page = 1
+    data_proto.page.total_page = 2
+    data_proto.page.total_count = 60
+
+    for i in range(30):
+        comment_proto = data_proto.subpost_list.add()
+        comment_proto.id = i + 1000
+        _fill_user(comment_proto.author, i % 20)
+        _add_frags(comment_proto.content, with_img=False)
+
+    return res_proto.SerializeToString()
+
+
+def make_profile() -> bytes:
+    """
+    包含20个主题帖的个人主页响应
+    """
+
+    res_proto = ProfileResIdl_pb2.ProfileResIdl()
+    data_proto = res_proto.data
+    _fill_user(data_proto.user, 0)
+    data_proto.user.intro = "intro"
+
+    for i in range(20):
+        thread_proto = data_proto.post_list.add()
+        thread_proto.thread_id = i + 1
+        thread_proto.post_id = i + 1000
+        thread_proto.forum_id = 1
+        thread_proto.forum_name = "forum"
+        thread_proto.title = f"title{i}"
+        _add_frags(thread_proto.first_post_content, with_img=False)
+        media_proto = thread_proto.media.add()
+        media_proto.type = 3
+        media_proto.small_pic = _IMG_SRC
+        media_proto.big_pic = _IMG_SRC
+        media_proto.origin_pic = _IMG_SRC
+        media_proto.width = 720
+        media_proto.height = 960
+
+    return res_proto.SerializeToString()
+
+
+def make_user_posts() -> bytes:
+    """
+    包含20个主题帖下共60条回复的用户回复列表响应
+    """
+
+    res_proto = UserPostResIdl_pb2.UserPostResIdl()
+    data_proto = res_proto.data
+
+    for i in range(20):
+        post_list_proto = data_proto.post_list.add()
+        post_list_proto.forum_id = 1
+        post_list_proto.thread_id = i + 1
+        post_list_proto.user_id = 1
+        post_list_proto.user_portrait = _portrait(0)
+        post_list_proto.user_name = "user0"
+        post_list_proto.name_show = "nick0"
+        for j in range(3):
+            content_proto = post_list_proto.content.add()
+            content_proto.post_id = i * 10 + j
+            content_proto.create_time = 1700000000 + j
+            frag_proto = content_proto.post_content.add()
+            frag_proto.type = 0
+            frag_proto.text = "reply content"
+
+    return res_proto.SerializeToString()
+
+
+def make_bawu_postlogs() -> bytes:
+    """
+    一页包含20条记录的吧务帖子管理日志页面
+    """
+
+    rows = []
+    for i in range(20):
+        tid = i + 1
+        rows.append(
+            "<tr>"
+            '<td><div class="post_meta">'
+            f'<div><a href="/home/main?id={_portrait(i)}&ie=utf-8&fr=home">user{i}</a></div>'
+            "<time>01-02  03:04</time>"
+            "</div>"
+            f'<div><h1><a href="/p/{tid}?pid={tid}#{tid}" title="title{i}">title{i}</a></h1>'
+            "<div>            content of the post</div>"
+            f'<ul><li><a href="{_IMG_SRC}"><img original="{_IMG_SRC}"></a></li></ul>'
+            "</div></td>"
+            "<td>删贴</td><td>operator</td><td>2024-01-0203:04</td>"
+            "</tr>"
+        )
+
+    return _make_log_page(rows)
+
+
+def make_bawu_userlogs() -> bytes:
+    """
+    一页包含20条记录的吧务用户管理日志页面
+    """
+
+    rows = [
+        "<tr>"
+        f'<td><a href="/home/main?id={_portrait(i)}&ie=utf-8&fr=home">user{i}</a></td>'
+        "<td></td><td>封禁</td><td>1 天</td><td>operator</td><td>2024-01-02 03:04</td>"
+        "</tr>"
+        for i in range(20)
+    ]
+
+    return _make_log_page(rows)
+
+
+def _make_log_page(rows: list[str]) -> bytes:
+    return (
+        "<html><body>"
+        '<div class="breadcrumbs"><em>200</em></div>'
+        f"<table><tbody>{''.join(rows)}</tbody></table>"
+        '<div class="tbui_pagination"><ul><li class="active">1</li></ul><span>(10)</span></div>'
+        "</body></html>"
+    ).encode()
+
+
+def make_recovers() -> bytes:
+    """
+    一页包含30条记录的待恢复帖子列表响应
+    """
+
+    thread_list = []
+    for i in range(30):
+        user = {"portrait": _portrait(i), "user_name": f"user{i}", "user_nickname": f"nick{i}"}
+        thread_list.append({
+            "thread_info": {"tid": str(i + 1), "abstract": "thread abstract", **user},
+            "post_info": {"pid": str(i + 1000), "abstract": "post abstract", **user} if i % 2 else [],
+            "is_foor": 0,
+            "is_frs_mask": "0",
+            "op_info": {"name": "operator", "time": "1700000000"},
+        })
+
+    res_json = {
+        "no": 0,
+        "error": "",
+        "data": {"thread_list": thread_list, "page": {"rn": 30, "pn": 1, "has_more": True}},
+    }
+    return json.dumps(res_json).encode()
+
+
+@dcs.dataclass
+class Case:
+    name: str
+    suffix: str
+    make_body: Callable[[], bytes]
+    parse: Callable[[bytes], Any]
+    # 录制文件中对应的http路径与websocket cmd
+    targets: tuple[str, ...] = ()
+
+
+FRS_PAGE = ("/c/f/frs/page", "301001")
+PB_PAGE = ("/c/f/pb/page", "302001")
+
+CASES = [
+    Case("frs_page", "bin", make_frs_page, get_threads.parse_body, FRS_PAGE),
+    Case(
+        "frs_page.fields0",
+        "bin",
+        make_frs_page,
+        lambda body: get_threads.parse_body(body, fields=ReqFields(0)),
+        FRS_PAGE,
+    ),
+    Case("pb_page", "bin", make_pb_page, get_posts.parse_body, PB_PAGE),
+    Case("pb_page.text", "bin", make_pb_page, lambda body: get_posts.parse_body(body, fields=ReqFields.TEXT), PB_PAGE),
+    Case("pb_floor", "bin", make_pb_floor, get_comments.parse_body, ("/c/f/pb/floor", "302002")),
+    Case("profile", "bin", make_profile, get_homepage.parse_body, ("/c/u/user/profile", "303012")),
+    Case("user_posts", "bin", make_user_posts, get_user_posts.parse_body, ("/c/u/feed/userpost", "303002")),
+    Case("bawu_postlogs", "html", make_bawu_postlogs, get_bawu_postlogs.parse_body, ("/bawu2/platform/listPostLog",)),
+    Case("bawu_userlogs", "html", make_bawu_userlogs, get_bawu_userlogs.parse_body, ("/bawu2/platform/listUserLog",)),
+    Case("recovers", "json", make_recovers, get_recovers.parse_body, ("/mo/q/manage/getRecoverList",)),
+]
+
+
+def load_tape(path: Path) -> dict[str, bytes]:
+    # 每个端点只保留最大的响应体
+    bodies = {}
+    for record in iter_records(path):
+        if len(record.response) > len(bodies.get(record.target, b"")):
+            bodies[record.target] = record.response
+    return bodies
+
+
+def load_body(case: Case, fixtures: Path | None, tape: dict[str, bytes]) -> tuple[bytes, str]:
+    if fixtures is not None:
+        # 变体用例与原用例共享响应体 如frs_page.fields0读取frs_page.bin
+        fpth = fixtures / f"{case.name.split('.')[0]}.{case.suffix}"
+        if fpth.exists():
+            return fpth.read_bytes(), "fixture"
+    if bodies := [tape[target] for target in case.targets if target in tape]:
+        return max(bodies, key=len), "tape"
+    return case.make_body(), "synthetic"
+
+
+def measure_time(parse: Callable[[bytes], Any], body: bytes, min_time: float = 0.5) -> float:
+    """
+    Returns:
+        float: 每秒解析的页数 取5轮中最快的一轮
+    """
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            parse(body)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 5:
+            break
+        number *= 2
+
+    best = elapsed
+    for _ in range(4):
+        start = time.perf_counter()
+        for _ in range(number):
+            parse(body)
+        best = min(best, time.perf_counter() - start)
+
+    return number / best
+
+
+def measure_alloc(parse: Callable[[bytes], Any], body: bytes) -> tuple[int, int, int]:
+    """
+    Returns:
+        tuple[int, int, int]: 解析期间的峰值字节数 解析结果保留的内存块数与字节数
+    """
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+
+        result = parse(body)
+
+        peak = tracemalloc.get_traced_memory()[1] - base
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    diffs = after.compare_to(before, "filename")
+    retained_blocks = sum(diff.count_diff for diff in diffs)
+    retained_bytes = sum(diff.size_diff for diff in diffs)
+    del result
+
+    return peak, retained_blocks, retained_bytes
+
+
+def run(cases: list[Case], fixtures: Path | None, tape: dict[str, bytes], repeat: int = 5) -> dict[str, dict]:
+    results = {}
+
+    print(f"{'case':<18} {'source':<9} {'bytes':>8} {'pages/s':>9} {'peak KiB':>9} {'blocks':>7} {'KiB':>7}")
+    for case in cases:
+        body, source = load_body(case, fixtures, tape)
+        ops = statistics.median(measure_time(case.parse, body) for _ in range(repeat))
+        peak, blocks, size = measure_alloc(case.parse, body)
+        results[case.name] = {"ops": ops, "peak": peak, "blocks": blocks, "bytes": size}
+        print(
+            f"{case.name:<18} {source:<9} {len(body):>8} {ops:>9.0f} {peak / 1024:>9.1f} {blocks:>7} {size / 1024:>7.1f}"
+        )
+
+    return results
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        if (base := baseline.get(name)) is None:
+            continue
+        if result["ops"] < base["ops"] * (1 - tolerance):
+            regressions.append(f"{name}: {base['ops']:.0f} -> {result['ops']:.0f} pages/s")
+        if result["blocks"] > base["blocks"] * (1 + tolerance):
+            regressions.append(f"{name}: {base['blocks']} -> {result['blocks']} retained blocks")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="benchmark parse_body of aiotieba endpoints")
+    parser.add_argument("--fixtures", type=Path, help="directory of recorded response bodies")
+    parser.add_argument("--tape", type=Path, help="recording made by TrafficRecorder to take response bodies from")
+    parser.add_argument("--dump", type=Path, help="write synthetic response bodies to this directory and exit")
+    parser.add_argument("--only", nargs="+", help="run only these cases")
+    parser.add_argument("--repeat", type=int, default=5, help="median throughput over this many runs. Defaults to 5")
+    parser.add_argument("--save", type=Path, help="save results as json")
+    parser.add_argument("--compare", type=Path, help="compare with results saved by --save")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression. Defaults to 0.2")
+    args = parser.parse_args()
+
+    cases = [case for case in CASES if args.only is None or case.name in args.only]
+
+    if args.dump is not None:
+        args.dump.mkdir(parents=True, exist_ok=True)
+        for case in cases:
+            if "." not in case.name:
+                (args.dump / f"{case.name}.{case.suffix}").write_bytes(case.make_body())
+        return
+
+    tape = load_tape(args.tape) if args.tape is not None else {}
+    results = run(cases, args.fixtures, tape, args.repeat)
+
+    if args.save is not None:
+        args.save.write_text(json.dumps(results, indent=2))
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())
+        if regressions := compare(results, baseline, args.tolerance):
+            print("\n".join(["regressions:", *regressions]), file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
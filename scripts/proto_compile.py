@@ -1,18 +1,34 @@
+"""
+编译aiotieba/api下的全部.proto
+
+用法: python scripts/proto_compile.py [--no-compile] [--descriptor-set 输出路径] [--audit]
+
+默认重新生成公共的aiotieba/api/_protobuf与各接口protobuf目录下的*_pb2.py
+--descriptor-set 将所有接口的schema合并为一个去重后的FileDescriptorSet 可供离线工具解码保存的响应体
+--audit 列出结构完全相同的消息类型 作为迁移到aiotieba/api/_protobuf以共享的候选
+"""
+
 from __future__ import annotations
 
+import argparse
 import subprocess
+import sys
+import tempfile
+from collections import defaultdict
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Iterable, Iterator
+
+    from google.protobuf import descriptor_pb2
 
 commom_proto_pth = Path("aiotieba/api/_protobuf")
 
-for fpth in commom_proto_pth.glob("*_pb2.py"):
-    fpth.unlink()
 
-subprocess.run("protoc --python_out=. *.proto", cwd=str(commom_proto_pth), check=True, timeout=60.0)
+def iter_mod_pths() -> Iterator[Path]:
+    yield from sorted(Path("aiotieba/api").glob("*/protobuf"))
+    yield from sorted(Path("aiotieba/api").glob("*/*/protobuf"))
 
 
 def row_filter(rows: list[str], import_perfix: str) -> Iterator[str]:
@@ -38,31 +54,130 @@ def row_filter(rows: list[str], import_perfix: str) -> Iterator[str]:
         yield row
 
 
-for fpth in commom_proto_pth.glob("*_pb2.py"):
-    bak_fpth = fpth.with_suffix(".bak")
-    with (
-        fpth.open("r") as f,
-        bak_fpth.open("w") as bak_f,
-    ):
-        bak_f.writelines(row_filter(f, "from . "))
-    fpth.unlink()
-    bak_fpth.rename(fpth)
-
-for mod_pth in Path("aiotieba/api").glob("*/protobuf"):
-    for fpth in mod_pth.glob("*_pb2.py"):
+def postprocess(pth: Path, import_perfix: str) -> None:
+    for fpth in pth.glob("*_pb2.py"):
+        bak_fpth = fpth.with_suffix(".bak")
+        with fpth.open("r") as f, bak_fpth.open("w") as bak_f:
+            bak_f.writelines(row_filter(f, import_perfix))
         fpth.unlink()
+        bak_fpth.rename(fpth)
 
-    subprocess.run("protoc -I../../_protobuf -I. --python_out=. *.proto", cwd=str(mod_pth), check=True, timeout=10.0)
 
-    for fpth in mod_pth.glob("*_pb2.py"):
-        bak_fpth = fpth.with_suffix(".bak")
-        with (
-            fpth.open("r") as f,
-            bak_fpth.open("w") as bak_f,
-        ):
-            bak_f.writelines(row_filter(f, "from ..._protobuf "))
+def compile_python() -> None:
+    for fpth in commom_proto_pth.glob("*_pb2.py"):
         fpth.unlink()
-        bak_fpth.rename(fpth)
 
-subprocess.run("uvx ruff check . --fix --unsafe-fixes", cwd=".", check=False, timeout=10.0)
-subprocess.run("uvx ruff format .", cwd=".", check=False, timeout=30.0)
+    subprocess.run("protoc --python_out=. *.proto", cwd=str(commom_proto_pth), check=True, timeout=60.0)
+    postprocess(commom_proto_pth, "from . ")
+
+    for mod_pth in iter_mod_pths():
+        for fpth in mod_pth.glob("*_pb2.py"):
+            fpth.unlink()
+
+        # 如aiotieba/api/get_threads/protobuf的depth为2
+        depth = len(mod_pth.relative_to(commom_proto_pth.parent).parts)
+        include = "/".join([".."] * depth) + "/_protobuf"
+        subprocess.run(f"protoc -I{include} -I. --python_out=. *.proto", cwd=str(mod_pth), check=True, timeout=10.0)
+        postprocess(mod_pth, "from " + "." * (depth + 1) + "_protobuf ")
+
+    subprocess.run("uvx ruff check . --fix --unsafe-fixes", cwd=".", check=False, timeout=10.0)
+    subprocess.run("uvx ruff format .", cwd=".", check=False, timeout=30.0)
+
+
+def build_descriptor_set() -> descriptor_pb2.FileDescriptorSet:
+    """
+    合并所有接口的schema 同名的.proto只保留一份
+
+    Returns:
+        FileDescriptorSet: 合并后的描述符集合
+    """
+
+    from google.protobuf import descriptor_pb2
+
+    merged = descriptor_pb2.FileDescriptorSet()
+    seen = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i, mod_pth in enumerate([commom_proto_pth, *iter_mod_pths()]):
+            out_pth = Path(tmp_dir) / f"{i}.pb"
+            subprocess.run(
+                [
+                    "protoc",
+                    "-I.",
+                    f"-I{commom_proto_pth.resolve()}",
+                    "--include_imports",
+                    f"--descriptor_set_out={out_pth}",
+                    *sorted(p.name for p in mod_pth.glob("*.proto")),
+                ],
+                cwd=str(mod_pth),
+                check=True,
+                timeout=10.0,
+            )
+
+            fds = descriptor_pb2.FileDescriptorSet()
+            fds.ParseFromString(out_pth.read_bytes())
+            for file_proto in fds.file:
+                if (prev := seen.get(file_proto.name)) is None:
+                    seen[file_proto.name] = file_proto
+                    merged.file.append(file_proto)
+                elif prev != file_proto:
+                    raise ValueError(f"conflicting definitions of {file_proto.name} in {mod_pth}")
+
+    return merged
+
+
+def audit(file_protos: Iterable) -> list[list[str]]:
+    """
+    找出字段完全相同的消息类型
+
+    Returns:
+        list[list[str]]: 每组结构相同的消息全名
+    """
+
+    groups = defaultdict(list)
+
+    def walk(prefix: str, msg_protos) -> None:
+        for msg_proto in msg_protos:
+            full_name = f"{prefix}.{msg_proto.name}" if prefix else msg_proto.name
+            # 引用的类型以全名比较 因此不同接口各自的DataRes不会被视为相同
+            fields = tuple(
+                (f.name, f.number, f.type, f.label, f.type_name)
+                for f in sorted(msg_proto.field, key=lambda f: f.number)
+            )
+            if fields:
+                groups[fields].append(full_name)
+            walk(full_name, msg_proto.nested_type)
+
+    for file_proto in file_protos:
+        walk(file_proto.package, file_proto.message_type)
+
+    return [names for names in groups.values() if len(names) > 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="compile aiotieba protobuf schemas")
+    parser.add_argument("--no-compile", action="store_true", help="do not regenerate *_pb2.py")
+    parser.add_argument("--descriptor-set", type=Path, help="write a merged FileDescriptorSet to this path")
+    parser.add_argument("--audit", action="store_true", help="list structurally identical message types")
+    args = parser.parse_args()
+
+    if not args.no_compile:
+        compile_python()
+
+    if args.descriptor_set is None and not args.audit:
+        return
+
+    merged = build_descriptor_set()
+
+    if args.descriptor_set is not None:
+        args.descriptor_set.write_bytes(merged.SerializeToString())
+        num_msgs = sum(len(f.message_type) for f in merged.file)
+        print(f"{len(merged.file)} files, {num_msgs} top-level messages -> {args.descriptor_set}", file=sys.stderr)
+
+    if args.audit:
+        for names in audit(merged.file):
+            print(" = ".join(names))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""
+本地的贴吧替身服务器 用于在不访问真实贴吧的情况下对Client做端到端的压测
+
+用法: python scripts/standin_server.py [--port 8080] [--tls-port 8443] [--latency 秒] [--jitter 秒] [--error-rate 比例] [--rps 每秒请求数]
+
+模拟的接口
+    app: /c/s/login /c/f/frs/page /c/f/pb/page /c/f/pb/floor 以及/c/c/bawu/下的写操作
+    web: /f/commit/share/fnameShareApi /mo/q/manage/getRecoverList
+    websocket: im.tieba.baidu.com:8000 支持cmd 1001 301001 302001 302002
+
+响应体复用bench_parse.py中合成的响应
+--latency与--jitter为每个请求附加延迟 --error-rate按比例返回503
+超过--rps的请求返回限流错误码 可用于观察RateLimiter的降速与RetryConfig的重试
+
+启动后会打印供Client(hosts=...)使用的映射
+https端口使用临时生成的自签名证书 Client不校验证书 因此可以直接连接
+websocket的AES密钥由客户端以贴吧的RSA公钥加密后发送 替身服务器无法解密
+因此只有在同一进程中通过StandinServer(accounts=...)登记了账号时才能模拟websocket接口
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import dataclasses as dcs
+import datetime as dt
+import json
+import random
+import ssl
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+from aiohttp import WSMsgType, web
+from bench_parse import make_frs_page, make_pb_floor, make_pb_page, make_recovers
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+from aiotieba.api._protobuf import ErrorRes_pb2
+from aiotieba.api.init_websocket.protobuf import UpdateClientInfoReqIdl_pb2, UpdateClientInfoResIdl_pb2
+from aiotieba.const import APP_BASE_HOST, WEB_BASE_HOST
+from aiotieba.core.websocket import pack_ws_bytes, parse_ws_bytes
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from aiotieba.core import Account
+
+WS_HOST = "im.tieba.baidu.com"
+WS_PORT = 8000
+
+_ERROR = "error"
+_THROTTLE = "throttle"
+
+
+@dcs.dataclass
+class StandinConfig:
+    """
+    替身服务器的行为配置
+
+    Args:
+        latency (float, optional): 每个请求附加的延迟 以秒为单位. Defaults to 0.0.
+        jitter (float, optional): 在latency基础上附加的0至jitter秒的随机延迟. Defaults to 0.0.
+        error_rate (float, optional): 返回错误的比例 http返回503 websocket返回错误码1. Defaults to 0.0.
+        rps (float, optional): 每秒请求数上限 超出的请求返回限流错误码 为0则不限流. Defaults to 0.0.
+        throttle_code (int, optional): 限流错误码. Defaults to 220034.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    rps: float = 0.0
+    throttle_code: int = 220034
+
+
+@dcs.dataclass
+class StandinStats:
+    """
+    替身服务器收到的请求统计
+    """
+
+    requests: int = 0
+    errors: int = 0
+    throttled: int = 0
+
+
+def _error_proto(code: int) -> bytes:
+    res_proto = ErrorRes_pb2.ErrorRes()
+    res_proto.error.errorno = code
+    res_proto.error.errmsg = "standin error"
+    return res_proto.SerializeToString()
+
+
+def _make_tls_context() -> ssl.SSLContext:
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "standin")])
+    now = dt.datetime.now(dt.timezone.utc)
+    cert = (
+        x509
+        .CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - dt.timedelta(days=1))
+        .not_valid_after(now + dt.timedelta(days=30))
+        .sign(key, hashes.SHA256())
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cert_pth = Path(tmp_dir) / "cert.pem"
+        key_pth = Path(tmp_dir) / "key.pem"
+        cert_pth.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+        key_pth.write_bytes(
+            key.private_bytes(
+                serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+            )
+        )
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(cert_pth, key_pth)
+
+    return context
+
+
+class StandinServer:
+    """
+    贴吧替身服务器
+
+    Args:
+        config (StandinConfig, optional): 行为配置. Defaults to None.
+        accounts (Iterable[Account], optional): 允许使用websocket接口的账号. Defaults to ().
+    """
+
+    def __init__(self, config: StandinConfig | None = None, accounts: Iterable[Account] = ()) -> None:
+        self.config = config or StandinConfig()
+        self.stats = StandinStats()
+        self._accounts = {account.BDUSS: account for account in accounts}
+
+        self._proto_bodies = {
+            "/c/f/frs/page": make_frs_page(),
+            "/c/f/pb/page": make_pb_page(),
+            "/c/f/pb/floor": make_pb_floor(),
+        }
+        self._ws_bodies = {
+            301001: self._proto_bodies["/c/f/frs/page"],
+            302001: self._proto_bodies["/c/f/pb/page"],
+            302002: self._proto_bodies["/c/f/pb/floor"],
+        }
+        self._recovers_body = make_recovers()
+
+        self._window_start = 0.0
+        self._window_count = 0
+
+        self._runner: web.AppRunner | None = None
+        self._host = ""
+        self.port = 0
+        self.tls_port = 0
+
+    def add_account(self, account: Account) -> None:
+        self._accounts[account.BDUSS] = account
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/", self._handle_ws)
+        app.router.add_post("/c/s/login", self._handle_login)
+        for path in self._proto_bodies:
+            app.router.add_post(path, self._handle_proto)
+        app.router.add_post("/c/c/bawu/{name}", self._handle_app_write)
+        app.router.add_get("/f/commit/share/fnameShareApi", self._handle_fid)
+        app.router.add_get("/mo/q/manage/getRecoverList", self._handle_recovers)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, tls_port: int = 0) -> None:
+        """
+        开始监听 端口为0时由系统分配
+        """
+
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+        tls_site = web.TCPSite(self._runner, host, tls_port, ssl_context=_make_tls_context())
+        await tls_site.start()
+        self.tls_port = tls_site._server.sockets[0].getsockname()[1]
+
+        self._host = host
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @property
+    def hosts(self) -> dict[str, str]:
+        """
+        供Client(hosts=...)使用的映射
+        """
+
+        http = f"{self._host}:{self.port}"
+        https = f"{self._host}:{self.tls_port}"
+        return {
+            f"{APP_BASE_HOST}:80": http,
+            f"{APP_BASE_HOST}:443": https,
+            f"{WEB_BASE_HOST}:80": http,
+            f"{WEB_BASE_HOST}:443": https,
+            f"{WS_HOST}:{WS_PORT}": http,
+        }
+
+    async def _gate(self) -> str | None:
+        config = self.config
+        self.stats.requests += 1
+
+        if config.rps:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            if now - self._window_start >= 1.0:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            if self._window_count > config.rps:
+                self.stats.throttled += 1
+                return _THROTTLE
+
+        if delay := config.latency + random.random() * config.jitter:
+            await asyncio.sleep(delay)
+
+        if config.error_rate and random.random() < config.error_rate:
+            self.stats.errors += 1
+            return _ERROR
+
+        return None
+
+    async def _respond(self, request: web.Request, make_throttled: Callable[[int], bytes], body: bytes) -> web.Response:
+        await request.read()
+        outcome = await self._gate()
+        if outcome == _ERROR:
+            return web.Response(status=503)
+        if outcome == _THROTTLE:
+            body = make_throttled(self.config.throttle_code)
+        return web.Response(body=body)
+
+    async def _handle_proto(self, request: web.Request) -> web.Response:
+        return await self._respond(request, _error_proto, self._proto_bodies[request.path])
+
+    async def _handle_login(self, request: web.Request) -> web.Response:
+        res_json = {
+            "error_code": "0",
+            "error_msg": "",
+            "user": {"id": "1", "portrait": "tb.1.00000000.abcdefghijklmnopqrstuv", "name": "user0"},
+            "anti": {"tbs": "0123456789abcdef01"},
+        }
+        return await self._respond(request, _app_json_error, json.dumps(res_json).encode())
+
+    async def _handle_app_write(self, request: web.Request) -> web.Response:
+        return await self._respond(request, _app_json_error, b'{"error_code":"0","error_msg":""}')
+
+    async def _handle_fid(self, request: web.Request) -> web.Response:
+        return await self._respond(request, _web_json_error, b'{"no":0,"error":"","data":{"fid":1}}')
+
+    async def _handle_recovers(self, request: web.Request) -> web.Response:
+        return await self._respond(request, _web_json_error, self._recovers_body)
+
+    async def _handle_ws(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        account = None
+        tasks = set()
+
+        async for msg in ws:
+            if msg.type != WSMsgType.BINARY:
+                continue
+
+            if account is None:
+                data, cmd, req_id = parse_ws_bytes(account, msg.data)
+                if cmd != 1001:
+                    break
+                req_proto = UpdateClientInfoReqIdl_pb2.UpdateClientInfoReqIdl()
+                req_proto.ParseFromString(data)
+                if (account := self._accounts.get(req_proto.data.bduss)) is None:
+                    break
+                body = UpdateClientInfoResIdl_pb2.UpdateClientInfoResIdl().SerializeToString()
+                await ws.send_bytes(pack_ws_bytes(account, body, cmd, req_id, encrypt=False))
+                continue
+
+            task = asyncio.create_task(self._reply_ws(ws, account, msg.data))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        await ws.close()
+        return ws
+
+    async def _reply_ws(self, ws: web.WebSocketResponse, account: Account, data: bytes) -> None:
+        _, cmd, req_id = parse_ws_bytes(account, data)
+
+        outcome = await self._gate()
+        if outcome == _ERROR:
+            body = _error_proto(1)
+        elif outcome == _THROTTLE:
+            body = _error_proto(self.config.throttle_code)
+        else:
+            body = self._ws_bodies.get(cmd) or _error_proto(1)
+
+        if not ws.closed:
+            await ws.send_bytes(pack_ws_bytes(account, body, cmd, req_id))
+
+
+def _app_json_error(code: int) -> bytes:
+    return json.dumps({"error_code": str(code), "error_msg": "standin error"}).encode()
+
+
+def _web_json_error(code: int) -> bytes:
+    return json.dumps({"no": code, "error": "standin error"}).encode()
+
+
+async def serve(args: argparse.Namespace) -> None:
+    config = StandinConfig(args.latency, args.jitter, args.error_rate, args.rps)
+    server = StandinServer(config)
+    await server.start(args.host, args.port, args.tls_port)
+    print(json.dumps(server.hosts, indent=2))
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="local stand-in for the Tieba endpoints")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--tls-port", type=int, default=8443)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay of up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with an error")
+    parser.add_argument("--rps", type=float, default=0.0, help="requests per second above which to throttle")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,40 @@
+from __future__ import annotations
+
 import os
+from typing import TYPE_CHECKING
 
+import pytest
 import pytest_asyncio
 
 import aiotieba as tb
+from aiotieba.api.get_threads.protobuf import FrsPageResIdl_pb2
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
 
 
 @pytest_asyncio.fixture(loop_scope="session")
 async def client():
     async with tb.Client(os.getenv("TB_BDUSS"), os.getenv("TB_STOKEN", ""), try_ws=True) as client:
         yield client
+
+
+@pytest.fixture
+def make_frs_page() -> Callable[..., FrsPageResIdl_pb2.FrsPageResIdl]:
+    """
+    构造get_threads响应的protobuf 各主题帖均由user_id为1的用户发布
+    """
+
+    def make(tids: Iterable[int] = (1,), errorno: int = 0, **user_fields) -> FrsPageResIdl_pb2.FrsPageResIdl:
+        res_proto = FrsPageResIdl_pb2.FrsPageResIdl()
+        res_proto.error.errorno = errorno
+        res_proto.error.errmsg = "error" if errorno else ""
+        data_proto = res_proto.data
+        data_proto.forum.id = 1
+        data_proto.forum.name = "forum"
+        for tid in tids:
+            data_proto.thread_list.add(id=tid, author_id=1, title=f"title{tid}")
+        data_proto.user_list.add(id=1, portrait="tb.1.abc", **user_fields)
+        return res_proto
+
+    return make
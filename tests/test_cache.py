@@ -0,0 +1,116 @@
+import dataclasses as dcs
+import time
+
+import pytest
+
+from aiotieba.config import CacheConfig, ForumCacheConfig, UserCacheConfig
+from aiotieba.helper.cache import ForumInfoCache, ResponseCache, UserIdentityCache
+
+
+def test_ResponseCache():
+    cache = ResponseCache(CacheConfig(maxsize=2, ttls={"get_threads": 10.0}))
+    assert cache.ttl_of("get_threads") == 10.0
+    assert cache.ttl_of("del_post") == 0.0
+
+    assert cache.get("a") is None
+    cache.set("a", 1, 10.0)
+    cache.set("b", 2, 10.0)
+    assert cache.get("a") == (1, False)
+
+    # "b" is the least recently used entry
+    cache.set("c", 3, 10.0)
+    assert cache.get("b") is None
+    assert len(cache) == 2
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+    cache.set("d", 4, -1.0)
+    assert cache.get("d") is None
+
+
+def test_ResponseCache_stale():
+    cache = ResponseCache(CacheConfig(stale_while_revalidate=True, stale_ttl=60.0))
+    cache.set("a", 1, -1.0)
+    assert cache.get("a") == (1, True)
+    assert cache.stale_hits == 1
+
+    cache.set("b", 2, -time.monotonic())
+    assert cache.get("b") is None
+
+
+def test_ForumInfoCache():
+    cache = ForumInfoCache(ForumCacheConfig(maxsize=2))
+    cache.add_forum("a", 1)
+    cache.add_forum("b", 2)
+    assert cache.get_fid("a") == 1
+
+    # "b" is the least recently used entry
+    cache.add_forum("c", 3)
+    assert cache.get_fname(2) == ""
+    assert cache.get_fid("b") == 0
+    assert cache.get_fname(1) == "a"
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+@pytest.mark.asyncio
+async def test_ForumInfoCache_db(tmp_path):
+    path = str(tmp_path / "forum.db")
+    cache = ForumInfoCache(ForumCacheConfig(maxsize=2, path=path))
+    cache.preload([("a", 1), ("b", 2), ("c", 3)])
+    assert len(cache) == 2
+    cache.add_forum("d", 4)
+    cache.add_forum("e", 5)
+    await cache.flush()
+
+    # 另一个实例相当于共享数据库文件的另一个进程
+    other = ForumInfoCache(ForumCacheConfig(maxsize=2, path=path))
+    assert other.get_fid("a") == 0
+    assert await other.fetch_fid("a") == 1
+    assert await other.fetch_fname(4) == "d"
+    assert await other.fetch_fid("x") == 0
+    assert (other.disk_hits, other.misses) == (2, 2)
+    other.add_forum("f", 6)
+    other.close()
+
+    cache.close()
+    cache = ForumInfoCache(ForumCacheConfig(maxsize=2, path=path))
+    assert await cache.fetch_fname(6) == "f"
+    cache.close()
+
+
+def test_UserIdentityCache():
+    @dcs.dataclass
+    class User:
+        user_id: int
+        portrait: str
+        user_name: str
+
+    @dcs.dataclass
+    class Item:
+        user: User
+
+    class Items:
+        def __init__(self, *users: User) -> None:
+            self.objs = [Item(user) for user in users]
+
+    cache = UserIdentityCache(UserCacheConfig(maxsize=2))
+    cache.add_from(Items(User(1, "tb.1.a", "a"), User(2, "tb.1.b", ""), User(0, "tb.1.c", "c")))
+    assert len(cache) == 2
+    assert cache.get(1) == (1, "tb.1.a", "a")
+    assert cache.get("tb.1.b") == (2, "tb.1.b", "")
+    assert cache.get("a") == (1, "tb.1.a", "a")
+    assert cache.get("c") is None
+
+    # 2 is the least recently used entry
+    cache.add_from(User(3, "tb.1.d", "d"))
+    assert cache.get("tb.1.b") is None
+
+    # user_name changed
+    cache.add(1, "tb.1.a", "e")
+    assert cache.get("a") is None
+    assert cache.get("e") == (1, "tb.1.a", "e")
+
+    cache = UserIdentityCache(UserCacheConfig(ttl=0.0))
+    cache.add(1, "tb.1.a", "a")
+    assert cache.get(1) is None
+    assert len(cache) == 0
@@ -0,0 +1,36 @@
+import pytest
+
+from aiotieba.api._classdef import GENDERS, PRIV_LIKES, FragDecoder
+from aiotieba.api._classdef.contents import FragAt, FragText
+from aiotieba.api._protobuf import PbContent_pb2
+from aiotieba.enums import Gender, PrivLike
+
+
+def test_enum_table():
+    assert GENDERS[2] is Gender.FEMALE
+    assert PRIV_LIKES[0] is PrivLike.PUBLIC
+    with pytest.raises(ValueError, match="is not a valid Gender"):
+        GENDERS[42]
+
+
+def test_frag_decoder():
+    decoder = FragDecoder(
+        [
+            ((0, 9), FragText.from_tbdata, ("texts",)),
+            ((4,), FragAt.from_tbdata, ("ats", "texts")),
+        ],
+        ignored=(34,),
+    )
+
+    content_protos = []
+    for type_, text in [(0, "a"), (4, "@b"), (34, ""), (9, "c")]:
+        content_proto = PbContent_pb2.PbContent()
+        content_proto.type = type_
+        content_proto.text = text
+        content_protos.append(content_proto)
+
+    objs, (texts, _, _, ats, *_) = decoder.decode(content_protos)
+
+    assert [frag.text for frag in objs] == ["a", "@b", "c"]
+    assert [frag.text for frag in texts] == ["a", "@b", "c"]
+    assert ats == [objs[1]]
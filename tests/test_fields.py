@@ -0,0 +1,104 @@
+from aiotieba import ReqFields
+from aiotieba.api import get_comments, get_posts, get_threads
+from aiotieba.api.get_comments.protobuf import PbFloorResIdl_pb2
+from aiotieba.api.get_posts.protobuf import PbPageResIdl_pb2
+
+
+def _add_frags(content_protos) -> None:
+    frag_proto = content_protos.add()
+    frag_proto.type = 0
+    frag_proto.text = "text"
+    frag_proto = content_protos.add()
+    frag_proto.type = 3
+    frag_proto.cdn_src = "http://tiebapic.baidu.com/forum/pic/item/0123456789abcdef0123456789abcdef01234567.jpg"
+    frag_proto.bsize = "720,960"
+
+
+def test_threads_fields(make_frs_page):
+    res_proto = make_frs_page()
+    data_proto = res_proto.data
+    data_proto.nav_tab_info.tab.add(tab_id=2, tab_name="tab")
+    thread_proto = data_proto.thread_list[0]
+    thread_proto.reply_num = 5
+    _add_frags(thread_proto.first_post_content)
+    body = res_proto.SerializeToString()
+
+    thread = get_threads.parse_body(body)[0]
+    assert thread.user.user_id == 1
+    assert len(thread.contents.imgs) == 1
+
+    threads = get_threads.parse_body(body, fields=ReqFields.TEXT)
+    thread = threads[0]
+    assert thread.tid == 1
+    assert thread.reply_num == 5
+    assert thread.fname == "forum"
+    assert thread.text == "title1\ntext"
+    assert not thread.contents.imgs
+    assert thread.author_id == 1
+    assert thread.user.user_id == 0
+    assert not threads.tab_map
+
+
+def test_posts_fields():
+    res_proto = PbPageResIdl_pb2.PbPageResIdl()
+    data_proto = res_proto.data
+    data_proto.thread.id = 1
+    data_proto.thread.author.id = 1
+    data_proto.thread.origin_thread_info.content.add(type=4)
+    post_proto = data_proto.post_list.add()
+    post_proto.id = 2
+    post_proto.author_id = 1
+    _add_frags(post_proto.content)
+    post_proto.signature.content.add(type=0, text="sign")
+    comment_proto = post_proto.sub_post_list.sub_post_list.add()
+    comment_proto.id = 3
+    comment_proto.author_id = 1
+    data_proto.user_list.add(id=1, portrait="tb.1.abc")
+    body = res_proto.SerializeToString()
+
+    post = get_posts.parse_body(body)[0]
+    assert post.sign == "sign"
+    assert len(post.comments) == 1
+
+    post = get_posts.parse_body(body, fields=ReqFields.CONTENTS | ReqFields.USER)[0]
+    assert post.pid == 2
+    assert post.is_thread_author
+    assert post.user.user_id == 1
+    assert post.text == "text"
+    assert not post.sign
+    assert not post.comments
+
+
+def test_comments_fields():
+    res_proto = PbFloorResIdl_pb2.PbFloorResIdl()
+    data_proto = res_proto.data
+    comment_proto = data_proto.subpost_list.add()
+    comment_proto.id = 3
+    comment_proto.author.id = 4
+    comment_proto.author.name = "commenter"
+    for type_, text, uid in [(0, "回复 ", 0), (4, "@someone", 5), (0, " :hello", 0)]:
+        comment_proto.content.add(type=type_, text=text, uid=uid)
+    data_proto.thread.author.id = 4
+    data_proto.thread.author.name = "thread_author"
+    data_proto.post.author.id = 6
+    data_proto.post.author.name = "post_author"
+    body = res_proto.SerializeToString()
+
+    comments = get_comments.parse_body(body, fields=ReqFields.USER)
+    comment = comments[0]
+    assert comment.author_id == 4
+    assert comment.user.user_name == "commenter"
+    assert comment.reply_to_id == 5
+    assert not comment.contents
+    assert comments.thread.user.user_name == "thread_author"
+
+    comments = get_comments.parse_body(body, fields=ReqFields(0))
+    comment = comments[0]
+    assert comment.user.user_name == ""
+    assert comment.author_id == 4
+    assert comment.is_thread_author
+    assert comment.reply_to_id == 5
+    assert comments.thread.user.user_name == ""
+    assert comments.thread.author_id == 4
+    assert comments.post.user.user_name == ""
+    assert comments.post.author_id == 6
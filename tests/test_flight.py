@@ -0,0 +1,30 @@
+import asyncio
+
+import pytest
+
+from aiotieba.helper.flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_SingleFlight():
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    rets = await asyncio.gather(*[flight.do("key", fetch) for _ in range(10)])
+    assert rets == [1] * 10
+    assert len(flight) == 0
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError
+
+    rets = await asyncio.gather(*[flight.do("key", fail) for _ in range(10)], return_exceptions=True)
+    assert all(isinstance(ret, ValueError) for ret in rets)
+
+    assert await flight.do("key", fetch) == 2
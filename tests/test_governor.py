@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+import aiotieba as tb
+from aiotieba.core.governor import ConcurrencyGovernor
+from aiotieba.enums import Priority
+
+
+@pytest.mark.asyncio
+async def test_ConcurrencyGovernor():
+    governor = ConcurrencyGovernor(1)
+    order = []
+
+    async def work(name: str, priority: Priority):
+        await governor.acquire(priority)
+        try:
+            order.append(name)
+            await asyncio.sleep(0.01)
+        finally:
+            governor.release()
+
+    first = asyncio.ensure_future(work("first", Priority.NORMAL))
+    await asyncio.sleep(0)
+    reads = [asyncio.ensure_future(work(f"read{i}", Priority.NORMAL)) for i in range(3)]
+    write = asyncio.ensure_future(work("write", Priority.HIGH))
+    await asyncio.sleep(0)
+    assert governor.waiting == 4
+
+    await asyncio.gather(first, write, *reads)
+    assert order == ["first", "write", "read0", "read1", "read2"]
+    assert governor.inflight == 0
+    assert governor.wait_count == 4
+
+
+@pytest.mark.asyncio
+async def test_pool_stats(monkeypatch):
+    async with tb.Client() as client:
+        stats = client.pool_stats
+        assert stats.conn_acquired == 0
+        assert stats.conn_limit == client._http_core.net_core.connector.limit
+
+        # aiohttp移除私有属性时退化为0
+        with monkeypatch.context() as m:
+            m.delattr(client._http_core.net_core.connector, "_acquired")
+            m.delattr(client._http_core.net_core.connector, "_conns")
+            stats = client.pool_stats
+        assert (stats.conn_acquired, stats.conn_idle) == (0, 0)
@@ -0,0 +1,62 @@
+import socket
+
+import pytest
+from aiohttp import test_utils, web
+
+import aiotieba as tb
+from aiotieba.const import APP_BASE_HOST
+from aiotieba.core.resolver import HostOverrideResolver
+
+
+@pytest.mark.asyncio
+async def test_resolver():
+    resolver = HostOverrideResolver({
+        "tiebac.baidu.com:443": "127.0.0.1:8443",
+        "tiebac.baidu.com": "127.0.0.2",
+        "tieba.baidu.com": "127.0.0.1:8080",
+        "c.tieba.baidu.com": "[::1]:8443",
+        "tb.baidu.com": "::1",
+    })
+
+    (result,) = await resolver.resolve("tiebac.baidu.com", 443)
+    assert (result["hostname"], result["host"], result["port"]) == ("tiebac.baidu.com", "127.0.0.1", 8443)
+    assert result["family"] == socket.AF_INET
+
+    (result,) = await resolver.resolve("tiebac.baidu.com", 80)
+    assert (result["host"], result["port"]) == ("127.0.0.2", 80)
+
+    (result,) = await resolver.resolve("tieba.baidu.com", 443)
+    assert (result["host"], result["port"]) == ("127.0.0.1", 8080)
+
+    (result,) = await resolver.resolve("c.tieba.baidu.com", 443)
+    assert (result["host"], result["port"]) == ("::1", 8443)
+    assert result["family"] == socket.AF_INET6
+
+    (result,) = await resolver.resolve("tb.baidu.com", 443)
+    assert (result["host"], result["port"]) == ("::1", 443)
+
+    results = await resolver.resolve("localhost", 80)
+    assert all(result["port"] == 80 for result in results)
+
+    await resolver.close()
+
+
+@pytest.mark.asyncio
+async def test_client_hosts(make_frs_page):
+    hosts = []
+
+    async def handler(request: web.Request) -> web.Response:
+        hosts.append(request.host)
+        return web.Response(body=make_frs_page().SerializeToString())
+
+    app = web.Application()
+    app.router.add_post("/c/f/frs/page", handler)
+
+    async with test_utils.TestServer(app, host="127.0.0.1") as server:
+        async with tb.Client(hosts={APP_BASE_HOST: f"127.0.0.1:{server.port}"}) as client:
+            threads = await client.get_threads("forum")
+            assert threads.err is None
+            assert threads[0].tid == 1
+
+    # Host头仍为原域名
+    assert hosts == [APP_BASE_HOST]
@@ -0,0 +1,22 @@
+import subprocess
+import sys
+
+_PROBE = """
+import sys
+import aiotieba
+
+module = sys.modules["aiotieba.api.get_posts"]
+assert type(module).__name__ == "_LazyModule"
+assert "aiotieba.api.get_posts._classdef" not in sys.modules
+assert "bs4" not in sys.modules
+
+from aiotieba.api import get_posts
+
+assert get_posts.Posts().objs == []
+assert "aiotieba.api.get_posts._classdef" in sys.modules
+assert aiotieba.typing.Posts is get_posts.Posts
+"""
+
+
+def test_lazy_api_import():
+    subprocess.run([sys.executable, "-c", _PROBE], check=True)
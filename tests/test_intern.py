@@ -0,0 +1,23 @@
+from aiotieba import disable_user_interning, enable_user_interning
+from aiotieba.api import get_threads
+
+
+def test_user_interning(make_frs_page):
+    def _make_body(level: int) -> bytes:
+        return make_frs_page(name="user", level_id=level).SerializeToString()
+
+    registry = enable_user_interning()
+    try:
+        threads = get_threads.parse_body(_make_body(3))
+        threads_again = get_threads.parse_body(_make_body(3))
+        threads_other = get_threads.parse_body(_make_body(4))
+    finally:
+        disable_user_interning()
+
+    assert threads[0].user is threads_again[0].user
+    assert threads[0].user is not threads_other[0].user
+    assert threads_other[0].user.level == 4
+    assert registry.saved >= 1
+
+    threads_plain = get_threads.parse_body(_make_body(3))
+    assert threads_plain[0].user is not threads[0].user
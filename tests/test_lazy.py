@@ -0,0 +1,74 @@
+import dataclasses as dcs
+
+import pytest
+from aiohttp import test_utils, web
+
+import aiotieba as tb
+from aiotieba.api import get_comments, get_threads
+from aiotieba.api.get_comments.protobuf import PbFloorResIdl_pb2
+from aiotieba.const import APP_BASE_HOST
+
+
+def test_lazy_threads(make_frs_page):
+    res_proto = make_frs_page(range(1, 4))
+    for i, thread_proto in enumerate(res_proto.data.thread_list):
+        thread_proto.first_post_id = i + 100
+        thread_proto.first_post_content.add(type=0, text=f"text{i}")
+    body = res_proto.SerializeToString()
+
+    threads = get_threads.parse_body(body)
+    lazy_threads = get_threads.parse_body(body, lazy=True)
+
+    assert "contents" not in vars(lazy_threads[0])
+    for thread, lazy_thread in zip(threads, lazy_threads):
+        assert isinstance(lazy_thread, get_threads.Thread)
+        assert lazy_thread.text == thread.text
+        assert dcs.asdict(lazy_thread) == dcs.asdict(thread)
+    assert lazy_threads[0].user is lazy_threads[1].user
+
+
+def test_lazy_comments():
+    res_proto = PbFloorResIdl_pb2.PbFloorResIdl()
+    data_proto = res_proto.data
+    data_proto.thread.id = 1
+    data_proto.post.id = 2
+    comment_proto = data_proto.subpost_list.add()
+    comment_proto.id = 3
+    comment_proto.author.id = 4
+    comment_proto.author.portrait = "tb.1.abc"
+    for type_, text, uid in [(0, "回复 ", 0), (4, "@someone", 5), (0, " :hello", 0)]:
+        frag_proto = comment_proto.content.add()
+        frag_proto.type = type_
+        frag_proto.text = text
+        frag_proto.uid = uid
+    body = res_proto.SerializeToString()
+
+    comment = get_comments.parse_body(body)[0]
+    lazy_comment = get_comments.parse_body(body, lazy=True)[0]
+
+    assert lazy_comment.author_id == 4
+    assert "user" not in vars(lazy_comment)
+    assert lazy_comment.reply_to_id == comment.reply_to_id == 5
+    assert lazy_comment.text == comment.text == "hello"
+    assert dcs.asdict(lazy_comment) == dcs.asdict(comment)
+
+
+@pytest.mark.asyncio
+async def test_lazy_user_cache(make_frs_page):
+    async def handler(request: web.Request) -> web.Response:
+        return web.Response(body=make_frs_page(range(1, 4)).SerializeToString())
+
+    app = web.Application()
+    app.router.add_post("/c/f/frs/page", handler)
+
+    async with test_utils.TestServer(app, host="127.0.0.1") as server:
+        hosts = {APP_BASE_HOST: f"127.0.0.1:{server.port}"}
+        async with tb.Client(user_cache=True, hosts=hosts) as client:
+            # 收集用户身份时不转换按需解析的用户
+            threads = await client.get_threads("forum", lazy=True)
+            assert threads.err is None
+            assert all("user" not in vars(thread) for thread in threads)
+            assert client._user_cache.get(1) is None
+
+            await client.get_threads("forum", pn=2)
+            assert client._user_cache.get(1) == (1, "tb.1.abc", "")
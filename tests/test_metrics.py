@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+import aiotieba as tb
+from aiotieba.api import get_threads
+from aiotieba.core.metrics import MetricsRegistry, record_io
+from aiotieba.exception import TiebaServerError
+from aiotieba.helper.context import CallContext
+
+
+def test_registry():
+    metrics = MetricsRegistry()
+
+    context = CallContext("get_threads")
+    context.transport = "http"
+    context.request_bytes = 100
+    context.response_bytes = 2000
+    metrics.observe(context, 0.03)
+    metrics.observe(context, 20.0, TiebaServerError(4, "error"))
+    metrics.observe(context, 0.001, ValueError())
+
+    stats = metrics.get("get_threads", "http")
+    assert stats.calls == 3
+    assert stats.errors == {"4": 1, "ValueError": 1}
+    assert stats.request_bytes == 300
+    assert metrics.get("get_threads", "ws") is None
+
+    buckets = metrics.to_dict()["get_threads"]["http"]["latency_buckets"]
+    assert buckets["0.005"] == 1
+    assert buckets["0.05"] == 2
+    assert buckets["10.0"] == 2
+    assert buckets["+Inf"] == 3
+
+    text = metrics.to_prometheus()
+    assert 'aiotieba_calls_total{api="get_threads",transport="http"} 3' in text
+    assert 'aiotieba_errors_total{api="get_threads",transport="http",code="4"} 1' in text
+    assert 'aiotieba_call_duration_seconds_bucket{api="get_threads",transport="http",le="+Inf"} 3' in text
+    assert 'aiotieba_response_bytes_total{api="get_threads",transport="http"} 6000' in text
+
+    metrics.reset()
+    assert metrics.to_dict() == {}
+
+
+@pytest.mark.asyncio
+async def test_client_metrics(monkeypatch, make_frs_page):
+    responses = [make_frs_page().SerializeToString(), make_frs_page(errorno=4).SerializeToString()]
+    bodies = list(responses)
+
+    async def request_body_http(http_core, *args):
+        body = bodies.pop(0)
+        record_io(http_core.net_core.metrics, "http", 10, len(body))
+        return body
+
+    monkeypatch.setattr(get_threads._api, "request_body_http", request_body_http)
+
+    async with tb.Client() as client:
+        assert client.metrics is None
+        await client.get_threads("forum")
+
+    bodies = list(responses)
+
+    async with tb.Client(metrics=True) as client:
+        await client.get_threads("forum")
+        await client.get_threads("forum", 2)
+
+        stats = client.metrics.get("get_threads", "http")
+        assert stats.calls == 2
+        assert stats.errors == {"4": 1}
+        assert stats.request_bytes == 20
+        assert stats.response_bytes == sum(map(len, responses))
+        assert stats.parse_time > 0
+        assert list(client.metrics.to_dict()) == ["get_threads"]
+
+
+@pytest.mark.asyncio
+async def test_client_metrics_coalesced(monkeypatch, make_frs_page):
+    body = make_frs_page().SerializeToString()
+
+    async def request_body_http(http_core, *args):
+        await asyncio.sleep(0.01)
+        record_io(http_core.net_core.metrics, "http", 10, len(body))
+        return body
+
+    monkeypatch.setattr(get_threads._api, "request_body_http", request_body_http)
+
+    async with tb.Client(metrics=True) as client:
+        results = await asyncio.gather(*[client.get_threads("forum") for _ in range(5)])
+        assert all(threads.err is None for threads in results)
+
+        # 合并的调用各自计入调用次数 收发字节数只计入一次
+        stats = client.metrics.get("get_threads", "http")
+        assert stats.calls == 5
+        assert stats.request_bytes == 10
+        assert stats.response_bytes == len(body)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses as dcs
+
+import pytest
+
+import aiotieba as tb
+from aiotieba.api import get_posts
+from aiotieba.api.get_posts.protobuf import PbPageResIdl_pb2
+from aiotieba.helper.paginate import fan_out_pages, iter_pages
+
+
+@dcs.dataclass
+class Page:
+    pn: int
+    has_more: bool
+    err: Exception | None = None
+
+
+@pytest.mark.asyncio
+async def test_iter_pages():
+    fetched = []
+
+    async def fetch(pn: int) -> Page:
+        fetched.append(pn)
+        await asyncio.sleep(0.01)
+        return Page(pn, pn < 5)
+
+    pages = [page.pn async for page in iter_pages(fetch, 1, 2, lambda page: page.has_more)]
+    assert pages == [1, 2, 3, 4, 5]
+
+    async def fail(pn: int) -> Page:
+        return Page(pn, True, ValueError() if pn == 3 else None)
+
+    pages = [page async for page in iter_pages(fail, 1, 0, lambda page: page.has_more)]
+    assert [page.pn for page in pages] == [1, 2, 3]
+    assert isinstance(pages[-1].err, ValueError)
+
+
+@pytest.mark.asyncio
+async def test_fan_out_pages():
+    inflight = 0
+    max_inflight = 0
+
+    async def fetch(pn: int) -> Page:
+        nonlocal inflight, max_inflight
+        inflight += 1
+        max_inflight = max(max_inflight, inflight)
+        await asyncio.sleep(0.01 * (10 - pn))
+        inflight -= 1
+        return Page(pn, True)
+
+    pages = [page.pn async for page in fan_out_pages(fetch, range(1, 10), 3)]
+    assert pages == list(range(1, 10))
+    assert max_inflight == 3
+
+
+@pytest.mark.asyncio
+async def test_iter_all_posts_keeps_cached_pages(monkeypatch):
+    fetched = []
+
+    async def request_body_http(http_core, tid, pn, *args):
+        fetched.append(pn)
+        res_proto = PbPageResIdl_pb2.PbPageResIdl()
+        res_proto.data.page.total_page = 2
+        res_proto.data.page.has_more = int(pn < 2)
+        res_proto.data.thread.origin_thread_info.content.add(type=4)
+        res_proto.data.user_list.add(id=1, portrait="tb.1.abc")
+        for pid in [[1, 2], [2, 3]][pn - 1]:
+            res_proto.data.post_list.add(id=pid, author_id=1)
+        return res_proto.SerializeToString()
+
+    monkeypatch.setattr(get_posts._api, "request_body_http", request_body_http)
+
+    async with tb.Client(cache=True) as client:
+        crawled = [[post.pid for post in posts] async for posts in client.iter_all_posts(1)]
+        assert crawled == [[1, 2], [3]]
+
+        # 缓存中的第2页未被去重修改
+        cached = await client.get_posts(1, 2)
+        assert [post.pid for post in cached] == [2, 3]
+        assert fetched == [1, 2]
@@ -0,0 +1,45 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+import aiotieba as tb
+from aiotieba.api import get_threads
+from aiotieba.config import ParseConfig
+
+
+def _thread_name(body: bytes) -> str:
+    return threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_parse_threshold(make_frs_page):
+    body = make_frs_page(range(1, 101)).SerializeToString()
+
+    with ThreadPoolExecutor(thread_name_prefix="parse") as executor:
+        async with tb.Client(parse=ParseConfig(executor, threshold=len(body))) as client:
+            net_core = client._http_core.net_core
+            assert (await net_core.parse(_thread_name, body)).startswith("parse")
+            assert await net_core.parse(_thread_name, body[:-1]) == threading.current_thread().name
+            assert await net_core.parse(_thread_name, body, inline=True) == threading.current_thread().name
+
+    async with tb.Client() as client:
+        net_core = client._http_core.net_core
+        assert await net_core.parse(_thread_name, body) == threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_parse_process_pool(make_frs_page):
+    body = make_frs_page(range(1, 101)).SerializeToString()
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        async with tb.Client(parse=ParseConfig(executor, threshold=0)) as client:
+            net_core = client._http_core.net_core
+
+            threads = await net_core.parse(get_threads.parse_body, body, False, tb.ReqFields.ALL)
+            assert len(threads) == 100
+            assert threads[99].title == "title100"
+            assert threads[0].user.portrait == "tb.1.abc"
+
+            with pytest.raises(tb.exception.TiebaServerError):
+                await net_core.parse(get_threads.parse_body, make_frs_page(errorno=4).SerializeToString())
@@ -0,0 +1,40 @@
+import pytest
+
+import aiotieba as tb
+
+
+def _bduss(i: int) -> str:
+    return str(i) * 192
+
+
+@pytest.mark.asyncio
+async def test_ClientPool():
+    accounts = [tb.Account(_bduss(i)) for i in range(3)]
+
+    async with tb.ClientPool(accounts) as pool:
+        assert len(pool) == 3
+        assert all(client._connector is pool.connector for client in pool)
+
+        picked = {pool.get().account.BDUSS for _ in range(3)}
+        assert picked == {account.BDUSS for account in accounts}
+
+        assert pool.get(accounts[1]).account == accounts[1]
+        assert pool.get(_bduss(2)).account == accounts[2]
+        assert pool.get(predicate=lambda client: client.account.BDUSS == _bduss(0)).account == accounts[0]
+
+        client = await pool.add(tb.Account(_bduss(3)))
+        assert len(pool) == 4
+        await pool.remove(client.account)
+        assert len(pool) == 3
+        assert not pool.connector.closed
+
+    assert pool.connector.closed
+
+
+@pytest.mark.asyncio
+async def test_ClientPool_least_loaded():
+    accounts = [tb.Account(_bduss(i)) for i in range(2)]
+
+    async with tb.ClientPool(accounts, strategy=tb.PoolStrategy.LEAST_LOADED) as pool:
+        pool.get(accounts[0])._http_core.net_core.governor.inflight += 1
+        assert pool.get().account == accounts[1]
@@ -0,0 +1,31 @@
+import asyncio
+import time
+
+import pytest
+
+from aiotieba.config import RateLimitConfig
+from aiotieba.core.ratelimit import RateLimiter
+
+
+@pytest.mark.asyncio
+async def test_RateLimiter():
+    limiter = RateLimiter(RateLimitConfig(rates={"/c/f/frs/page": 50.0, "/mo/q/manage/": 10.0}, burst=0.1))
+    assert limiter.get_key("/c/f/frs/page") == "/c/f/frs/page"
+    assert limiter.get_key("/mo/q/manage/getRecoverList") == "/mo/q/manage/"
+    assert limiter.get_key("/c/f/pb/page") == "/c/f/pb/page"
+
+    start = time.perf_counter()
+    await asyncio.gather(*[limiter.acquire("/c/f/frs/page") for _ in range(11)])
+    assert time.perf_counter() - start >= 0.1
+
+    # unconfigured endpoints are not limited
+    assert limiter.get_rate("/c/f/pb/page") == 0.0
+
+    limiter.feedback("/c/f/frs/page", 1)
+    assert limiter.get_rate("/c/f/frs/page") == pytest.approx(50.0)
+    limiter.feedback("/c/f/frs/page", 220034)
+    assert limiter.get_rate("/c/f/frs/page") == pytest.approx(25.0, rel=0.01)
+
+    await limiter.acquire("/c/f/pb/page")
+    limiter.feedback("/c/f/pb/page", 340011)
+    assert 0.0 < limiter.get_rate("/c/f/pb/page") <= 1.0
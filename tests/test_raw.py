@@ -0,0 +1,39 @@
+import pytest
+
+import aiotieba as tb
+from aiotieba.api import get_threads
+from aiotieba.api._classdef import check_error
+from aiotieba.exception import BytesResponse, TiebaServerError
+
+
+def test_check_error(make_frs_page):
+    body = make_frs_page().SerializeToString()
+    check_error(body)
+    assert get_threads.parse_proto(body).data.thread_list[0].id == 1
+
+    body = make_frs_page(errorno=4).SerializeToString()
+    with pytest.raises(TiebaServerError) as exc_info:
+        check_error(body)
+    assert exc_info.value.code == 4
+    with pytest.raises(TiebaServerError):
+        get_threads.parse_proto(body)
+
+
+@pytest.mark.asyncio
+async def test_get_threads_raw(monkeypatch, make_frs_page):
+    bodies = [make_frs_page().SerializeToString(), make_frs_page(errorno=4).SerializeToString()]
+
+    async def request_body_http(*args):
+        return bodies.pop(0)
+
+    monkeypatch.setattr(get_threads, "request_body_http", request_body_http)
+
+    async with tb.Client() as client:
+        body = await client.get_threads_raw("forum")
+        assert isinstance(body, BytesResponse)
+        assert body.err is None
+        assert get_threads.parse_body(body)[0].tid == 1
+
+        body = await client.get_threads_raw("forum", 2)
+        assert body == b""
+        assert isinstance(body.err, TiebaServerError)
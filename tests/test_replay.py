@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from aiohttp import test_utils, web
+
+import aiotieba as tb
+from aiotieba.api.init_websocket.protobuf import UpdateClientInfoResIdl_pb2
+from aiotieba.const import APP_BASE_HOST
+from aiotieba.core.replay import TrafficRecorder, TrafficReplayer, iter_records
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _append_truncated_record(path: Path) -> None:
+    with path.open("ab") as file:
+        file.write(b"\x00\x00\x00\x10{")
+
+
+@pytest.mark.asyncio
+async def test_record_replay(tmp_path, make_frs_page):
+    path = tmp_path / "traffic.bin"
+    tids = iter(range(1, 10))
+
+    async def handler(request: web.Request) -> web.Response:
+        return web.Response(body=make_frs_page([next(tids)]).SerializeToString())
+
+    app = web.Application()
+    app.router.add_post("/c/f/frs/page", handler)
+
+    async with test_utils.TestServer(app, host="127.0.0.1") as server:
+        with TrafficRecorder(path) as recorder:
+            async with tb.Client(tape=recorder, hosts={APP_BASE_HOST: f"127.0.0.1:{server.port}"}) as client:
+                assert (await client.get_threads("forum", pn=1))[0].tid == 1
+                assert (await client.get_threads("forum", pn=2))[0].tid == 2
+
+    records = list(iter_records(path))
+    assert [(r.transport, r.target) for r in records] == [("http", "/c/f/frs/page")] * 2
+    assert records[0].request
+    assert records[0].time <= records[1].time
+
+    # 末尾不完整的记录被忽略
+    _append_truncated_record(path)
+
+    replayer = TrafficReplayer(path, speed=0)
+    assert replayer.remaining == 2
+    async with tb.Client(tape=replayer) as client:
+        assert (await client.get_threads("forum", pn=1))[0].tid == 1
+        assert (await client.get_threads("forum", pn=2))[0].tid == 2
+
+        threads = await client.get_threads("forum", pn=3)
+        assert isinstance(threads.err, LookupError)
+    assert replayer.remaining == 0
+
+
+@pytest.mark.asyncio
+async def test_replay_ws(tmp_path, make_frs_page):
+    path = tmp_path / "traffic.bin"
+    with TrafficRecorder(path) as recorder:
+        res_proto = UpdateClientInfoResIdl_pb2.UpdateClientInfoResIdl()
+        recorder.write("ws", "1001", b"", res_proto.SerializeToString(), 0.0, 0.01)
+        recorder.write("ws", "301001", b"", make_frs_page([7]).SerializeToString(), 0.0, 0.01)
+
+    async with tb.Client(try_ws=True, tape=TrafficReplayer(path)) as client:
+        threads = await client.get_threads("forum")
+        assert threads.err is None
+        assert threads[0].tid == 7
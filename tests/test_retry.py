@@ -0,0 +1,135 @@
+import asyncio
+import time
+
+import aiohttp
+import pytest
+import yarl
+from aiohttp import test_utils, web
+
+import aiotieba as tb
+from aiotieba.config import RetryConfig
+from aiotieba.const import APP_BASE_HOST
+from aiotieba.core.retry import LatencyTracker, backoff_delay, is_retryable
+from aiotieba.exception import HTTPStatusError, TiebaServerError
+
+
+def test_is_retryable():
+    assert is_retryable(HTTPStatusError(502, "Bad Gateway"))
+    assert is_retryable(HTTPStatusError(429, "Too Many Requests"))
+    assert not is_retryable(HTTPStatusError(404, "Not Found"))
+    assert is_retryable(aiohttp.ServerDisconnectedError())
+    assert is_retryable(asyncio.TimeoutError())
+    assert not is_retryable(TiebaServerError(220034, ""))
+
+
+def test_backoff_delay():
+    config = RetryConfig(backoff_base=0.2, backoff_max=1.0)
+    assert 0.0 <= backoff_delay(config, 0) <= 0.2
+    assert 0.0 <= backoff_delay(config, 10) <= 1.0
+
+
+def test_LatencyTracker():
+    tracker = LatencyTracker(maxlen=100)
+    assert tracker.quantile("/c/f/frs/page", 0.95) is None
+
+    for i in range(200):
+        tracker.add("/c/f/frs/page", i / 1000)
+    assert tracker.quantile("/c/f/frs/page", 0.95) == 0.195
+    assert tracker.quantile("/c/f/frs/page", 0.95, min_samples=101) is None
+
+
+async def _send(client: tb.Client, path: str) -> bytes:
+    http_core = client._http_core
+    request = http_core.pack_proto_request(yarl.URL.build(scheme="http", host=APP_BASE_HOST, path=path), b"")
+    return await http_core.net_core.send_request(request)
+
+
+@pytest.mark.asyncio
+async def test_retry():
+    statuses = []
+
+    async def handler(request: web.Request) -> web.Response:
+        status = statuses.pop(0) if statuses else 503
+        return web.Response(status=status, body=b"ok" if status == 200 else b"")
+
+    app = web.Application()
+    app.router.add_post("/c/f/frs/page", handler)
+    app.router.add_post("/c/c/post/add", handler)
+
+    retry = RetryConfig(max_retries=2, backoff_base=0.0)
+    async with test_utils.TestServer(app, host="127.0.0.1") as server:
+        async with tb.Client(retry=retry, hosts={APP_BASE_HOST: f"127.0.0.1:{server.port}"}) as client:
+            # 只读请求在max_retries次内恢复
+            statuses[:] = [503, 503, 200]
+            assert await _send(client, "/c/f/frs/page") == b"ok"
+            assert not statuses
+
+            # 超出max_retries后抛出最后一次的异常
+            statuses[:] = [503] * 4
+            with pytest.raises(tb.exception.HTTPStatusError):
+                await _send(client, "/c/f/frs/page")
+            assert len(statuses) == 1
+
+            # 写操作从不重试
+            statuses[:] = [503, 200]
+            with pytest.raises(tb.exception.HTTPStatusError):
+                await _send(client, "/c/c/post/add")
+            assert statuses == [200]
+
+
+@pytest.mark.asyncio
+async def test_retry_timeout():
+    calls = 0
+
+    async def handler(request: web.Request) -> web.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(1.0)
+        return web.Response(body=b"ok")
+
+    app = web.Application()
+    app.router.add_post("/c/f/frs/page", handler)
+
+    retry = RetryConfig(max_retries=1, backoff_base=0.0)
+    timeout = tb.TimeoutConfig(http_read=0.1)
+    async with test_utils.TestServer(app, host="127.0.0.1") as server:
+        hosts = {APP_BASE_HOST: f"127.0.0.1:{server.port}"}
+        async with tb.Client(retry=retry, timeout=timeout, hosts=hosts) as client:
+            assert await _send(client, "/c/f/frs/page") == b"ok"
+            assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_hedge():
+    calls = 0
+    release = asyncio.Event()
+
+    async def handler(request: web.Request) -> web.Response:
+        nonlocal calls
+        calls += 1
+        # 积累足够的样本后 首个到达的请求一直等待
+        if calls == 4:
+            await release.wait()
+        return web.Response(body=str(calls).encode())
+
+    app = web.Application()
+    app.router.add_post("/c/f/frs/page", handler)
+
+    retry = RetryConfig(max_retries=0, hedge=True, hedge_min_samples=3)
+    async with test_utils.TestServer(app, host="127.0.0.1") as server:
+        async with tb.Client(retry=retry, hosts={APP_BASE_HOST: f"127.0.0.1:{server.port}"}) as client:
+            net_core = client._http_core.net_core
+            for _ in range(3):
+                await _send(client, "/c/f/frs/page")
+
+            start = time.perf_counter()
+            assert await _send(client, "/c/f/frs/page") == b"5"
+            assert time.perf_counter() - start < 1.0
+            assert calls == 5
+
+            # 落后的请求已被取消 不再占用并发名额
+            await asyncio.sleep(0)
+            assert net_core.governor.inflight == 0
+
+            release.set()
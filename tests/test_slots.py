@@ -0,0 +1,36 @@
+import dataclasses as dcs
+import weakref
+
+import pytest
+
+from aiotieba.api._classdef import cached_slot_property, slotted
+
+
+@slotted(weakref=True)
+@dcs.dataclass
+class Item:
+    text: str = ""
+    tags: list[str] = dcs.field(default_factory=list)
+
+    @cached_slot_property
+    def upper(self) -> str:
+        return self.text.upper()
+
+
+def test_slotted():
+    item = Item("abc")
+    assert not hasattr(item, "__dict__")
+    assert item == Item("abc")
+    assert item.tags == []
+    weakref.ref(item)
+
+    with pytest.raises(AttributeError):
+        item.other = 1
+
+    assert item.upper == "ABC"
+    item.text = "def"
+    assert item.upper == "ABC"
+    del item.upper
+    assert item.upper == "DEF"
+    item.upper = "X"
+    assert item.upper == "X"
@@ -0,0 +1,71 @@
+import pytest
+from aiohttp import test_utils, web
+
+import aiotieba as tb
+from aiotieba.api import get_threads
+from aiotieba.core import WsResponse
+from aiotieba.core.trace import Tracer
+from aiotieba.enums import TracePhase
+
+
+@pytest.mark.asyncio
+async def test_trace_http(monkeypatch, make_frs_page):
+    async def handler(request: web.Request) -> web.Response:
+        return web.Response(body=make_frs_page().SerializeToString())
+
+    app = web.Application()
+    app.router.add_post("/c/f/frs/page", handler)
+
+    async with test_utils.TestServer(app, host="127.0.0.1") as server:
+
+        async def request_body_http(http_core, *args):
+            request = http_core.pack_proto_request(server.make_url("/c/f/frs/page"), b"")
+            return await http_core.net_core.send_request(request)
+
+        monkeypatch.setattr(get_threads._api, "request_body_http", request_body_http)
+
+        spans = []
+
+        def on_error(span):
+            raise RuntimeError
+
+        async with tb.Client(tracer=Tracer(spans.append, on_error)) as client:
+            threads = await client.get_threads("forum")
+            assert threads.err is None
+            await client.get_threads("forum")
+
+    phases = [span.phase for span in spans]
+    assert phases[:7] == [
+        TracePhase.QUEUE,
+        TracePhase.CONNECT,
+        TracePhase.SEND,
+        TracePhase.WAIT,
+        TracePhase.READ,
+        TracePhase.REQUEST,
+        TracePhase.PARSE,
+    ]
+    # 第二次调用复用长连接 但仍会经过各阶段
+    assert len(spans) == 14
+
+    first, second = spans[:7], spans[7:]
+    assert len({span.trace_id for span in first}) == 1
+    assert first[0].trace_id != second[0].trace_id
+    assert all(span.api == "get_threads" for span in spans)
+    assert first[1].target == "/c/f/frs/page"
+    assert first[6].target == get_threads.parse_body.__module__
+    assert all(span.error is None and span.duration >= 0 for span in spans)
+    assert first[5].start <= first[0].start
+    assert first[4].end <= first[5].end
+
+
+@pytest.mark.asyncio
+async def test_trace_ws_read():
+    spans = []
+    response = WsResponse(1, 1.0, 309, Tracer(spans.append))
+    response.future.set_result(b"data")
+    assert await response.read() == b"data"
+
+    (span,) = spans
+    assert span.phase == TracePhase.WS_READ
+    assert span.target == "309"
+    assert span.trace_id == 0
@@ -0,0 +1,34 @@
+import pytest
+from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives.ciphers import algorithms
+
+from aiotieba.core import Account
+from aiotieba.core.websocket import pack_ws_bytes, parse_ws_bytes
+
+
+@pytest.mark.parametrize("size", [0, 1, 15, 16, 17, 4096])
+@pytest.mark.parametrize("compress", [False, True])
+def test_ws_bytes_roundtrip(size, compress):
+    account = Account()
+    data = bytes(range(256)) * (size // 256) + bytes(range(size % 256))
+
+    packed = pack_ws_bytes(account, data, 302001, 7, compress=compress)
+    parsed, cmd, req_id = parse_ws_bytes(account, packed)
+    assert parsed == data
+    assert cmd == 302001
+    assert req_id == 7
+
+    packed = pack_ws_bytes(account, data, 302001, 7, compress=compress, encrypt=False)
+    assert parse_ws_bytes(account, packed)[0] == data
+
+
+def test_ws_bytes_bad_padding():
+    account = Account()
+    padder = padding.PKCS7(algorithms.AES.block_size).padder()
+    data = padder.update(b"data") + padder.finalize()
+    data = data[:-1] + b"\x11"
+    encryptor = account.aes_ecb_chiper.encryptor()
+    data = encryptor.update(data) + encryptor.finalize()
+
+    with pytest.raises(ValueError, match="Invalid padding"):
+        parse_ws_bytes(account, b"\x88" + (1).to_bytes(4, "big") + (1).to_bytes(4, "big") + data)